@@ -0,0 +1,12 @@
+"""
+@file __main__.py
+@brief Entry point of the benchmark suite - see 'suite.py'.
+Run as: python -m benchmarks {run,compare,list} ...
+"""
+
+import sys
+
+from benchmarks.suite import main
+
+
+sys.exit(main())
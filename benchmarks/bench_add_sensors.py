@@ -0,0 +1,46 @@
+"""
+@file bench_add_sensors.py
+@brief Compare bulk registration via 'Sensors.add_sensors()' with a loop of 'Sensors.add_sensor()'.
+Run as: python -m benchmarks.bench_add_sensors [--count N]
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.fleet import make_specs, quiet
+from py_sensors import Sensors
+
+
+def bench_add_sensor_loop(json_specs):
+    sensors = Sensors(sensors=[])
+    start = time.perf_counter()
+    with quiet():
+        for json_spec in json_specs:
+            sensors.add_sensor(json_spec)
+    return time.perf_counter() - start, len(sensors.sensors)
+
+
+def bench_add_sensors_bulk(json_specs):
+    sensors = Sensors(sensors=[])
+    start = time.perf_counter()
+    with quiet():
+        sensors.add_sensors(json_specs)
+    return time.perf_counter() - start, len(sensors.sensors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk sensor registration.")
+    parser.add_argument("--count", type=int, default=10000, help="number of sensor specs to register")
+    args = parser.parse_args()
+    #
+    json_specs = [json.dumps(spec) for spec in make_specs(args.count)]
+    loop_time, loop_added = bench_add_sensor_loop(json_specs)
+    bulk_time, bulk_added = bench_add_sensors_bulk(json_specs)
+    print("add_sensor() loop: %d specs, %d added in %.3f s" % (len(json_specs), loop_added, loop_time))
+    print("add_sensors() bulk: %d specs, %d added in %.3f s" % (len(json_specs), bulk_added, bulk_time))
+    print("Speedup: %.1fx" % (loop_time / bulk_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+@file bench_bus_batching.py
+@brief Per-sensor bus transactions ('Sensors.read_sensors()') against combined per-bus transactions
+('Sensors.read_sensors_batched()') on the simulated bus backend - which charges a fixed overhead per
+transaction plus clock-accurate wire time per device read (see 'simulated_bus').
+Reports the simulated bus time of a sweep; with '--realtime' the bus time is also slept, so wall time is real.
+Run as: python -m benchmarks.bench_bus_batching [--count N] [--overhead S] [--realtime]
+"""
+
+import argparse
+import time
+
+from benchmarks.fleet import make_specs, quiet
+from py_sensors import Sensors
+from sensor_drivers.driver_handle import ADDRESS_PARAM
+from sensor_drivers.driver_registry import drivers
+from sensor_drivers.simulated_bus import SimulatedBackend
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched bus transactions against per-sensor ones.")
+    parser.add_argument("--count", type=int, default=240, help="number of sensors (I2C and SPI)")
+    parser.add_argument("--overhead", type=float, default=0.0001,
+                        help="fixed cost per bus transaction (s) - syscall, start/stop, CS setup")
+    parser.add_argument("--realtime", action="store_true", help="sleep simulated bus time (measure wall time)")
+    args = parser.parse_args()
+    #
+    backend = SimulatedBackend(transaction_time=args.overhead, realtime=args.realtime)
+    specs = make_specs(args.count, types=("i2c", "spi"))
+    for spec in specs:
+        spec["dev_name"] = "BENCH-SIM"
+        if spec["sensor_type"] == "i2c":
+            spec["clk_speed"] = 400000
+        else:
+            spec["clk_speed"] = 1000000
+            spec["cycles_before"] = spec["cycles_after"] = 4
+        backend.attach(spec["sensor_type"], spec["bus_no"], spec[ADDRESS_PARAM[spec["sensor_type"]]], read=lambda: 1.0)
+    for sensor_type in ("i2c", "spi"):
+        drivers.register(sensor_type, backend, dev_name="BENCH-SIM")
+    sensors = Sensors()
+    with quiet():
+        sensors.add_sensors(specs)
+    no_of_buses = len(backend.buses)
+    #
+    results = []
+    for name, sweep in (("per-sensor", sensors.read_sensors), ("batched", sensors.read_sensors_batched)):
+        busy_before, transactions_before = backend.busy_time, backend.no_of_transactions
+        start = time.perf_counter()
+        with quiet():
+            sweep()
+        wall_time = time.perf_counter() - start
+        results.append((name, backend.busy_time - busy_before, backend.no_of_transactions - transactions_before,
+                        wall_time))
+    #
+    print("%d sensors on %d buses, %.0f us overhead per transaction" % (args.count, no_of_buses, args.overhead * 1e6))
+    for name, bus_time, transactions, wall_time in results:
+        print("%-10s: %4d transactions, bus time %.2f ms, wall time %.2f ms" %
+              (name, transactions, bus_time * 1000, wall_time * 1000))
+    print("Bus time speedup: %.1fx" % (results[0][1] / results[1][1]))
+
+
+if __name__ == "__main__":
+    main()
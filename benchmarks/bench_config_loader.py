@@ -0,0 +1,95 @@
+"""
+@file bench_config_loader.py
+@brief Streaming config ingestion of a large spec file (NDJSON or JSON array): time and peak RSS,
+against 'json.load()' of the whole file. Each measurement runs in a fresh subprocess,
+so that peak RSS (ru_maxrss) belongs to that measurement alone.
+Run as: python -m benchmarks.bench_config_loader [--count N] [--format ndjson|array] [--register]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fleet import make_specs, quiet
+
+
+def write_spec_file(path, count, file_format):
+    """ Write 'count' specs - in slices, so the generator itself stays small. """
+    with open(path, "w") as spec_file:
+        if file_format == "array":
+            spec_file.write("[\n")
+        written = 0
+        while written < count:
+            specs = make_specs(min(10000, count - written))
+            for idx, spec in enumerate(specs):
+                spec["alias"] = "spec-%d" % (written + idx)
+                if spec["sensor_type"] == "uart":
+                    spec["bus_no"] = written + idx
+                if file_format == "array" and written + idx > 0:
+                    spec_file.write(",\n")
+                spec_file.write(json.dumps(spec))
+                if file_format == "ndjson":
+                    spec_file.write("\n")
+            written += len(specs)
+        if file_format == "array":
+            spec_file.write("\n]\n")
+
+
+def measure(path, method, register):
+    """ Runs in subprocess: load file by given method, print result as JSON. """
+    start = time.perf_counter()
+    if method == "stream":
+        from py_sensors import Sensors
+        from sensor_utils.config_loader import load_sensor_config
+        with quiet():
+            summary = load_sensor_config(Sensors(), path, register=register)
+        no_of_specs = summary["specs"]
+    else:
+        with open(path) as spec_file:
+            if path.endswith(".ndjson"):
+                specs = [json.loads(line) for line in spec_file]
+            else:
+                specs = json.load(spec_file)
+        no_of_specs = len(specs)
+    elapsed = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024   # kB on Linux
+    print(json.dumps({"specs": no_of_specs, "time": elapsed, "peak_rss": peak_rss}))
+
+
+def run_measurement(path, method, register):
+    cmd = [sys.executable, "-m", "benchmarks.bench_config_loader", "--measure", method, "--file", path]
+    if register:
+        cmd.append("--register")
+    output = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming config ingestion.")
+    parser.add_argument("--count", type=int, default=1000000, help="number of specs in generated file")
+    parser.add_argument("--format", choices=("ndjson", "array"), default="ndjson")
+    parser.add_argument("--register", action="store_true", help="also build & register sensors (not only validate)")
+    parser.add_argument("--measure", choices=("stream", "json-load"), help=argparse.SUPPRESS)
+    parser.add_argument("--file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    #
+    if args.measure:
+        measure(args.file, args.measure, args.register)
+        return
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "specs.%s" % ("ndjson" if args.format == "ndjson" else "json"))
+        write_spec_file(path, args.count, args.format)
+        print("Spec file: %d specs (%s), %.1f MB" % (args.count, args.format, os.path.getsize(path) / 1e6))
+        for method in ("stream", "json-load"):
+            result = run_measurement(path, method, args.register)
+            print("%-9s: %d specs in %.2f s, peak RSS %.1f MB" %
+                  (method, result["specs"], result["time"], result["peak_rss"] / 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+@file bench_db_writes.py
+@brief Reading-persistence throughput on a local SQLite file:
+per-row insert & commit (as done by 'insert_class_as_dict()') against the batched background 'ReadingWriter'.
+Run as: python -m benchmarks.bench_db_writes [--readings N] [--per-row-readings N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.fleet import quiet
+from sensor_properties.sensor_props import ComplexValue
+from sensor_utils import db_utils
+
+
+def make_readings(count):
+    readings = []
+    for idx in range(count):
+        kind = idx % 3
+        if kind == 0:
+            value = 1.12345
+        elif kind == 1:
+            value = ComplexValue(True, 7, 8.765)
+        else:
+            value = [3, 4, 5]
+        readings.append((idx % 100, float(idx), value))
+    return readings
+
+
+def bench_per_row(db, readings):
+    table = db_utils.get_readings_table(db)
+    start = time.perf_counter()
+    for reading in readings:
+        table.insert(dict(zip(db_utils.READINGS_COLUMNS, db_utils.reading_as_row(reading))))
+        db.commit()
+    return time.perf_counter() - start
+
+
+def bench_writer(db, readings):
+    start = time.perf_counter()
+    writer = db_utils.ReadingWriter(db, max_batch=20000, max_delay=0.25)
+    for reading in readings:
+        writer.write(reading)
+    writer.close()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched reading persistence against per-row commits.")
+    parser.add_argument("--readings", type=int, default=500000, help="readings written through ReadingWriter")
+    parser.add_argument("--per-row-readings", type=int, default=5000, help="readings written one row per commit")
+    args = parser.parse_args()
+    #
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with quiet():
+            per_row_db = db_utils.connect_to_db("sqlite:///%s" % os.path.join(tmp_dir, "per_row.db"))
+            batch_db = db_utils.connect_to_db("sqlite:///%s" % os.path.join(tmp_dir, "batched.db"))
+        per_row_time = bench_per_row(per_row_db, make_readings(args.per_row_readings))
+        writer_time = bench_writer(batch_db, make_readings(args.readings))
+        per_row_rate = args.per_row_readings / per_row_time
+        writer_rate = args.readings / writer_time
+        print("Per-row insert & commit: %9.0f readings/s (%d readings)" % (per_row_rate, args.per_row_readings))
+        print("Batched ReadingWriter:   %9.0f readings/s (%d readings)" % (writer_rate, args.readings))
+        print("Speedup: %.1fx" % (writer_rate / per_row_rate))
+        per_row_db.close()
+        batch_db.close()
+
+
+if __name__ == "__main__":
+    main()
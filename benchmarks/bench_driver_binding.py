@@ -0,0 +1,63 @@
+"""
+@file bench_driver_binding.py
+@brief Reads through a bound driver handle (opened & configured once per sensor) against redoing the
+per-call setup (open, configure, read, close) on every read - on the simulated bus backend, with a
+fixed cost charged per open and per bus transaction.
+Run as: python -m benchmarks.bench_driver_binding [--count N] [--sweeps N] [--open-time S] [--transaction-time S]
+"""
+
+import argparse
+import time
+
+from benchmarks.fleet import make_specs, quiet
+from py_sensors import Sensors
+from sensor_drivers.driver_handle import ADDRESS_PARAM, bus_params
+from sensor_drivers.driver_registry import drivers
+from sensor_drivers.simulated_bus import SimulatedBackend
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bound driver handles against per-call setup.")
+    parser.add_argument("--count", type=int, default=300, help="number of sensors")
+    parser.add_argument("--sweeps", type=int, default=5, help="number of read-sweeps")
+    parser.add_argument("--open-time", type=float, default=0.0002, help="simulated cost of opening a handle (s)")
+    parser.add_argument("--transaction-time", type=float, default=0.00005,
+                        help="simulated cost of one bus transaction (s)")
+    args = parser.parse_args()
+    #
+    backend = SimulatedBackend(open_time=args.open_time, transaction_time=args.transaction_time)
+    specs = make_specs(args.count)
+    for spec in specs:
+        spec["dev_name"] = "BENCH-SIM"
+        address_param = ADDRESS_PARAM[spec["sensor_type"]]
+        backend.attach(spec["sensor_type"], spec["bus_no"], spec.get(address_param) if address_param else None,
+                       read=lambda: 1.0)
+        drivers.register(spec["sensor_type"], backend, dev_name="BENCH-SIM")
+    sensors = Sensors()
+    with quiet():
+        sensors.add_sensors(specs)
+    #
+    start = time.perf_counter()
+    for _ in range(args.sweeps):
+        sensors.read_sensors()
+    bound_time = time.perf_counter() - start
+    #
+    start = time.perf_counter()
+    for _ in range(args.sweeps):
+        for sensor in sensors.sensors:
+            handle = backend.open(sensor.type_name, bus_params(sensor))
+            handle.config()
+            handle.read()
+            handle.close()
+    per_call_time = time.perf_counter() - start
+    #
+    no_of_reads = args.count * args.sweeps
+    print("%d sensors, %d sweeps (open=%.2f ms, transaction=%.2f ms)" %
+          (args.count, args.sweeps, args.open_time * 1000, args.transaction_time * 1000))
+    print("bound handle  : %8.1f reads/s" % (no_of_reads / bound_time))
+    print("per-call setup: %8.1f reads/s" % (no_of_reads / per_call_time))
+    print("Speedup: %.1fx" % (per_call_time / bound_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+@file bench_driver_import.py
+@brief Startup cost with many installed device drivers: eager import of every driver module (as with
+the former star-import of the driver module) against lazy registration via the driver registry, where a
+driver module is imported first when the first sensor of its device is created.
+Synthetic device-driver modules are generated into a temporary package; each measurement runs in a fresh
+subprocess so that no module is already cached.
+Run as: python -m benchmarks.bench_driver_import [--drivers N] [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+DRIVER_TEMPLATE = '''
+import math
+
+from sensor_drivers.driver_registry import SensorDriver
+
+# Some import-time work, as a real driver would do (register maps, calibration tables ...):
+CALIBRATION = [math.sin(idx / 100.0) for idx in range(2000)]
+
+
+def config(bus_no=None, i2c_addr=None):
+    pass
+
+
+def read():
+    return CALIBRATION[{idx}]
+
+
+driver = SensorDriver(read=read, config=config)
+'''
+
+
+def write_driver_package(tmp_dir, no_of_drivers):
+    package_dir = os.path.join(tmp_dir, "bench_drivers")
+    os.mkdir(package_dir)
+    open(os.path.join(package_dir, "__init__.py"), "w").close()
+    for idx in range(no_of_drivers):
+        with open(os.path.join(package_dir, "dev%04d.py" % idx), "w") as driver_file:
+            driver_file.write(DRIVER_TEMPLATE.replace("{idx}", str(idx)))
+
+
+def measure(method, no_of_drivers):
+    """ Runs in subprocess: import 'py_sensors' plus drivers by given method, then create ONE sensor. """
+    start = time.perf_counter()
+    import importlib
+    from py_sensors import Sensors
+    from sensor_drivers.driver_registry import register_driver
+    imported = time.perf_counter()
+    for idx in range(no_of_drivers):
+        reference = "bench_drivers.dev%04d:driver" % idx
+        if method == "eager":
+            module_name, _, attr = reference.partition(":")
+            register_driver("i2c", getattr(importlib.import_module(module_name), attr), dev_name="DEV%04d" % idx)
+        else:
+            register_driver("i2c", reference, dev_name="DEV%04d" % idx)
+    registered = time.perf_counter()
+    sensors = Sensors()
+    sensors.add_sensor(json.dumps({"sensor_type": "i2c", "bus_no": 1, "i2c_addr": 3, "dev_name": "DEV0000",
+                                   "alias": "first"}))
+    first_sensor = time.perf_counter()
+    print(json.dumps({"import": imported - start, "drivers": registered - imported,
+                      "first_sensor": first_sensor - registered, "total": first_sensor - start,
+                      "modules": len(sys.modules)}))
+
+
+def run_measurement(tmp_dir, method, no_of_drivers):
+    cmd = [sys.executable, "-m", "benchmarks.bench_driver_import", "--measure", method,
+           "--drivers", str(no_of_drivers)]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([tmp_dir, os.getcwd()]))
+    output = subprocess.run(cmd, check=True, capture_output=True, text=True, env=env).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark eager vs lazy driver loading at startup.")
+    parser.add_argument("--drivers", type=int, default=300, help="number of installed device drivers")
+    parser.add_argument("--runs", type=int, default=5, help="subprocess runs per method (median reported)")
+    parser.add_argument("--measure", choices=("eager", "lazy"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    #
+    if args.measure:
+        measure(args.measure, args.drivers)
+        return
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        write_driver_package(tmp_dir, args.drivers)
+        print("%d device drivers installed, median of %d runs:" % (args.drivers, args.runs))
+        for method in ("eager", "lazy"):
+            # Warm-up run - writes bytecode caches, so that compile time is not measured:
+            run_measurement(tmp_dir, method, args.drivers)
+            results = [run_measurement(tmp_dir, method, args.drivers) for _ in range(args.runs)]
+            median = {key: statistics.median(result[key] for result in results) for key in results[0]}
+            print("%-5s: import py_sensors %.1f ms, drivers %.1f ms, first sensor %.2f ms, "
+                  "total %.1f ms (%d modules loaded)" %
+                  (method, median["import"] * 1000, median["drivers"] * 1000, median["first_sensor"] * 1000,
+                   median["total"] * 1000, median["modules"]))
+
+
+if __name__ == "__main__":
+    main()
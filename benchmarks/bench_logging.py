@@ -0,0 +1,57 @@
+"""
+@file bench_logging.py
+@brief Cost of per-read output on the 'Sensors.read_sensors()' hot path.
+Compares sweeps with the per-value log-output disabled (level WARNING - the library default),
+against sweeps with INFO/DEBUG-output enabled and written to a null stream - the latter being
+what every sweep used to pay when values were printed unconditionally.
+Run as: python -m benchmarks.bench_logging [--count N] [--sweeps N]
+"""
+
+import argparse
+import logging
+import os
+import time
+
+from benchmarks.fleet import make_specs, quiet
+from py_sensors import Sensors
+
+
+def time_sweeps(sensors, sweeps):
+    start = time.perf_counter()
+    for _ in range(sweeps):
+        sensors.read_sensors()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sweep throughput with logging disabled/enabled.")
+    parser.add_argument("--count", type=int, default=1000, help="number of sensors")
+    parser.add_argument("--sweeps", type=int, default=20, help="number of read-sweeps per level")
+    args = parser.parse_args()
+    #
+    sensors = Sensors()
+    with quiet():
+        sensors.add_sensors(make_specs(args.count))
+    root = logging.getLogger()
+    with open(os.devnull, "w") as devnull:
+        handler = logging.StreamHandler(devnull)
+        root.addHandler(handler)
+        try:
+            results = []
+            for level in (logging.WARNING, logging.INFO, logging.DEBUG):
+                root.setLevel(level)
+                elapsed = time_sweeps(sensors, args.sweeps)
+                results.append((logging.getLevelName(level), elapsed))
+        finally:
+            root.removeHandler(handler)
+            root.setLevel(logging.WARNING)
+    #
+    baseline = results[0][1]
+    print("%d sensors, %d sweeps per level" % (args.count, args.sweeps))
+    for level_name, elapsed in results:
+        print("level=%-7s: %8.1f reads/s (%.1fx slower than disabled)" %
+              (level_name, args.count * args.sweeps / elapsed, elapsed / baseline))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+@file bench_mmap_sampling.py
+@brief Sampling rate of a multi-channel ADC result block - memory-mapped from a plain file (see 'mmap_driver'):
+- file_read: one seek + read syscall per sample, as a non-mapped driver would do
+- read: 'handle.read()' per sample - mapped, but Python numbers created per channel
+- read_into: 'handle.read_into(row)' per sample, into a preallocated array
+- read_block: 'handle.read_block(block)' - all samples of the block in one call
+Run as: python -m benchmarks.bench_mmap_sampling [--channels N] [--samples N]
+"""
+
+import argparse
+import mmap
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from sensor_drivers.mmap_driver import mmap_driver
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory-mapped multi-channel ADC sampling.")
+    parser.add_argument("--channels", type=int, default=8, help="ADC channels per sample")
+    parser.add_argument("--samples", type=int, default=100000, help="samples per method")
+    args = parser.parse_args()
+    #
+    nbytes = 2 * args.channels
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        mem_path = os.path.join(tmp_dir, "regs.bin")
+        with open(mem_path, "wb") as mem_file:
+            mem_file.write(np.arange(mmap.ALLOCATIONGRANULARITY // 2, dtype="<u2").tobytes())
+        handle = mmap_driver.open("internal", {"dev_addr": 0, "channels": args.channels, "mem_path": mem_path})
+        block = np.zeros((args.samples, args.channels), dtype=np.uint16)
+        #
+        def file_read():
+            with open(mem_path, "rb", buffering=0) as mem_file:
+                for _ in range(args.samples):
+                    mem_file.seek(0)
+                    np.frombuffer(mem_file.read(nbytes), dtype="<u2")
+
+        def read():
+            for _ in range(args.samples):
+                handle.read()
+
+        def read_into():
+            for row in block:
+                handle.read_into(row)
+
+        def read_block():
+            handle.read_block(block)
+        #
+        print("%d channels x %d samples" % (args.channels, args.samples))
+        for name, run in (("file_read", file_read), ("read", read), ("read_into", read_into),
+                          ("read_block", read_block)):
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            print("%-10s: %.2f us per sample, %9.0f samples/s" %
+                  (name, elapsed / args.samples * 1e6, args.samples / elapsed))
+        handle.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+@file bench_parallel_import.py
+@brief Scaling of parallel config import ('Sensors.add_sensors(specs, workers=N)') at 1, 2, 4 and 8 workers.
+Run as: python -m benchmarks.bench_parallel_import [--count N] [--workers 1,2,4,8]
+"""
+
+import argparse
+import json
+import os
+import time
+
+from benchmarks.fleet import make_specs, quiet
+from py_sensors import Sensors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel validation of large config imports.")
+    parser.add_argument("--count", type=int, default=50000, help="number of sensor specs to import")
+    parser.add_argument("--workers", default="1,2,4,8", help="comma-separated worker counts")
+    args = parser.parse_args()
+    #
+    json_specs = [json.dumps(spec) for spec in make_specs(args.count)]
+    print("%d specs, %d CPUs available" % (args.count, os.cpu_count()))
+    base_time = None
+    for workers in [int(workers) for workers in args.workers.split(",")]:
+        sensors = Sensors()
+        start = time.perf_counter()
+        with quiet():
+            sensors.add_sensors(json_specs, workers=workers)
+        elapsed = time.perf_counter() - start
+        if base_time is None:
+            base_time = elapsed
+        print("workers=%d: %.3f s (%.0f specs/s, speedup %.2fx)" %
+              (workers, elapsed, args.count / elapsed, base_time / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+@file bench_polling.py
+@brief Compare sequential 'Sensors.read_sensors()' sweeps with concurrent 'Sensors.poll_sensors()' sweeps,
+using deliberately slow mocked drivers.
+Run as: python -m benchmarks.bench_polling [--count N] [--latency SECONDS]
+"""
+
+import argparse
+import time
+
+from benchmarks.fleet import make_specs, quiet
+from py_sensors import Sensors
+from sensor_drivers import mocked_drivers
+
+
+MOCK_READS = {"i2c": mocked_drivers.get_i2c_val, "spi": mocked_drivers.get_spi_val, "uart": mocked_drivers.get_uart_val}
+
+
+def make_slow_sensors(count, latency):
+    sensors = Sensors()
+    with quiet():
+        sensors.add_sensors(make_specs(count))
+    for sensor in sensors.sensors:
+        sensor.base.read = mocked_drivers.make_slow_read(MOCK_READS[sensor.base.type_name], latency)
+    return sensors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent polling against sequential sweeps.")
+    parser.add_argument("--count", type=int, default=60, help="number of sensors")
+    parser.add_argument("--latency", type=float, default=0.005, help="latency of each mocked read (seconds)")
+    args = parser.parse_args()
+    #
+    sensors = make_slow_sensors(args.count, args.latency)
+    no_of_buses = len(set((sensor.base.type_name, sensor.base.bus_no) for sensor in sensors.sensors))
+    with quiet():
+        start = time.perf_counter()
+        sensors.read_sensors()
+        sequential_time = time.perf_counter() - start
+        sensors.poll_sensors(read_timeout=1.0)
+    stats = sensors.poller.stats
+    print("%d sensors on %d buses, %.1f ms per read" % (args.count, no_of_buses, args.latency * 1000))
+    print("read_sensors() sweep: %.3f s" % sequential_time)
+    print("poll_sensors() sweep: %.3f s (timeouts=%d)" % (stats.sweep_time, stats.no_of_timeouts))
+    print("Speedup: %.1fx" % (sequential_time / stats.sweep_time))
+    sensors.poller.shutdown()
+
+
+if __name__ == "__main__":
+    main()
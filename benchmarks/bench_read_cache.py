@@ -0,0 +1,77 @@
+"""
+@file bench_read_cache.py
+@brief Independent consumers (threads) repeatedly reading the same slow sensors via 'base.read()' -
+without a cache, with a read-through cache, and with stale-while-revalidate.
+Reports consumer reads/s and how many reads actually reached the (mocked) devices.
+Run as: python -m benchmarks.bench_read_cache [--consumers N] [--duration S] [--latency S] [--ttl S]
+"""
+
+import argparse
+import threading
+import time
+
+from benchmarks.fleet import make_specs, quiet
+from py_sensors import Sensors
+from sensor_drivers import mocked_drivers
+from sensor_utils.read_cache import ReadCache
+
+
+def make_sensors(count, latency, device_reads):
+    sensors = Sensors()
+    with quiet():
+        sensors.add_sensors(make_specs(count, types=("i2c",)))
+    slow_read = mocked_drivers.make_slow_read(mocked_drivers.get_i2c_val, latency)
+
+    def counted_read():
+        device_reads.append(1)
+        return slow_read()
+    for sensor in sensors.sensors:
+        sensor.base.read = counted_read
+    return sensors
+
+
+def run_consumers(sensors, consumers, duration):
+    aliases = [sensor.base.alias for sensor in sensors.sensors]
+    counts = [0] * consumers
+    end_time = time.monotonic() + duration
+
+    def consumer(idx):
+        while time.monotonic() < end_time:
+            sensors.get_sensor_by_alias(aliases[counts[idx] % len(aliases)]).base.read()
+            counts[idx] += 1
+    threads = [threading.Thread(target=consumer, args=(idx,)) for idx in range(consumers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark read-through cache in front of slow sensor reads.")
+    parser.add_argument("--sensors", type=int, default=4, help="number of sensors read by all consumers")
+    parser.add_argument("--consumers", type=int, default=8, help="number of consumer threads")
+    parser.add_argument("--duration", type=float, default=1.0, help="seconds per scenario")
+    parser.add_argument("--latency", type=float, default=0.002, help="latency of each device read (seconds)")
+    parser.add_argument("--ttl", type=float, default=0.05, help="cache TTL (seconds)")
+    args = parser.parse_args()
+    #
+    scenarios = (("no cache", None), ("read-through", ReadCache(ttl=args.ttl)),
+                 ("stale-while-revalidate", ReadCache(ttl=args.ttl, stale_while_revalidate=True)))
+    print("%d consumers on %d sensors, %.1f ms per device read, TTL %.0f ms, %.1f s per scenario" %
+          (args.consumers, args.sensors, args.latency * 1000, args.ttl * 1000, args.duration))
+    for name, cache in scenarios:
+        device_reads = []
+        sensors = make_sensors(args.sensors, args.latency, device_reads)
+        if cache is not None:
+            sensors.enable_read_cache(cache)
+        no_of_reads = run_consumers(sensors, args.consumers, args.duration)
+        line = "%-23s: %9.1f reads/s, %6d device reads" % (name, no_of_reads / args.duration, len(device_reads))
+        if cache is not None:
+            line += ", hit ratio %.3f" % cache.stats().hit_ratio
+            sensors.disable_read_cache()
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+@file bench_read_metrics.py
+@brief Cost of read-latency metrics: 'read_sensors()' sweeps without metrics, and with 'ReadMetrics'
+installed - plus the slowest sensors found, with a few sensors made deliberately slow.
+Run as: python -m benchmarks.bench_read_metrics [--count N] [--sweeps N]
+"""
+
+import argparse
+import time
+
+from benchmarks.fleet import make_specs, quiet
+from py_sensors import Sensors
+from sensor_drivers import mocked_drivers
+
+
+def time_sweeps(sensors, sweeps):
+    start = time.perf_counter()
+    for _ in range(sweeps):
+        sensors.read_sensors()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark overhead of per-sensor read-latency metrics.")
+    parser.add_argument("--count", type=int, default=1000, help="number of sensors")
+    parser.add_argument("--sweeps", type=int, default=50, help="number of read-sweeps")
+    args = parser.parse_args()
+    #
+    sensors = Sensors()
+    with quiet():
+        sensors.add_sensors(make_specs(args.count))
+    no_of_reads = args.count * args.sweeps
+    plain_time = time_sweeps(sensors, args.sweeps)
+    metrics = sensors.enable_metrics()
+    metrics_time = time_sweeps(sensors, args.sweeps)
+    print("%d sensors x %d sweeps" % (args.count, args.sweeps))
+    print("metrics disabled: %.3f us per read" % (plain_time / no_of_reads * 1e6))
+    print("metrics enabled : %.3f us per read (+%.3f us)" %
+          (metrics_time / no_of_reads * 1e6, (metrics_time - plain_time) / no_of_reads * 1e6))
+    print("Prometheus text : %.1f kB" % (len(metrics.prometheus_text()) / 1000.0))
+    #
+    sensors.disable_metrics()
+    for sensor in sensors.sensors[::max(args.count // 3, 1)]:
+        sensor.base.read = mocked_drivers.make_slow_read(mocked_drivers.get_i2c_val, 0.002)
+    metrics = sensors.enable_metrics()
+    time_sweeps(sensors, 5)
+    print("Slowest sensors (alias, read time, share of sweep read time):")
+    for alias, seconds, share in metrics.top(5):
+        print("  %-16s %.4f s  %5.1f%%" % (alias, seconds, share * 100))
+
+
+if __name__ == "__main__":
+    main()
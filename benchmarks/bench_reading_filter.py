@@ -0,0 +1,65 @@
+"""
+@file bench_reading_filter.py
+@brief Downstream volume with and without a 'ReadingFilter' in the read pipeline, for slowly changing
+signals (random walk with small steps, plus sensors stuck at a constant value) - and the filter's cost per reading.
+Run as: python -m benchmarks.bench_reading_filter [--count N] [--sweeps N] [--deadband X] [--heartbeat S]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.fleet import make_specs, quiet
+from py_sensors import Sensors
+from sensor_utils.reading_batch import ReadingBatch
+from sensor_utils.reading_filter import FilterOptions, ReadingFilter
+
+
+def make_walk_read(rng, step):
+    state = {"value": 20.0 + rng.random()}
+
+    def read():
+        state["value"] += rng.gauss(0.0, step)
+        return state["value"]
+    return read
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark deadband/duplicate filtering of sensor readings.")
+    parser.add_argument("--count", type=int, default=500, help="number of sensors")
+    parser.add_argument("--sweeps", type=int, default=200, help="number of read-sweeps")
+    parser.add_argument("--deadband", type=float, default=0.05, help="absolute deadband")
+    parser.add_argument("--heartbeat", type=float, default=60.0, help="heartbeat interval (seconds)")
+    args = parser.parse_args()
+    #
+    rng = random.Random(1)
+    sensors = Sensors()
+    with quiet():
+        sensors.add_sensors(make_specs(args.count, types=("i2c",)))
+    for idx, sensor in enumerate(sensors.sensors):
+        # Every 4th sensor is stuck at its value - the rest drift slowly:
+        sensor.base.read = make_walk_read(rng, 0.0 if idx % 4 == 0 else 0.01)
+    #
+    results = []
+    for name, reading_filter in (("unfiltered", None),
+                                 ("deadband", ReadingFilter(FilterOptions(deadband_abs=args.deadband,
+                                                                          heartbeat=args.heartbeat)))):
+        batch = ReadingBatch()
+        start = time.perf_counter()
+        for _ in range(args.sweeps):
+            sensors.read_sensors(batch=batch, reading_filter=reading_filter)
+        elapsed = time.perf_counter() - start
+        results.append((name, len(batch), batch.nbytes, elapsed))
+        if reading_filter is not None:
+            print("Filter: %s" % reading_filter.stats())
+    #
+    no_of_readings = args.count * args.sweeps
+    print("%d sensors x %d sweeps = %d readings, deadband %.3f" % (args.count, args.sweeps, no_of_readings, args.deadband))
+    for name, no_passed, nbytes, elapsed in results:
+        print("%-10s: %7d readings downstream (%.1f kB), %.2f us per reading" %
+              (name, no_passed, nbytes / 1000.0, elapsed / no_of_readings * 1e6))
+    print("Downstream volume reduced %.1fx" % (results[0][1] / float(max(results[1][1], 1))))
+
+
+if __name__ == "__main__":
+    main()
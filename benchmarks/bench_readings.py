@@ -0,0 +1,68 @@
+"""
+@file bench_readings.py
+@brief Allocation count and memory per reading: '__dict__'-based ComplexValue in a list of tuples,
+against the '__slots__' ComplexValue and against packing into a 'ReadingBatch'.
+Run as: python -m benchmarks.bench_readings [--readings N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from sensor_properties.sensor_props import ComplexValue
+from sensor_utils.reading_batch import ReadingBatch
+
+
+class DictComplexValue:
+    """ Layout of 'ComplexValue' before '__slots__' were introduced. """
+    def __init__(self, triggered=False, channel=-1, ch_val=0.0):
+        self.triggered = triggered
+        self.channel = channel
+        self.ch_val = ch_val
+
+
+def measure(fill_func, count):
+    gc.collect()
+    gc_before = sum(stat["collections"] for stat in gc.get_stats())
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    result = fill_func(count)
+    snapshot_after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    gc_runs = sum(stat["collections"] for stat in gc.get_stats()) - gc_before
+    stats = snapshot_after.compare_to(snapshot_before, "filename")
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+    return result, blocks, size, gc_runs
+
+
+def fill_dict_values(count):
+    return [(idx, float(idx), DictComplexValue(True, 7, 8.765)) for idx in range(count)]
+
+
+def fill_slots_values(count):
+    return [(idx, float(idx), ComplexValue(True, 7, 8.765)) for idx in range(count)]
+
+
+def fill_batch(count):
+    batch = ReadingBatch()
+    for idx in range(count):
+        batch.append(idx, float(idx), ComplexValue(True, 7, 8.765))
+    return batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory & allocations per SPI-reading.")
+    parser.add_argument("--readings", type=int, default=100000, help="number of readings")
+    args = parser.parse_args()
+    #
+    for name, fill_func in (("list of tuples, __dict__ ComplexValue", fill_dict_values),
+                            ("list of tuples, __slots__ ComplexValue", fill_slots_values),
+                            ("ReadingBatch (contiguous buffer)", fill_batch)):
+        _, blocks, size, gc_runs = measure(fill_func, args.readings)
+        print("%-40s: %6.2f allocations/reading, %6.1f bytes/reading, %d GC-runs" %
+              (name, blocks / args.readings, size / args.readings, gc_runs))
+
+
+if __name__ == "__main__":
+    main()
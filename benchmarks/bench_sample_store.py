@@ -0,0 +1,55 @@
+"""
+@file bench_sample_store.py
+@brief Memory & query cost of the NumPy-backed sample store, compared with a list of (timestamp, value) tuples.
+Run as: python -m benchmarks.bench_sample_store [--samples N]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from sensor_properties.sensor_props import ComplexValue
+from sensor_utils.sample_store import SampleStore
+
+
+# Fresh value per sample - like a driver read allocates one:
+VALUE_FACTORIES = {"i2c": lambda idx: 1.12345 + idx,
+                   "spi": lambda idx: ComplexValue(True, 7, 8.765 + idx),
+                   "uart": lambda idx: [3, 4, idx]}
+
+
+def measure(fill_func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fill_func()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sample store memory against list of tuples.")
+    parser.add_argument("--samples", type=int, default=100000, help="samples per sensor type")
+    args = parser.parse_args()
+    #
+    for type_name, make_value in VALUE_FACTORIES.items():
+        def fill_list():
+            return [(float(idx), make_value(idx)) for idx in range(args.samples)]
+
+        def fill_store():
+            store = SampleStore(capacity=args.samples)
+            for idx in range(args.samples):
+                store.append(type_name, make_value(idx), float(idx))
+            return store
+        _, list_bytes, list_time = measure(fill_list)
+        store, store_bytes, store_time = measure(fill_store)
+        start = time.perf_counter()
+        store.stats(type_name, args.samples * 0.25, args.samples * 0.75)
+        query_time = time.perf_counter() - start
+        print("%-4s: list of tuples %7.2f MB (%.3f s) | sample store %7.2f MB (%.3f s), window stats %.2f ms" %
+              (type_name, list_bytes / 1e6, list_time, store_bytes / 1e6, store_time, query_time * 1000))
+
+
+if __name__ == "__main__":
+    main()
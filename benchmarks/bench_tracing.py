@@ -0,0 +1,49 @@
+"""
+@file bench_tracing.py
+@brief Cost of sweep tracing: 'read_sensors()' sweeps without tracer, and traced at several sample rates.
+Optionally writes the trace of the fully sampled run - for chrome://tracing or https://ui.perfetto.dev.
+Run as: python -m benchmarks.bench_tracing [--count N] [--sweeps N] [--trace FILE]
+"""
+
+import argparse
+import time
+
+from benchmarks.fleet import make_specs, quiet
+from py_sensors import Sensors
+from sensor_utils.tracing import Tracer
+
+
+def time_sweeps(sensors, sweeps):
+    start = time.perf_counter()
+    for _ in range(sweeps):
+        sensors.read_sensors()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark overhead of sweep tracing.")
+    parser.add_argument("--count", type=int, default=1000, help="number of sensors")
+    parser.add_argument("--sweeps", type=int, default=100, help="number of read-sweeps")
+    parser.add_argument("--trace", help="write trace of fully sampled run to this file")
+    args = parser.parse_args()
+    #
+    sensors = Sensors()
+    with quiet():
+        sensors.add_sensors(make_specs(args.count))
+    no_of_reads = args.count * args.sweeps
+    plain_time = time_sweeps(sensors, args.sweeps)
+    print("%d sensors x %d sweeps" % (args.count, args.sweeps))
+    print("no tracer        : %.3f us per read" % (plain_time / no_of_reads * 1e6))
+    for sample_rate in (1.0, 0.1, 0.01):
+        tracer = sensors.enable_tracing(Tracer(sample_rate=sample_rate, max_events=no_of_reads, seed=1))
+        traced_time = time_sweeps(sensors, args.sweeps)
+        sensors.disable_tracing()
+        print("sample rate %4.2f : %.3f us per read (+%.3f us), %d events" %
+              (sample_rate, traced_time / no_of_reads * 1e6, (traced_time - plain_time) / no_of_reads * 1e6,
+               len(tracer.events())))
+        if sample_rate == 1.0 and args.trace:
+            tracer.write(args.trace)
+
+
+if __name__ == "__main__":
+    main()
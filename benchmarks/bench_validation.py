@@ -0,0 +1,47 @@
+"""
+@file bench_validation.py
+@brief Validation micro-benchmark: per-call validator construction with validate()/is_valid()
+(as 'JsonValidator' did before caching), against cached & fast-path 'JsonValidator.check()'.
+Run as: python -m benchmarks.bench_validation [--count N]
+"""
+
+import argparse
+import time
+
+from jsonschema import Draft4Validator
+
+from benchmarks.fleet import make_specs
+from sensor_properties import sensor_props
+from sensor_utils.json_utils import JsonValidator
+
+
+def legacy_check(schema, spec):
+    validator = Draft4Validator(schema)
+    validator.validate(spec)
+    return validator.is_valid(spec)
+
+
+def bench(check_func, specs):
+    start = time.perf_counter()
+    for spec in specs:
+        check_func(sensor_props.sensor_base_schema, spec)
+        check_func(sensor_props.json_dev_schemas[spec["sensor_type"]], spec)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON-schema validation of sensor specs.")
+    parser.add_argument("--count", type=int, default=20000, help="number of sensor specs to validate")
+    args = parser.parse_args()
+    #
+    specs = make_specs(args.count)
+    legacy_time = bench(legacy_check, specs)
+    cached_time = bench(lambda schema, spec: JsonValidator(schema, fast_path=False).check(spec), specs)
+    fast_time = bench(lambda schema, spec: JsonValidator(schema).check(spec), specs)
+    print("Per-call Draft4Validator, validate() + is_valid(): %.3f s" % legacy_time)
+    print("Cached Draft4Validator, single pass:               %.3f s (%.1fx)" % (cached_time, legacy_time / cached_time))
+    print("Cached code-generated fast path:                   %.3f s (%.1fx)" % (fast_time, legacy_time / fast_time))
+
+
+if __name__ == "__main__":
+    main()
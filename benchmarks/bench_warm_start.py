@@ -0,0 +1,62 @@
+"""
+@file bench_warm_start.py
+@brief Cold start (all sensor specs through 'Sensors.add_sensors()' - parsing, validation, building)
+versus warm start from a registry snapshot ('Sensors.load_snapshot()'), and revalidating load after
+a schema change.
+Run as: python -m benchmarks.bench_warm_start [--count N]
+"""
+
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+from benchmarks.fleet import make_specs, quiet
+from py_sensors import Sensors
+from sensor_properties import sensor_props
+
+
+def timed_start(load):
+    gc.collect()    # garbage of the previous scenario is not to be collected on this one's time
+    sensors = Sensors(sensors=[])
+    start = time.perf_counter()
+    with quiet():
+        load(sensors)
+    return time.perf_counter() - start, len(sensors.sensors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark warm start from a registry snapshot.")
+    parser.add_argument("--count", type=int, default=100000, help="number of sensors")
+    args = parser.parse_args()
+    #
+    json_specs = [json.dumps(spec) for spec in make_specs(args.count)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "sensors.snapshot")
+        cold_time, cold_added = timed_start(lambda sensors: sensors.add_sensors(json_specs))
+        #
+        sensors = Sensors(sensors=[])
+        with quiet():
+            sensors.add_sensors(json_specs)
+        start = time.perf_counter()
+        sensors.save_snapshot(path)
+        save_time = time.perf_counter() - start
+        size = os.path.getsize(path)
+        del sensors
+        #
+        warm_time, warm_added = timed_start(lambda sensors: sensors.load_snapshot(path))
+        changed_schema = dict(sensor_props.sensor_base_schema, description="changed")
+        with mock.patch.object(sensor_props, "sensor_base_schema", changed_schema):
+            revalidate_time, revalidate_added = timed_start(lambda sensors: sensors.load_snapshot(path))
+    #
+    print("Snapshot of %d sensors: %.1f MB, saved in %.3f s" % (args.count, size / 1e6, save_time))
+    print("cold start  : %d added in %.3f s" % (cold_added, cold_time))
+    print("warm start  : %d added in %.3f s (%.1fx faster)" % (warm_added, warm_time, cold_time / warm_time))
+    print("revalidated : %d added in %.3f s (schema changed)" % (revalidate_added, revalidate_time))
+
+
+if __name__ == "__main__":
+    main()
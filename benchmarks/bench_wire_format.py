@@ -0,0 +1,122 @@
+"""
+@file bench_wire_format.py
+@brief Size and encode/decode speed of the binary wire format versus JSON - for a stream of readings
+(mixed float / ComplexValue / int-list values) and for a registry snapshot of a synthetic fleet.
+Run as: python -m benchmarks.bench_wire_format [--readings N] [--count N]
+"""
+
+import argparse
+import io
+import json
+import random
+import time
+import uuid
+
+from benchmarks.fleet import make_specs, quiet
+from py_sensors import Sensors
+from sensor_properties.sensor_props import ComplexValue
+from sensor_utils import wire_format
+
+
+def make_readings(count, rng):
+    readings = []
+    for idx in range(count):
+        kind = idx % 3
+        if kind == 0:
+            value = 20.0 + rng.random()
+        elif kind == 1:
+            value = ComplexValue(rng.random() < 0.5, rng.randrange(8), rng.random())
+        else:
+            value = [rng.randrange(256) for _ in range(4)]
+        readings.append((idx % 1000, 1000.0 + idx * 0.001, value))
+    return readings
+
+
+def json_value(value):
+    if isinstance(value, ComplexValue):
+        return {"triggered": value.triggered, "channel": value.channel, "ch_val": value.ch_val}
+    return value
+
+
+def timed(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def report(title, count, rows):
+    print(title)
+    for name, size, encode_time, decode_time in rows:
+        print("  %-7s: %9.1f kB (%5.1f B/item), encode %7.1f ms, decode %7.1f ms" %
+              (name, size / 1000.0, size / float(count), encode_time * 1000, decode_time * 1000))
+    print("  binary is %.1fx smaller, encodes %.1fx / decodes %.1fx faster" %
+          (rows[1][1] / float(rows[0][1]), rows[1][2] / rows[0][2], rows[1][3] / rows[0][3]))
+
+
+def bench_readings(readings):
+    def encode_binary():
+        stream = io.BytesIO()
+        wire_format.write_readings(stream, readings)
+        return stream.getvalue()
+
+    def encode_json():
+        return "\n".join(json.dumps([idx, timestamp, json_value(value)])
+                         for idx, timestamp, value in readings).encode("utf-8")
+    binary_time, binary = timed(encode_binary)
+    json_time, json_data = timed(encode_json)
+    binary_decode, _ = timed(lambda: list(wire_format.iter_readings(io.BytesIO(binary))))
+    json_decode, _ = timed(lambda: [json.loads(line) for line in json_data.decode("utf-8").split("\n")])
+    report("%d readings:" % len(readings), len(readings),
+           (("binary", len(binary), binary_time, binary_decode), ("JSON", len(json_data), json_time, json_decode)))
+
+
+def bench_snapshot(sensors):
+    def encode_binary():
+        stream = io.BytesIO()
+        wire_format.write_snapshot(stream, sensors)
+        return stream.getvalue()
+
+    def encode_json():
+        rows = []
+        for sensor in sensors.sensors:
+            row = wire_format.props_of_sensor(sensor)
+            row["type_name"] = sensor.base.type_name
+            row["uuid"] = str(sensor.base.uuid)
+            rows.append(row)
+        return json.dumps(rows).encode("utf-8")
+
+    def decode_json(data):
+        sensors_list = []
+        for row in json.loads(data.decode("utf-8")):
+            type_name = row.pop("type_name")
+            s_uuid = uuid.UUID(row.pop("uuid"))
+            sensors_list.append(wire_format.sensor_from_props(type_name, s_uuid, row))
+        return sensors_list
+    binary_time, binary = timed(encode_binary)
+    json_time, json_data = timed(encode_json)
+    binary_decode, _ = timed(lambda: list(wire_format.iter_snapshot(io.BytesIO(binary))))
+    json_decode, _ = timed(lambda: decode_json(json_data))
+    count = len(sensors.sensors)
+    report("Snapshot of %d sensors:" % count, count,
+           (("binary", len(binary), binary_time, binary_decode), ("JSON", len(json_data), json_time, json_decode)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark binary wire format against JSON.")
+    parser.add_argument("--readings", type=int, default=100000, help="number of readings")
+    parser.add_argument("--count", type=int, default=10000, help="number of sensors in snapshot")
+    args = parser.parse_args()
+    #
+    bench_readings(make_readings(args.readings, random.Random(1)))
+    sensors = Sensors()
+    with quiet():
+        sensors.add_sensors(make_specs(args.count))
+    bench_snapshot(sensors)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+@file fleet.py
+@brief Generator of synthetic sensor fleets (JSON-specs) for benchmarking.
+Bus-resources are assigned so that specs do not collide with each other.
+"""
+
+import contextlib
+import logging
+import os
+
+
+def make_specs(count=1000, types=("i2c", "spi", "uart")):
+    """ Return a list of 'count' sensor specs (as dictionaries), round-robin over given bus types. """
+    specs = []
+    for idx in range(count):
+        sensor_type = types[idx % len(types)]
+        type_idx = idx // len(types)
+        spec = {"sensor_type": sensor_type, "dev_name": "BENCH-%s" % sensor_type.upper(),
+                "alias": "bench-%s-%d" % (sensor_type, type_idx)}
+        if sensor_type == "i2c":
+            spec["bus_no"] = type_idx // 128
+            spec["i2c_addr"] = type_idx % 128
+        elif sensor_type == "spi":
+            spec["bus_no"] = type_idx // 8
+            spec["cs_no"] = type_idx % 8
+        else:
+            spec["bus_no"] = type_idx
+            spec["baud_rate"] = 115200
+        specs.append(spec)
+    return specs
+
+
+@contextlib.contextmanager
+def quiet():
+    """ Silence stdout-output and log-records (sensor construction etc. reports a lot) while benchmarking. """
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            logging.disable(logging.CRITICAL)
+            try:
+                yield
+            finally:
+                logging.disable(logging.NOTSET)
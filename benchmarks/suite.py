@@ -0,0 +1,276 @@
+"""
+@file suite.py
+@brief Reproducible benchmark suite of the sensors stack - entry point: 'python -m benchmarks'.
+A synthetic fleet (see 'fleet.make_specs()') of configurable size and bus-type mix is set up once;
+each benchmark times one operation on it (best of '--repeat' runs, setup excluded):
+- add_sensor / add_sensors: registration one spec at a time, and in bulk
+- lookup_alias / lookup_uuid: registry lookups of every sensor
+- read_sensors: 'read_sensors()' sweeps - mocked drivers with '--latency' seconds per read
+- validate: JSON-schema validation of every spec
+- db_insert / db_load: storing all sensors in a (temporary) SQLite DB, and rebuilding them from it
+Results are written as JSON - and two result files can be compared, flagging regressions:
+    python -m benchmarks run [--count N] [--types i2c,spi] [--latency S] [--only add_sensor,...] [--output FILE]
+    python -m benchmarks compare BASELINE.json CURRENT.json [--threshold 0.10]
+    python -m benchmarks list
+'compare' exits with status 1 if any benchmark got slower (per operation) by more than the threshold.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from benchmarks.fleet import make_specs, quiet
+from py_sensors import Sensors
+from sensor_drivers import mocked_drivers
+from sensor_utils import db_utils
+from sensor_utils.json_utils import validate_sensor_spec
+
+
+SUITE_VERSION = 1
+DEFAULT_THRESHOLD = 0.10
+
+MOCKED_READS = {"i2c": mocked_drivers.get_i2c_val, "spi": mocked_drivers.get_spi_val,
+                "uart": mocked_drivers.get_uart_val}
+
+
+def make_fleet(json_specs):
+    sensors = Sensors(sensors=[])
+    with quiet():
+        sensors.add_sensors(json_specs)
+    return sensors
+
+
+# ****************** Benchmarks *******************
+# Each takes the run-context and returns a (setup-free) callable doing the timed operation once,
+# plus the no. of operations that call performs.
+
+def bench_add_sensor(ctx):
+    def run():
+        sensors = Sensors(sensors=[])
+        for json_spec in ctx.json_specs:
+            sensors.add_sensor(json_spec)
+    return run, len(ctx.json_specs)
+
+
+def bench_add_sensors(ctx):
+    def run():
+        Sensors(sensors=[]).add_sensors(ctx.json_specs)
+    return run, len(ctx.json_specs)
+
+
+def bench_lookup_alias(ctx):
+    aliases = [sensor.base.alias for sensor in ctx.sensors.sensors]
+    lookup = ctx.sensors.get_sensor_by_alias
+
+    def run():
+        for alias in aliases:
+            lookup(alias)
+    return run, len(aliases)
+
+
+def bench_lookup_uuid(ctx):
+    uuids = [sensor.base.uuid for sensor in ctx.sensors.sensors]
+    lookup = ctx.sensors.get_sensor_by_uuid
+
+    def run():
+        for s_uuid in uuids:
+            lookup(s_uuid)
+    return run, len(uuids)
+
+
+def bench_read_sensors(ctx):
+    sensors = make_fleet(ctx.json_specs)
+    for sensor in sensors.sensors:
+        read_func = MOCKED_READS[sensor.base.type_name]
+        sensor.base.read = mocked_drivers.make_slow_read(read_func, ctx.latency) if ctx.latency > 0 else read_func
+
+    def run():
+        for _ in range(ctx.sweeps):
+            sensors.read_sensors()
+    return run, len(sensors.sensors) * ctx.sweeps
+
+
+def bench_validate(ctx):
+    def run():
+        for json_spec in ctx.json_specs:
+            validate_sensor_spec(json_spec)
+    return run, len(ctx.json_specs)
+
+
+def bench_db_insert(ctx):
+    sensors = ctx.sensors.sensors
+    paths = []
+
+    def run():
+        path = os.path.join(ctx.tmp_dir, "insert-%d.db" % len(paths))
+        paths.append(path)
+        db = db_utils.connect_to_db("sqlite:///%s" % path)
+        db_utils.insert_sensors(db, sensors)
+        db.close()
+    return run, len(sensors)
+
+
+def bench_db_load(ctx):
+    path = os.path.join(ctx.tmp_dir, "load.db")
+    db = db_utils.connect_to_db("sqlite:///%s" % path)
+    db_utils.insert_sensors(db, ctx.sensors.sensors)
+
+    def run():
+        db_utils.rebuild_sensors(db_utils.load_sensors_from_db(db, page_size=1000), Sensors(sensors=[]))
+    return run, len(ctx.sensors.sensors)
+
+
+BENCHMARKS = {
+    "add_sensor": bench_add_sensor,
+    "add_sensors": bench_add_sensors,
+    "lookup_alias": bench_lookup_alias,
+    "lookup_uuid": bench_lookup_uuid,
+    "read_sensors": bench_read_sensors,
+    "validate": bench_validate,
+    "db_insert": bench_db_insert,
+    "db_load": bench_db_load,
+}
+
+
+class RunContext:
+    """ Fleet and parameters shared by all benchmarks of a run. """
+    def __init__(self, params, tmp_dir):
+        self.count = params["count"]
+        self.types = tuple(params["types"])
+        self.latency = params["latency"]
+        self.sweeps = params["sweeps"]
+        self.tmp_dir = tmp_dir
+        self.json_specs = [json.dumps(spec) for spec in make_specs(self.count, types=self.types)]
+        self.sensors = make_fleet(self.json_specs)
+
+
+def time_best(run, repeat):
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_suite(params, names=None, repeat=3):
+    """ Run benchmarks (default: all) - returns the results document (as written by 'run'). """
+    names = list(BENCHMARKS) if names is None else names
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with quiet():
+            ctx = RunContext(params, tmp_dir)
+            for name in names:
+                run, no_of_ops = BENCHMARKS[name](ctx)
+                seconds = time_best(run, repeat)
+                results[name] = {"seconds": seconds, "ops": no_of_ops, "ops_per_s": no_of_ops / seconds,
+                                 "us_per_op": seconds / no_of_ops * 1e6}
+    return {
+        "suite_version": SUITE_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {"python": platform.python_version(), "implementation": platform.python_implementation(),
+                        "platform": platform.platform(), "cpu_count": os.cpu_count()},
+        "params": dict(params, repeat=repeat),
+        "results": results,
+    }
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare time per operation of benchmarks present in both result documents.
+    Returns list of rows (name, baseline us/op, current us/op, relative change, status) -
+    status is 'regression' / 'improvement' if the change exceeds 'threshold', else 'ok'.
+    """
+    rows = []
+    for name, current_result in current["results"].items():
+        baseline_result = baseline["results"].get(name)
+        if baseline_result is None:
+            continue
+        before = baseline_result["us_per_op"]
+        after = current_result["us_per_op"]
+        change = after / before - 1.0
+        if change > threshold:
+            status = "regression"
+        elif change < -threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append((name, before, after, change, status))
+    return rows
+
+
+# ****************** CLI *******************
+
+def cmd_run(args):
+    names = args.only.split(",") if args.only else None
+    unknown = [name for name in names or () if name not in BENCHMARKS]
+    if unknown:
+        print("Unknown benchmark(s): %s - see 'python -m benchmarks list'" % ", ".join(unknown), file=sys.stderr)
+        return 2
+    params = {"count": args.count, "types": args.types.split(","), "latency": args.latency, "sweeps": args.sweeps}
+    document = run_suite(params, names=names, repeat=args.repeat)
+    for name, result in document["results"].items():
+        print("%-13s: %10.2f us/op %12.0f ops/s (%d ops)" %
+              (name, result["us_per_op"], result["ops_per_s"], result["ops"]), file=sys.stderr)
+    output = json.dumps(document, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        with open(args.output, "w") as result_file:
+            result_file.write(output + "\n")
+    return 0
+
+
+def cmd_compare(args):
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(args.current) as current_file:
+        current = json.load(current_file)
+    if baseline.get("params") != current.get("params"):
+        print("WARNING: runs used different parameters - %s vs %s" % (baseline.get("params"), current.get("params")))
+    rows = compare_results(baseline, current, args.threshold)
+    for name, before, after, change, status in rows:
+        print("%-13s: %10.2f -> %10.2f us/op (%+6.1f%%) %s" % (name, before, after, change * 100, status.upper()))
+    regressions = [row[0] for row in rows if row[4] == "regression"]
+    if regressions:
+        print("%d regression(s) beyond %.0f%%: %s" % (len(regressions), args.threshold * 100, ", ".join(regressions)))
+        return 1
+    print("No regressions beyond %.0f%%" % (args.threshold * 100))
+    return 0
+
+
+def cmd_list(args):
+    for name in BENCHMARKS:
+        print(name)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark suite of the sensors stack.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run benchmarks - results as JSON")
+    run_parser.add_argument("--count", type=int, default=1000, help="number of sensors in fleet")
+    run_parser.add_argument("--types", default="i2c,spi,uart", help="comma-separated bus types of fleet (round-robin)")
+    run_parser.add_argument("--latency", type=float, default=0.0, help="seconds per mocked driver read")
+    run_parser.add_argument("--sweeps", type=int, default=10, help="read-sweeps per 'read_sensors' run")
+    run_parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark - best is reported")
+    run_parser.add_argument("--only", help="comma-separated benchmarks to run (default: all)")
+    run_parser.add_argument("--output", help="result file (default: stdout)")
+    run_parser.set_defaults(func=cmd_run)
+    compare_parser = commands.add_parser("compare", help="compare two result files - exit status 1 on regression")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="relative slowdown per operation flagged as regression (default: 0.10)")
+    compare_parser.set_defaults(func=cmd_compare)
+    list_parser = commands.add_parser("list", help="list benchmarks")
+    list_parser.set_defaults(func=cmd_list)
+    args = parser.parse_args(argv)
+    return args.func(args)
@@ -21,12 +21,26 @@ or 4 base-classes that are more specialized.
 """
 
 import json
+import logging
+import time
 
 from sensor_properties import sensor_props
 from sensor_types.sensor_base import ExternalSensorBase, InternalSensorBase
-from sensor_types.sensor_devices import I2cSensor, SpiSensor, UartSensor, sensor_type_map
+from sensor_types.sensor_devices import I2cSensor, SpiSensor, UartSensor, sensor_base_map, sensor_type_map
+from sensor_utils import warm_start
+from sensor_utils.bus_bandwidth import BusBandwidth
+from sensor_utils.bus_batching import BatchStats, read_batched
 from sensor_utils.json_utils import JsonValidator, property_not_in_schema
+from sensor_utils.parallel_import import iter_validated_specs
+from sensor_utils.read_cache import ReadCache
+from sensor_utils.read_metrics import ReadMetrics, bus_label
 from sensor_utils.sensor_builder import SensorBuilder
+from sensor_utils.sensor_poller import READ_TIMEOUT, SensorPoller
+from sensor_utils.sensor_registry import SensorRegistry, bus_slot
+from sensor_utils.tracing import Tracer, span_of
+
+
+logger = logging.getLogger(__name__)
 
 
 # *********************** SENSORS-CLASS ***********************
@@ -35,41 +49,59 @@ class Sensors:
     """
     Class which is a PLACEHOLDER for multiple sensors of different type.
     """
-    def __init__(self, sensors=[]):
-        self.sensors = sensors
+    def __init__(self, sensors=None, bandwidth=None):
+        self.registry = SensorRegistry(sensors)
+        self.poller = None
+        self.batch_stats = None
+        self.read_cache = None
+        self.metrics = None
+        self.tracer = None
+        # Bus bandwidth accounting - new sensors oversubscribing their bus are rejected (see 'bus_bandwidth'):
+        self.bandwidth = BusBandwidth() if bandwidth is None else bandwidth
+        for sensor in self.registry:
+            self.bandwidth.add(sensor)
+
+    @property
+    def sensors(self):
+        """
+        List-view of registered sensors - kept for compatibility.
+        NOTE: modify via 'add_sensor()'/'remove_sensor()', NOT by changing the returned list!
+        """
+        return self.registry.sensors
 
     def i2c_validate(self, sensor):
-        i2c_sensors = self.get_i2c_sensors()
-        for i2c_sensor in i2c_sensors:
-            if sensor.i2c_addr == i2c_sensor.i2c_addr:
-                print("ERROR validating I2C-sensor: address=%d already in use on bus#=%d!" %
-                      (sensor.i2c_addr, sensor.base.bus_no))
-                return False
+        if self.registry.get_by_slot(bus_slot(sensor)) is not None:
+            logger.error("validating I2C-sensor: address=%d already in use on bus#=%d!",
+                         sensor.i2c_addr, sensor.base.bus_no)
+            return False
         return True
 
     def spi_validate(self, sensor):
-        spi_sensors = self.get_spi_sensors()
-        for spi_sensor in spi_sensors:
-            if sensor.base.bus_no == spi_sensor.base.bus_no and sensor.cs_no == spi_sensor.cs_no:
-                print("ERROR: validating SPI-sensor: CS=%d already in use on bus#=%d!" %
-                      (sensor.cs_no, sensor.base.bus_no))
-                return False
+        if self.registry.get_by_slot(bus_slot(sensor)) is not None:
+            logger.error("validating SPI-sensor: CS=%d already in use on bus#=%d!",
+                         sensor.cs_no, sensor.base.bus_no)
+            return False
         return True
 
     def uart_validate(self, sensor):
-        uart_sensors = self.get_uart_sensors()
-        for uart_sensor in uart_sensors:
-            if sensor.base.bus_no == uart_sensor.base.bus_no:
-                print("ERROR: validating UART-sensor: serialport=%d already in use!" % sensor.base.bus_no)
-                return False
+        if self.registry.get_by_slot(bus_slot(sensor)) is not None:
+            logger.error("validating UART-sensor: serialport=%d already in use!", sensor.base.bus_no)
+            return False
+        return True
+
+    def internal_validate(self, sensor):
+        if self.registry.get_by_slot(bus_slot(sensor)) is not None:
+            logger.error("validating internal sensor: register block at 0x%x already in use by device#=%d!",
+                         sensor.base.dev_addr, sensor.base.dev_no)
+            return False
         return True
 
     @staticmethod
     def build_sensor(sensor_clsname=None, base_clsname=None, props=None):
         if sensor_clsname is None or base_clsname is None or props is None:
             # TODO: possibly emit ERROR msg here - and/or throw??
-            print("ERROR: build_sensor() requires all of 'sensor_clsname', "
-                  "'base_clsname' and 'ppack' parameters to be provided!")
+            logger.error("build_sensor() requires all of 'sensor_clsname', "
+                         "'base_clsname' and 'ppack' parameters to be provided!")
             return None
         #
         raw_obj = sensor_clsname(base_type=base_clsname)
@@ -91,56 +123,131 @@ class Sensors:
         return sensor
 
     def add_sensor(self, json_spec):
-        validators = {"i2c": self.i2c_validate, "spi": self.spi_validate, "uart": self.uart_validate}
+        if self.tracer is None:
+            return self._add_sensor(json_spec)
+        with self.tracer.span("add_sensor", "registry"):
+            return self._add_sensor(json_spec)
+
+    def _add_sensor(self, json_spec):
+        validators = {"i2c": self.i2c_validate, "spi": self.spi_validate, "uart": self.uart_validate,
+                      "internal": self.internal_validate}
         #
         json_base_validator = JsonValidator(sensor_props.sensor_base_schema)
         #
-        # Turn JSON-input into dictionary:
-        sensor_spec = json.loads(json_spec)
-        # Validate JSON:
-        if json_base_validator.check(sensor_spec):
-            # May log something for DEBUG-purposes here ...
-            pass
-        else:
-            print("ERROR: invalid sensor JSON input!")
-            return False
-        #
-        sensor_type = sensor_spec['sensor_type']
-        #
-        sensor_class_type = sensor_type_map[sensor_type]
-        # Can validate device-specific JSON:
-        json_dev_spec_schema = sensor_props.json_dev_schemas[sensor_type]
-        json_dev_spec_validator = JsonValidator(json_dev_spec_schema)
-        # Validate ...
-        if json_dev_spec_validator.check(sensor_spec):
-            # May log something for DEBUG-purposes here ...
-            pass
-        else:
-            print("ERROR: invalid device-specific JSON input!")
-            return False
+        with span_of(self.tracer, "validate", "registry"):
+            # Turn JSON-input into dictionary:
+            sensor_spec = json.loads(json_spec)
+            # Validate JSON:
+            if json_base_validator.check(sensor_spec):
+                # May log something for DEBUG-purposes here ...
+                pass
+            else:
+                logger.error("invalid sensor JSON input!")
+                return False
+            #
+            sensor_type = sensor_spec['sensor_type']
+            #
+            sensor_class_type = sensor_type_map[sensor_type]
+            # Can validate device-specific JSON:
+            json_dev_spec_schema = sensor_props.json_dev_schemas[sensor_type]
+            json_dev_spec_validator = JsonValidator(json_dev_spec_schema)
+            # Validate ...
+            if json_dev_spec_validator.check(sensor_spec):
+                # May log something for DEBUG-purposes here ...
+                pass
+            else:
+                logger.error("invalid device-specific JSON input!")
+                return False
         # Create sensor ...
         try:
-            if property_not_in_schema([sensor_props.sensor_base_schema, json_dev_spec_schema], json_spec):
-                print("Found unknown (= 'not-in-schema') property!")
+            if property_not_in_schema([sensor_props.sensor_base_schema, json_dev_spec_schema], sensor_spec):
+                logger.error("Found unknown (= 'not-in-schema') property!")
                 raise Exception
             #
             sensor = self.build_sensor(sensor_clsname=sensor_class_type,
-                                       base_clsname=ExternalSensorBase,
+                                       base_clsname=sensor_base_map[sensor_type],
                                        props=sensor_spec)
-            # Validating sensor instance BEFORE appending to list:
+            # Validating sensor instance BEFORE adding to registry (which also checks alias/UUID uniqueness):
             validator = validators[sensor.base.type_name]
-            if validator(sensor):
-                self.sensors.append(sensor)
-            else:
+            if not validator(sensor):
                 # TODO: qualify use of 'raise' here!
                 raise Exception("Parameter ERROR: cannot add sensor to sensor-list!")
+            with span_of(self.tracer, "register", "registry"):
+                error = self.register_sensor(sensor)
+            if error is not None:
+                raise Exception("Parameter ERROR: cannot add sensor to sensor-list - %s!" % error)
         except Exception as exc:
-            print("ERROR creating sensor!!")
-            print(exc.args)
+            logger.error("creating sensor failed!! %s", exc.args)
             return False
         #
         return True
 
+    def register_sensor(self, sensor):
+        """
+        Register a built sensor: if it does not conflict with registered ones, nor oversubscribe its bus,
+        its driver handle is opened ONCE - with the sensor's full bus parameters - and the device configured.
+        Returns reason (string) why sensor was not registered - or None if it was.
+        """
+        error = self.registry.conflict(sensor)
+        if error is None:
+            error = self.bandwidth.admit(sensor)
+        if error is not None:
+            return error
+        try:
+            if not sensor.bind_driver(configure=False):
+                return "no driver for sensor type '%s'" % sensor.type_name
+            # Metrics installed BEFORE the device is configured - so that the bind-time config is timed, too:
+            if self.metrics is not None:
+                self.metrics.install(sensor)
+            if sensor.base.config is not None:
+                sensor.base.config()
+        except Exception as exc:
+            if self.metrics is not None:
+                self.metrics.uninstall(sensor)
+            return "opening driver failed - %s" % exc
+        self.registry.add(sensor)
+        self.bandwidth.add(sensor)
+        if self.read_cache is not None:
+            self.read_cache.install(sensor)
+        return None
+
+    def iter_add_sensors(self, specs, workers=1):
+        """
+        Generator version of 'add_sensors()' - yields the result of each spec as soon as it is processed,
+        so that (arbitrarily large) streams of specs can be registered without building a full report.
+        """
+        for index, sensor_spec, error in iter_validated_specs(specs, workers=workers):
+            result = {"index": index, "alias": None, "added": False, "error": None}
+            if isinstance(sensor_spec, dict):
+                result["alias"] = sensor_spec.get('alias')
+            if error is not None:
+                result["error"] = error
+                yield result
+                continue
+            #
+            with span_of(self.tracer, "register", "registry", alias=result["alias"]):
+                sensor = self.build_sensor(sensor_clsname=sensor_type_map[sensor_spec['sensor_type']],
+                                           base_clsname=sensor_base_map[sensor_spec['sensor_type']],
+                                           props=sensor_spec)
+                error = self.register_sensor(sensor)
+            if error is not None:
+                result["error"] = error
+            else:
+                result["added"] = True
+            yield result
+
+    def add_sensors(self, specs, workers=1):
+        """
+        Bulk version of 'add_sensor()'.
+        'specs' is an iterable of JSON-strings and/or dictionaries, or a file (path or file object) with
+        either JSON-lines or a top-level JSON array of specs.
+        Validators are compiled once, each spec is parsed once, and bus-conflicts
+        are checked in O(1) against the registry's bus-occupancy index.
+        With 'workers' > 1, parsing & validation are sharded across that many worker processes.
+        Returns a report - one dict per spec, with keys 'index', 'alias', 'added' and 'error'.
+        """
+        return list(self.iter_add_sensors(specs, workers=workers))
+
     def list_sensors(self):
         if len(self.sensors) == 0:
             print("No sensors registered!")
@@ -152,102 +259,258 @@ class Sensors:
             # TODO: check if 'sensor' has attribute(=method) 'get_info()' before attempting invocation!
             sensor.get_info()
 
-    def read_sensors(self):
+    def read_sensors(self, batch=None, reading_filter=None):
+        """
+        Read all sensors - returns list of values (always ALL of them, one per sensor - in sensor order).
+        If a 'ReadingBatch' is given, readings are also packed into it (sensor index, monotonic timestamp, value) -
+        with a 'ReadingFilter' given, only the readings passing the filter. A filter requires a batch (ValueError
+        otherwise) - for filtered values without one, use 'get_sensor_data()'.
+        """
+        if reading_filter is not None and batch is None:
+            raise ValueError("'reading_filter' applies to the readings packed into 'batch' - none given")
+        if self.tracer is None:
+            return self._read_sensors(batch, reading_filter, None)
+        with self.tracer.span("read_sensors", "sweep", sensors=len(self.registry)) as sweep:
+            return self._read_sensors(batch, reading_filter, None if sweep is None else self.tracer)
+
+    def _read_sensors(self, batch, reading_filter, tracer):
+        """ Sweep of 'read_sensors()' - with a 'tracer' given, each read is recorded as a span. """
         sensor_data = []
-        print("Registered sensors:")
-        print("===================")
+        # Level checked once per sweep - with INFO disabled, nothing is formatted:
+        log_values = logger.isEnabledFor(logging.INFO)
+        if log_values:
+            logger.info("Registered sensors:")
+            logger.info("===================")
         for idx, sensor in enumerate(self.sensors):
+            if tracer is not None:
+                start = tracer.now()
             val = sensor.base.read()
+            if tracer is not None:
+                tracer.complete("read", "sensor", start, args={"alias": sensor.base.alias, "bus": bus_label(sensor)})
             sensor_data.append(val)
-            if type(val) is not float:
-                # Check if list or complex value:
-                if type(val) is list:
-                    print("Value list:")
-                    print("------------")
-                    for val_no, item_val in enumerate(val):
-                        print("Value no.%d = %d" % (val_no, item_val))
-                    print("")
-                else:
-                    if isinstance(val, sensor_props.ComplexValue):
-                        print("Complex value:")
-                        print("--------------")
-                        print("Triggered: ", val.triggered)
-                        print("Channel no: ", val.channel)
-                        print("Value: ", val.ch_val)
-                        print("")
-                    else:
-                        print("ERROR: cannot parse sensor readout result!")
-            else:
-                print("Sensor no.%d: %s (type=%s) value = %s" % (idx, sensor.base.alias, sensor.base.dev_name, val))
+            if batch is not None:
+                timestamp = time.monotonic()
+                if reading_filter is None or reading_filter.accept(sensor.base.alias, val, timestamp):
+                    batch.append(idx, timestamp, val)
+            if log_values:
+                self._log_value(idx, sensor, val)
         #
         return sensor_data
 
-    def get_sensor_data(self):
-        """ Generator version of 'read_sensors()' which may be more usable. """
-        for sensor in self.sensors:
-            sensor_val = sensor.base.read()
-            sensor_name = sensor.base.alias
-            yield (sensor_name, sensor_val)  # use 'sdata_gen = sensors.get_sensor_data()' to obtain generator.
+    @staticmethod
+    def _log_value(idx, sensor, val):
+        if type(val) is not float:
+            # Check if list or complex value:
+            if type(val) is list:
+                logger.info("Value list:")
+                logger.info("------------")
+                for val_no, item_val in enumerate(val):
+                    logger.info("Value no.%d = %d", val_no, item_val)
+            else:
+                if isinstance(val, sensor_props.ComplexValue):
+                    logger.info("Complex value:")
+                    logger.info("--------------")
+                    logger.info("Triggered: %s", val.triggered)
+                    logger.info("Channel no: %s", val.channel)
+                    logger.info("Value: %s", val.ch_val)
+                else:
+                    logger.error("cannot parse sensor readout result!")
+        else:
+            logger.info("Sensor no.%d: %s (type=%s) value = %s", idx, sensor.base.alias, sensor.base.dev_name, val)
+
+    def poll_sensors(self, read_timeout=1.0):
+        """
+        Concurrent version of 'read_sensors()': reads on different buses run in parallel,
+        while reads on the same bus are serialized. Reads exceeding 'read_timeout' (seconds)
+        are marked as 'sensor_poller.READ_TIMEOUT'. Metrics of the latest sweep are in 'self.poller.stats'.
+        """
+        if self.poller is None:
+            self.poller = SensorPoller(read_timeout=read_timeout)
+        self.poller.read_timeout = read_timeout
+        sensors = self.sensors
+        sensor_data = self.poller.sweep(sensors)
+        if self.metrics is not None:
+            for sensor, val in zip(sensors, sensor_data):
+                if val is READ_TIMEOUT:
+                    self.metrics.record_timeout(sensor)
+        return sensor_data
+
+    def read_sensors_batched(self, batch=None):
+        """
+        Version of 'read_sensors()' issuing one combined bus transaction per bus, where the sensors'
+        drivers support it (see 'bus_batching'). Failed reads are returned as the exception instance.
+        Counters of the latest sweep are in 'self.batch_stats'.
+        """
+        self.batch_stats = BatchStats()
+        sensors = self.sensors
+        sensor_data = read_batched(sensors, self.batch_stats, metrics=self.metrics)
+        if batch is not None:
+            timestamp = time.monotonic()
+            for idx, val in enumerate(sensor_data):
+                if not isinstance(val, Exception):
+                    batch.append(idx, timestamp, val)
+        return sensor_data
+
+    def get_sensor_data(self, batch=None, reading_filter=None):
+        """
+        Generator version of 'read_sensors()' which may be more usable.
+        With a 'ReadingFilter' given, only readings passing the filter are yielded (and batched).
+        NOTE: when traced, the sweep-span lasts until the generator is exhausted (or closed) - consumer time included.
+        """
+        tracer = self.tracer
+        sweep = None if tracer is None else tracer.begin("get_sensor_data", "sweep", {"sensors": len(self.registry)})
+        try:
+            for idx, sensor in enumerate(self.sensors):
+                if sweep is not None:
+                    start = tracer.now()
+                sensor_val = sensor.base.read()
+                sensor_name = sensor.base.alias
+                if sweep is not None:
+                    tracer.complete("read", "sensor", start, args={"alias": sensor_name, "bus": bus_label(sensor)})
+                timestamp = time.monotonic()
+                if reading_filter is not None and not reading_filter.accept(sensor_name, sensor_val, timestamp):
+                    continue
+                if batch is not None:
+                    batch.append(idx, timestamp, sensor_val)
+                yield (sensor_name, sensor_val)  # use 'sdata_gen = sensors.get_sensor_data()' to obtain generator.
+        finally:
+            if tracer is not None:
+                tracer.end(sweep)
+
+    def enable_read_cache(self, read_cache=None):
+        """
+        Put a read-through cache (default: 'ReadCache()') in front of 'base.read()' of all registered sensors -
+        and of sensors registered later on. Returns the cache, e.g. for its 'stats()'.
+        """
+        if self.read_cache is not None:
+            self.disable_read_cache()
+        self.read_cache = ReadCache() if read_cache is None else read_cache
+        for sensor in self.registry:
+            self.read_cache.install(sensor)
+        return self.read_cache
+
+    def disable_read_cache(self):
+        if self.read_cache is None:
+            return
+        for sensor in self.registry:
+            self.read_cache.uninstall(sensor)
+        self.read_cache.shutdown()
+        self.read_cache = None
+
+    def enable_metrics(self, metrics=None):
+        """
+        Time every driver read & config call of all registered sensors - and of sensors registered later on -
+        in per-sensor and per-bus latency histograms (default: 'ReadMetrics()'). Returns the metrics, e.g. for
+        their 'snapshot()', 'prometheus_text()' or 'serve()'.
+        """
+        if self.metrics is not None:
+            self.disable_metrics()
+        self.metrics = ReadMetrics() if metrics is None else metrics
+        for sensor in self.registry:
+            self.metrics.install(sensor)
+        return self.metrics
+
+    def disable_metrics(self):
+        if self.metrics is None:
+            return
+        for sensor in self.registry:
+            self.metrics.uninstall(sensor)
+        self.metrics = None
+
+    def enable_tracing(self, tracer=None):
+        """
+        Record sweeps, per-sensor reads and sensor registration (validation included) as spans of a timeline
+        (default: 'Tracer()' - every sweep recorded). Returns the tracer - see 'Tracer.write()'.
+        """
+        if self.tracer is not None:
+            self.disable_tracing()
+        self.tracer = Tracer() if tracer is None else tracer
+        self.tracer.install()
+        return self.tracer
+
+    def disable_tracing(self):
+        if self.tracer is None:
+            return
+        self.tracer.uninstall()
+        self.tracer = None
+
+    def bus_utilization(self):
+        """ Per-bus bandwidth utilization report - see 'BusBandwidth.report()'. """
+        return self.bandwidth.report()
+
+    def save_snapshot(self, path):
+        """ Write all registered sensors - with their UUIDs - to a warm-start snapshot file (see 'warm_start'). """
+        return warm_start.save_snapshot(path, self)
+
+    def load_snapshot(self, path, workers=1):
+        """
+        Register the sensors of a warm-start snapshot file - without revalidation, unless the sensor schemas
+        changed since it was written. Returns a 'warm_start.WarmStartResult'.
+        """
+        return warm_start.load_snapshot(path, self, workers=workers)
 
     def get_i2c_sensors(self):
-        i2c_sensors = []
-        for sensor in self.sensors:
-            if sensor.base.type_name == "i2c":
-                i2c_sensors.append(sensor)
-        return i2c_sensors
+        return self.registry.get_by_type("i2c")
 
     def get_spi_sensors(self):
-        spi_sensors = []
-        for sensor in self.sensors:
-            if sensor.base.type_name == "spi":
-                spi_sensors.append(sensor)
-        return spi_sensors
+        return self.registry.get_by_type("spi")
 
     def get_uart_sensors(self):
-        uart_sensors = []
-        for sensor in self.sensors:
-            if sensor.base.type_name == "uart":
-                uart_sensors.append(sensor)
-        return uart_sensors
+        return self.registry.get_by_type("uart")
 
     def get_sensor_by_alias(self, s_alias=None):
         """
-        Find sensor by alias - which SHOULD be unique.
+        Find sensor by alias - which is unique (enforced by registry on insert).
         This is NOT the case with attribute 'dev_name'.
-        TODO: infer checks for alias uniqueness! (on input also ...)
         """
-        sensor_found = None
         if s_alias is None:
             # TODO: rather throw ArgumentException error ... (no?)
-            print("ERROR: no sensor name specified!")
-        else:
-            for sensor in self.sensors:
-                if s_alias == sensor.base.alias:
-                    sensor_found = sensor
-                    break
-        return sensor_found
+            logger.error("no sensor name specified!")
+            return None
+        return self.registry.get_by_alias(s_alias)
 
     def get_sensor_by_uuid(self, s_uuid=None):
         """
-        Find sensor by UUID - which SHOULD be unique.
+        Find sensor by UUID - which is unique (enforced by registry on insert).
         This is NOT the case with attribute 'dev_name'.
-        TODO: infer checks for UUID uniqueness! (on input also(?))
-        TODO: make more pythonic search ...
         """
-        sensor_found = None
         if s_uuid is None:
             # TODO: rather throw ArgumentException error ... (no?)
-            print("ERROR: no sensor name specified!")
+            logger.error("no sensor name specified!")
+            return None
+        return self.registry.get_by_uuid(s_uuid)
+
+    def remove_sensor(self, s_alias=None, s_uuid=None):
+        """ Remove sensor given by alias or UUID - returns True if a sensor was removed. """
+        if s_alias is not None:
+            sensor = self.registry.get_by_alias(s_alias)
         else:
-            for sensor in self.sensors:
-                if s_uuid == sensor.base.uuid:
-                    sensor_found = sensor
-                    break
-        return sensor_found
+            sensor = self.registry.get_by_uuid(s_uuid)
+        if sensor is None:
+            logger.error("no such sensor registered!")
+            return False
+        if not self.registry.remove(sensor):
+            return False
+        self.bandwidth.remove(sensor)
+        if self.read_cache is not None:
+            self.read_cache.uninstall(sensor)
+        if self.metrics is not None:
+            self.metrics.uninstall(sensor)
+        sensor.release_driver()
+        return True
+
+    def shutdown(self):
+        """ Release background threads - of the concurrent poller (per-bus threads) and of the read cache. """
+        if self.poller is not None:
+            self.poller.shutdown()
+            self.poller = None
+        if self.read_cache is not None:
+            self.read_cache.shutdown()
 
 
 # *********** TEST ******************
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
     sensors = Sensors()
     sensors.list_sensors()
     #
@@ -288,8 +551,8 @@ if __name__ == "__main__":
     print("")
     print("Adding some more sensors ...")
     sensors.add_sensor(json.dumps({"sensor_type": "uart", "bus_no": 4, "baud_rate": 38400, "dev_name": "CustomHygrometerSubmodule", "alias": "RHT-sensor4"}))
-    sensors.add_sensor(json.dumps({"sensor_type": "spi", "bus_no": 1, "cs_no": 3, "clk_speed": 5000000, "dev_name": "MPU6050", "alias": "IMU-A1"}))
-    sensors.add_sensor(json.dumps({"sensor_type": "spi", "bus_no": 1, "cs_no": 4, "clk_speed": 5000000, "dev_name": "MPU6050", "alias": "IMU-A2"}))
+    sensors.add_sensor(json.dumps({"sensor_type": "spi", "bus_no": 1, "cs_no": 3, "clk_speed": 5000000, "dev_name": "MPU6050", "alias": "IMU-A1", "sample_period": 0.01}))
+    sensors.add_sensor(json.dumps({"sensor_type": "spi", "bus_no": 1, "cs_no": 4, "clk_speed": 5000000, "dev_name": "MPU6050", "alias": "IMU-A2", "sample_period": 0.01}))
     sensors.add_sensor(json.dumps({"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "clk_speed": 100000, "dev_name": "BM281", "alias": "sensor2C"}))
     sensors.add_sensor(json.dumps({"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 77, "clk_speed": 100000, "dev_name": "BM281", "alias": "sensor2D"}))
     #
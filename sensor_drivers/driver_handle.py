@@ -0,0 +1,63 @@
+"""
+@file driver_handle.py
+@brief Per-sensor driver handles.
+A sensor does not call driver functions with (re-)computed bus settings on every access - instead a handle
+is opened ONCE per sensor, after the sensor is fully built, from its bus parameters (bus_no, i2c_addr/cs_no,
+clk_speed, baud_rate ...). All later configs and reads go through that open handle.
+Two driver styles are supported:
+- handle drivers: have 'open(type_name, params)', returning a handle with 'read()' and optional
+  'config()'/'close()' (see 'simulated_bus' for an example)
+- function drivers: plain 'read()' and optional 'config(bus_no, addr)' functions (e.g. a 'SensorDriver'
+  tuple) - wrapped by 'FunctionDriverHandle', with 'config' bound to the sensor's bus parameters
+"""
+
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+# Bus-address parameter by sensor type (for UART, the serial port = bus itself is the address):
+# (for internal sensors, the register block's address - a base property - takes that role):
+ADDRESS_PARAM = {"i2c": "i2c_addr", "spi": "cs_no", "uart": None, "internal": "dev_addr"}
+# Second argument of a function driver's 'config(bus_no, ...)':
+CONFIG_PARAM = {"i2c": "i2c_addr", "spi": "cs_no", "uart": "baud_rate", "internal": "dev_addr"}
+
+
+def bus_params(sensor):
+    """
+    Bus parameters of a (built) sensor - 'bus_no' plus all device-specific properties that are set
+    (and the address, if kept in the base - as 'dev_addr' of internal sensors).
+    """
+    params = {key: val for key, val in sensor.__dict__.items()
+              if key not in ("base", "type_name") and val is not None}
+    params["bus_no"] = sensor.base.bus_no
+    address_param = ADDRESS_PARAM.get(sensor.type_name)
+    if address_param is not None and address_param not in params:
+        params[address_param] = getattr(sensor.base, address_param, None)
+    return params
+
+
+class FunctionDriverHandle:
+    """ Handle for function drivers - 'read' IS the driver's read-function, so reads add no call overhead. """
+    def __init__(self, driver, type_name, params):
+        self.type_name = type_name
+        self.params = params
+        self.read = driver.read
+        self._config = getattr(driver, "config", None)
+
+    def config(self):
+        if self._config is None:
+            logger.debug("No configuration/initialization of sensor specified - skipping.")
+            return
+        self._config(self.params["bus_no"], self.params.get(CONFIG_PARAM[self.type_name]))
+
+    def close(self):
+        pass
+
+
+def open_driver(driver, sensor):
+    """ Open a handle of 'driver' for given sensor - using the sensor's full bus parameters. """
+    params = bus_params(sensor)
+    if hasattr(driver, "open"):
+        return driver.open(sensor.type_name, params)
+    return FunctionDriverHandle(driver, sensor.type_name, params)
@@ -0,0 +1,127 @@
+"""
+@file driver_registry.py
+@brief Registry of sensor drivers - keyed by sensor type and (optionally) device name.
+A driver is any object with a 'read' attribute (the read-function) and an optional 'config' attribute
+(the configure-function) - e.g. a 'SensorDriver' tuple, or a whole module defining 'read()'/'config()'.
+Drivers are registered either as objects, or LAZILY as entry-point style references
+('package.module:attribute', or just 'package.module'), which are imported first when the
+first sensor of that type (and device) is created - so that startup stays fast with many drivers installed.
+Besides explicit registration, drivers are discovered from installed packages' entry points in
+group 'py_sensors.drivers', named '<sensor_type>' or '<sensor_type>.<dev_name>', e.g.:
+    [project.entry-points."py_sensors.drivers"]
+    "i2c.BM280" = "bm280_driver:driver"
+Lookup order: device-specific before type-generic - and explicit registration before entry points
+before built-in defaults at the same level.
+"""
+
+import importlib
+import logging
+import threading
+from collections import namedtuple
+from importlib import metadata
+
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "py_sensors.drivers"
+
+SensorDriver = namedtuple("SensorDriver", ["read", "config"], defaults=[None])
+
+
+def load_reference(reference):
+    """ Resolve 'package.module:attribute' (or 'package.module') to the object it names - importing on demand. """
+    module_name, _, attr_path = reference.partition(":")
+    obj = importlib.import_module(module_name)
+    for attr in filter(None, attr_path.split(".")):
+        obj = getattr(obj, attr)
+    return obj
+
+
+class DriverRegistry:
+    """ Driver lookup with lazy loading - references are resolved once, then cached. """
+    def __init__(self, entry_point_group=ENTRY_POINT_GROUP):
+        self.entry_point_group = entry_point_group
+        self._explicit = {}
+        self._entry_points = None    # scanned on first lookup-miss only (scanning metadata is not free either)
+        self._defaults = {}
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def register(self, sensor_type, driver, dev_name=None):
+        """ Register driver (object or lazy reference-string) for sensor type - and device, if 'dev_name' given. """
+        key = (sensor_type, dev_name)
+        with self._lock:
+            self._explicit[key] = driver
+            self._forget(sensor_type, dev_name)
+
+    def unregister(self, sensor_type, dev_name=None):
+        key = (sensor_type, dev_name)
+        with self._lock:
+            if self._explicit.pop(key, None) is None:
+                return False
+            self._forget(sensor_type, dev_name)
+        return True
+
+    def set_default(self, sensor_type, driver):
+        """ Built-in fallback driver for sensor type - overridden by any registered or installed driver. """
+        with self._lock:
+            self._defaults[sensor_type] = driver
+            self._forget(sensor_type, None)
+
+    def _forget(self, sensor_type, dev_name):
+        # A type-generic change affects every cached lookup of that type (device lookups may fall back to it):
+        for key in list(self._loaded):
+            if key[0] == sensor_type and (dev_name is None or key[1] == dev_name):
+                del self._loaded[key]
+
+    def _scan_entry_points(self):
+        found = {}
+        try:
+            entry_points = metadata.entry_points(group=self.entry_point_group)
+        except Exception as exc:
+            logger.warning("cannot scan driver entry points - %s", exc)
+            entry_points = ()
+        for entry_point in entry_points:
+            sensor_type, _, dev_name = entry_point.name.partition(".")
+            found[(sensor_type, dev_name or None)] = entry_point
+        return found
+
+    def _candidates(self, sensor_type, dev_name):
+        if self._entry_points is None:
+            self._entry_points = self._scan_entry_points()
+        if dev_name is not None:
+            yield self._explicit.get((sensor_type, dev_name))
+            yield self._entry_points.get((sensor_type, dev_name))
+        yield self._explicit.get((sensor_type, None))
+        yield self._entry_points.get((sensor_type, None))
+        yield self._defaults.get(sensor_type)
+
+    def get(self, sensor_type, dev_name=None):
+        """ Driver for sensor type (and device) - loading it now if not done before. None if no driver found. """
+        key = (sensor_type, dev_name)
+        driver = self._loaded.get(key)
+        if driver is not None:
+            return driver
+        with self._lock:
+            for candidate in self._candidates(sensor_type, dev_name):
+                if candidate is None:
+                    continue
+                if isinstance(candidate, str):
+                    candidate = load_reference(candidate)
+                elif isinstance(candidate, metadata.EntryPoint):
+                    candidate = candidate.load()
+                self._loaded[key] = candidate
+                return candidate
+        logger.error("no driver found for sensor type '%s' (device: %s)!", sensor_type, dev_name)
+        return None
+
+    def is_loaded(self, sensor_type, dev_name=None):
+        return (sensor_type, dev_name) in self._loaded
+
+
+drivers = DriverRegistry()
+
+
+def register_driver(sensor_type, driver, dev_name=None):
+    """ Register a driver in the default registry - see 'DriverRegistry.register()'. """
+    drivers.register(sensor_type, driver, dev_name)
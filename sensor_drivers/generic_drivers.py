@@ -1,37 +1,47 @@
+import logging
 
+from sensor_drivers.driver_registry import SensorDriver
 from sensor_properties.sensor_props import ComplexValue
 
 
+logger = logging.getLogger(__name__)
+
+
 # static functions - could as well be @staticmethod-decorated methods in 'Sensors' class.
 # =======================================================================================
 def configure_i2c_sensor(bus_no=None, i2c_addr=None):
     if bus_no is None or i2c_addr is None:
-        print("Skipping config ...")
+        logger.debug("Skipping config ...")
     else:
-        print("Configuring I2C-sensor on bus no.%d, address=%d ..." % (bus_no, i2c_addr))
+        logger.debug("Configuring I2C-sensor on bus no.%d, address=%d ...", bus_no, i2c_addr)
 
 
 def configure_spi_sensor(bus_no=None, cs_no=None):
-    if bus_no is None or cs_num is None:
-        print("Skipping config ...")
+    if bus_no is None or cs_no is None:
+        logger.debug("Skipping config ...")
     else:
-        print("Configuring SPI-sensor on bus no.%d, CS-num=%d..." % (bus_no, cs_num))
+        logger.debug("Configuring SPI-sensor on bus no.%d, CS-num=%d...", bus_no, cs_no)
 
 
 def get_i2c_val():
-    print("Getting I2C-sensor value ...")
+    logger.debug("Getting I2C-sensor value ...")
     # Returns a single value (which would typically be float-type):
     return 1.12345
 
 
 def get_spi_val():
-    print("Getting SPI-sensor value ...")
+    logger.debug("Getting SPI-sensor value ...")
     # Demonstrates returning a complex object:
     return ComplexValue(True, 7, 8.765)
 
 
 def get_uart_val():
-    print("Getting UART-sensor value ...")
+    logger.debug("Getting UART-sensor value ...")
     # Demonstrate returning a list (of values), instead of a single value:
     return [3, 4, 5]
 
+
+# Drivers per sensor type - as looked up via the driver registry:
+i2c_driver = SensorDriver(read=get_i2c_val, config=configure_i2c_sensor)
+spi_driver = SensorDriver(read=get_spi_val, config=configure_spi_sensor)
+uart_driver = SensorDriver(read=get_uart_val)
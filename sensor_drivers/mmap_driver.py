@@ -0,0 +1,133 @@
+"""
+@file mmap_driver.py
+@brief Handle driver (see 'driver_handle') for MCU/SoC-internal sensors - the peripheral's register block
+is memory-mapped ONCE when the handle is opened, so a read is a memory access instead of a syscall.
+The block is mapped from the sensor's 'mem_path':
+- /dev/mem (default): 'dev_addr' is the physical address of the register block (needs root - and the
+  range must not be blocked by CONFIG_STRICT_DEVMEM)
+- a UIO device (/dev/uioN): memory map no. 'uio_map' of the device is mapped, 'dev_addr' is informational
+  only (the kernel exports it in /sys/class/uio/uioN/maps/mapM/addr)
+- any other (plain) file: 'dev_addr' is the file offset - for testing without hardware
+'channels' result registers of 'sample_type' (NumPy dtype, default "<u2") start 'reg_offset' bytes into
+the block. The handle exposes them zero-copy - every access reads the live registers:
+- 'handle.view': 'memoryview' of the registers (cast to their type if in native byte order, else bytes)
+- 'handle.array': NumPy array over the same memory
+'read()' returns a copy as Python number(s), as the other drivers do; for sampling multi-channel ADC blocks,
+'read_into(out)'/'read_block(out)' copy into preallocated arrays - no per-sample object is created.
+"""
+
+import logging
+import mmap
+import os
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+UIO_PREFIX = "/dev/uio"
+
+
+def map_region(params):
+    """
+    (mmap offset, offset of the result registers within the mapping) for given handle parameters.
+    mmap offsets must be multiples of the allocation granularity - so the mapping starts at the page
+    holding the registers.
+    """
+    reg_offset = params.get("reg_offset", 0)
+    if params.get("mem_path", "/dev/mem").startswith(UIO_PREFIX):
+        # UIO: map N lives at offset N * page-size of the device - and starts at the register block:
+        return params.get("uio_map", 0) * mmap.PAGESIZE, reg_offset
+    start = params["dev_addr"] + reg_offset
+    map_offset = start - start % mmap.ALLOCATIONGRANULARITY
+    return map_offset, start - map_offset
+
+
+class MmapHandle:
+    """ Open handle of one internal sensor - a read-only mapping of its register block. """
+    def __init__(self, params):
+        self.params = params
+        self.dtype = np.dtype(params.get("sample_type", "<u2"))
+        self.channels = params.get("channels", 1)
+        self.nbytes = self.dtype.itemsize * self.channels
+        mem_path = params.get("mem_path", "/dev/mem")
+        map_offset, self.offset = map_region(params)
+        # O_SYNC - for /dev/mem, an uncached mapping, as needed for device registers:
+        fd = os.open(mem_path, os.O_RDONLY | getattr(os, "O_SYNC", 0))
+        try:
+            self.mem = mmap.mmap(fd, self.offset + self.nbytes, mmap.MAP_SHARED, mmap.PROT_READ, offset=map_offset)
+        except ValueError as exc:
+            # E.g. a (test) file shorter than the register block:
+            raise OSError("cannot map %d bytes at offset %d of '%s' - %s" %
+                          (self.offset + self.nbytes, map_offset + self.offset, mem_path, exc)) from exc
+        finally:
+            # The mapping stays valid without the file descriptor:
+            os.close(fd)
+        self.array = np.frombuffer(self.mem, dtype=self.dtype, count=self.channels, offset=self.offset)
+        self._raw = memoryview(self.mem)[self.offset:self.offset + self.nbytes]
+        self.view = self._raw.cast(self.dtype.char) if self.dtype.isnative else self._raw
+
+    def _check_open(self):
+        if self.array is None:
+            raise OSError("register block of internal sensor at 0x%x is unmapped" % self.params["dev_addr"])
+
+    def read(self):
+        """ Register value(s) - a number for one channel, else a list with one number per channel. """
+        self._check_open()
+        if self.channels == 1:
+            return self.array[0].item()
+        return self.array.tolist()
+
+    def _raw_target(self, out):
+        """ Bytes-view of 'out' if registers can be copied into it as they are (same type, contiguous) - else None. """
+        if out.dtype == self.dtype and out.flags.c_contiguous:
+            return memoryview(out).cast("B")
+        return None
+
+    def read_into(self, out):
+        """ Copy all channels into array 'out' (shape: channels) - returns 'out'. """
+        self._check_open()
+        target = self._raw_target(out)
+        if target is None:
+            np.copyto(out, self.array)
+        else:
+            target[:] = self._raw
+        return out
+
+    def read_block(self, out):
+        """ Fill array 'out' (shape: samples x channels) with consecutive reads of all channels - returns 'out'. """
+        self._check_open()
+        target = self._raw_target(out)
+        if target is None:
+            array = self.array
+            for row in out:
+                np.copyto(row, array)
+            return out
+        # Plain memory copies of the register block - no array (or any other) object per sample:
+        raw = self._raw
+        nbytes = self.nbytes
+        for start in range(0, len(target), nbytes):
+            target[start:start + nbytes] = raw
+        return out
+
+    def close(self):
+        if self.array is None:
+            return
+        self.array = None
+        self.view.release()
+        self._raw.release()
+        try:
+            self.mem.close()
+        except BufferError:
+            # Views handed out (e.g. slices of 'array') are still alive - the mapping goes with the last of them:
+            logger.warning("register block at 0x%x still referenced by views - unmapped when they are released",
+                           self.params["dev_addr"])
+
+
+class MmapDriver:
+    """ Handle driver - one mapping per opened internal sensor. """
+    def open(self, type_name, params):
+        return MmapHandle(params)
+
+
+mmap_driver = MmapDriver()
@@ -1,37 +1,65 @@
+import asyncio
+import logging
+import time
 
+from sensor_drivers.driver_registry import SensorDriver
 from sensor_properties.sensor_props import ComplexValue
 
 
+logger = logging.getLogger(__name__)
+
+
 # static mock-up functions - could as well be @staticmethod-decorated methods in 'Sensors' class.
 # ===============================================================================================
 def configure_i2c_sensor(bus_no=None, i2c_addr=None):
     if bus_no is None or i2c_addr is None:
-        print("Skipping config ...")
+        logger.debug("Skipping config ...")
     else:
-        print("MOCK: Configuring I2C-sensor on bus no.%d, address=%d ..." % (bus_no, i2c_addr))
+        logger.debug("MOCK: Configuring I2C-sensor on bus no.%d, address=%d ...", bus_no, i2c_addr)
 
 
 def configure_spi_sensor(bus_no=None, cs_no=None):
-    if bus_no is None or cs_num is None:
-        print("Skipping config ...")
+    if bus_no is None or cs_no is None:
+        logger.debug("Skipping config ...")
     else:
-        print("MOCK: Configuring SPI-sensor on bus no.%d, CS-num=%d..." % (bus_no, cs_num))
+        logger.debug("MOCK: Configuring SPI-sensor on bus no.%d, CS-num=%d...", bus_no, cs_no)
 
 
 def get_i2c_val():
-    print("MOCK: Getting I2C-sensor value ...")
+    logger.debug("MOCK: Getting I2C-sensor value ...")
     # Returns a single value (which would typically be float-type):
     return 1.12345
 
 
 def get_spi_val():
-    print("MOCK: Getting SPI-sensor value ...")
+    logger.debug("MOCK: Getting SPI-sensor value ...")
     # Demonstrates returning a complex object:
     return ComplexValue(True, 7, 8.765)
 
 
 def get_uart_val():
-    print("MOCK: Getting UART-sensor value ...")
+    logger.debug("MOCK: Getting UART-sensor value ...")
     # Demonstrate returning a list (of values), instead of a single value:
     return [3, 4, 5]
 
+
+# Drivers per sensor type - as looked up via the driver registry:
+i2c_driver = SensorDriver(read=get_i2c_val, config=configure_i2c_sensor)
+spi_driver = SensorDriver(read=get_spi_val, config=configure_spi_sensor)
+uart_driver = SensorDriver(read=get_uart_val)
+
+
+def make_slow_read(read_func, latency=0.01):
+    """ Wrap a (mock) read-function so that each read takes 'latency' seconds - simulating a slow device. """
+    def slow_read():
+        time.sleep(latency)
+        return read_func()
+    return slow_read
+
+
+def make_slow_async_read(read_func, latency=0.01):
+    """ Native coroutine version of 'make_slow_read()' - for drivers with async I/O. """
+    async def slow_read():
+        await asyncio.sleep(latency)
+        return read_func()
+    return slow_read
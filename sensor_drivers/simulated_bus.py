@@ -0,0 +1,156 @@
+"""
+@file simulated_bus.py
+@brief Simulated bus backend - a handle driver (see 'driver_handle') for testing without hardware.
+Devices are attached to simulated I2C/SPI/UART buses by address (I2C address, SPI chip-select - or,
+for UART, the serial port itself). Opening a handle for an address where no device is attached fails
+like a real bus would (no ACK). Every bus counts its opens and transactions.
+Bus time is charged per transaction, as on real buses:
+- a fixed overhead per transaction ('transaction_time' - syscall, start/stop conditions, CS setup ...)
+- plus wire time per device read, from the device's bus parameters (see 'bus_bandwidth.wire_time()')
+A combined transaction ('read_many()') pays the fixed overhead once for all devices read in it.
+Charged time accumulates in 'busy_time' - and is actually slept unless 'realtime=False'.
+Use as:
+    backend = SimulatedBackend()
+    backend.attach("i2c", 2, 0x4e, read=lambda: 21.5)
+    register_driver("i2c", backend)
+"""
+
+import threading
+import time
+
+from sensor_drivers.driver_handle import ADDRESS_PARAM
+from sensor_utils.bus_bandwidth import wire_time
+
+
+class SimulatedBus:
+    """ One simulated bus - transactions are serialized, as on a physical bus. """
+    def __init__(self, type_name, bus_no, open_time=0.0, transaction_time=0.0, realtime=True):
+        self.type_name = type_name
+        self.bus_no = bus_no
+        self.open_time = open_time
+        self.transaction_time = transaction_time
+        self.realtime = realtime
+        self.devices = {}        # address -> read-function
+        self.read_bytes = {}     # address -> bytes transferred per read
+        self.settings = {}       # address -> bus parameters applied by last 'config()'
+        self.no_of_opens = 0
+        self.no_of_open_handles = 0
+        self.no_of_transactions = 0
+        self.busy_time = 0.0
+        self.lock = threading.Lock()
+
+    def _charge(self, seconds):
+        self.busy_time += seconds
+        if self.realtime and seconds > 0.0:
+            time.sleep(seconds)
+
+    def open(self):
+        with self.lock:
+            self._charge(self.open_time)
+            self.no_of_opens += 1
+            self.no_of_open_handles += 1
+
+    def close(self):
+        with self.lock:
+            self.no_of_open_handles -= 1
+
+    def configure(self, address, params):
+        with self.lock:
+            self.no_of_transactions += 1
+            self._charge(self.transaction_time)
+            self.settings[address] = dict(params)
+
+    def transfer(self, address, params):
+        with self.lock:
+            self.no_of_transactions += 1
+            self._charge(self.transaction_time + wire_time(self.type_name, params, self.read_bytes[address]))
+            return self.devices[address]()
+
+    def transfer_many(self, requests):
+        """ ONE combined transaction reading all (address, params) requests - in the given order. """
+        values = []
+        with self.lock:
+            self.no_of_transactions += 1
+            charge = self.transaction_time
+            for address, params in requests:
+                charge += wire_time(self.type_name, params, self.read_bytes[address])
+                try:
+                    values.append(self.devices[address]())
+                except Exception as exc:
+                    values.append(exc)
+            self._charge(charge)
+        return values
+
+
+class SimulatedHandle:
+    """ Open handle of one device on a simulated bus. """
+    def __init__(self, bus, address, params):
+        self.bus = bus
+        self.address = address
+        self.params = params
+        self.closed = False
+        # Handles with the same batch group can be read together, in one 'read_many()':
+        self.batch_group = bus
+
+    def config(self):
+        self.bus.configure(self.address, self.params)
+
+    def _check_open(self):
+        if self.closed:
+            raise OSError("handle of %s-device %s on bus no.%d is closed" %
+                          (self.bus.type_name, self.address, self.bus.bus_no))
+
+    def read(self):
+        self._check_open()
+        return self.bus.transfer(self.address, self.params)
+
+    def read_many(self, handles):
+        """ Read devices of all given handles (same batch group) in one combined transaction. """
+        for handle in handles:
+            handle._check_open()
+        return self.bus.transfer_many([(handle.address, handle.params) for handle in handles])
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.bus.close()
+
+
+class SimulatedBackend:
+    """ Handle driver over a set of simulated buses - created on demand per (type, bus_no). """
+    def __init__(self, open_time=0.0, transaction_time=0.0, realtime=True):
+        self.open_time = open_time
+        self.transaction_time = transaction_time
+        self.realtime = realtime
+        self.buses = {}
+
+    def bus(self, type_name, bus_no):
+        key = (type_name, bus_no)
+        bus = self.buses.get(key)
+        if bus is None:
+            bus = SimulatedBus(type_name, bus_no, self.open_time, self.transaction_time, self.realtime)
+            self.buses[key] = bus
+        return bus
+
+    def attach(self, type_name, bus_no, address=None, read=None, read_bytes=2):
+        """ Attach device answering reads via 'read()' - at 'address' (None for UART). """
+        bus = self.bus(type_name, bus_no)
+        bus.devices[address] = read
+        bus.read_bytes[address] = read_bytes
+
+    def open(self, type_name, params):
+        bus = self.bus(type_name, params["bus_no"])
+        address_param = ADDRESS_PARAM[type_name]
+        address = None if address_param is None else params.get(address_param)
+        if address not in bus.devices:
+            raise OSError("no %s-device at address %s on bus no.%d" % (type_name, address, bus.bus_no))
+        bus.open()
+        return SimulatedHandle(bus, address, params)
+
+    @property
+    def busy_time(self):
+        return sum(bus.busy_time for bus in self.buses.values())
+
+    @property
+    def no_of_transactions(self):
+        return sum(bus.no_of_transactions for bus in self.buses.values())
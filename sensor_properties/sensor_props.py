@@ -1,5 +1,7 @@
 
 
+from collections import namedtuple
+
 # TODO: add max/min clk-speed(s) etc!
 MAX_BAUD_RATE = 921400
 MIN_BAUD_RATE = 2400
@@ -10,11 +12,21 @@ MAX_I2C_ADDR = 127
 # Sensor data types
 # ==================
 class ComplexValue:
+    # No per-instance '__dict__' - one is allocated for every SPI-read:
+    __slots__ = ("triggered", "channel", "ch_val")
+
     def __init__(self, triggered=False, channel=-1, ch_val=0.0):
         self.triggered = triggered
         self.channel = channel
         self.ch_val = ch_val
 
+    def __repr__(self):
+        return "ComplexValue(triggered=%s, channel=%d, ch_val=%s)" % (self.triggered, self.channel, self.ch_val)
+
+
+# Compact reading: index of sensor (in 'Sensors.sensors'), monotonic timestamp and value:
+SensorReading = namedtuple("SensorReading", ["sensor_idx", "timestamp", "value"])
+
 
 # Sensor JSON schemas
 # ====================
@@ -24,21 +36,23 @@ class ComplexValue:
 # Base-level schema:
 sensor_base_schema = {
     "type": "object",
-    "required": ["sensor_type", "bus_no", "dev_name", "alias"],
+    "required": ["sensor_type", "dev_name", "alias"],    # 'bus_no' required by external (bus-)sensor types
     "properties": {
         "uuid": {"type": "integer"},
         "sensor_type": {"type": "string"},
         "bus_no": {"type": "integer"},
         "dev_name": {"type": "string"},
         "alias": {"type": "string"},
-        "pwr_control": {"type": "bool"},   # default=False unless specified. TODO: how to set up pwrcntrl-handler?
+        "pwr_control": {"type": "boolean"},   # default=False unless specified. TODO: how to set up pwrcntrl-handler?
+        "sample_period": {"type": "number"},   # seconds between scheduled reads - scheduler default unless specified
+        "read_bytes": {"type": "integer"},     # bytes transferred per read - for bus bandwidth accounting
     },
 }
 
 # Device-specific schemas:
 sensor_i2c_schema = {
     "type": "object",
-    "required": ["i2c_addr"],
+    "required": ["bus_no", "i2c_addr"],
     "properties": {
         "i2c_addr": {"type": "integer"},
         "clk_speed": {"type": "integer"},   # default=100000 unless specified  (overridden in sensor-driver?)
@@ -47,14 +61,14 @@ sensor_i2c_schema = {
 
 sensor_spi_schema = {
     "type": "object",
-    "required": ["cs_no"],
+    "required": ["bus_no", "cs_no"],
     "properties": {
         "cs_no": {"type": "integer"},
         "data_bits": {"type": "integer"},  # default unless specified (overridden in sensor-driver?)
         "spi_mode": {"type": "integer"},   # default=(mode)0 unless specified  (overridden in sensor-driver?)
         "clk_speed": {"type": "integer"},   # default=100000 unless specified  (overridden in sensor-driver?)
-        "msb_first": {"type": "bool"},      # default=True unless specified  (overridden in sensor-driver?)
-        "cs_toggle": {"type": "bool"},      # default=True unless specified  (overridden in sensor-driver?)
+        "msb_first": {"type": "boolean"},   # default=True unless specified  (overridden in sensor-driver?)
+        "cs_toggle": {"type": "boolean"},   # default=True unless specified  (overridden in sensor-driver?)
         "cycles_before": {"type": "integer"},      # default=0 unless specified  (overridden in sensor-driver?)
         "cycles_after": {"type": "integer"},      # default=0 unless specified  (overridden in sensor-driver?)
     },
@@ -62,21 +76,37 @@ sensor_spi_schema = {
 
 sensor_uart_schema = {
     "type": "object",
-    "required": ["baud_rate"],
+    "required": ["bus_no", "baud_rate"],
     "properties": {
         "baud_rate": {"type": "integer"},
         "data_bits": {"type": "integer"},   # default=8 unless specified
-        "parity": {"type": "bool"},         # default=False unless specified
+        "parity": {"type": "boolean"},      # default=False unless specified
         "stop_bits": {"type": "integer"},    # default=1 unless specified
     },
 }
 
 
+# MCU/SoC-internal sensor - register block memory-mapped from 'mem_path' (see 'mmap_driver'):
+sensor_internal_schema = {
+    "type": "object",
+    "required": ["dev_no", "dev_addr"],
+    "properties": {
+        "dev_no": {"type": "integer"},        # peripheral instance, e.g. 0 for ADC0
+        "dev_addr": {"type": "integer"},      # start of register-block: physical address (/dev/mem) or file offset
+        "use_irq": {"type": "boolean"},       # default=False unless specified
+        "mem_path": {"type": "string"},       # default="/dev/mem" - or a UIO device (/dev/uioN), or a plain file
+        "uio_map": {"type": "integer"},       # default=0 - memory map no. of a UIO device
+        "reg_offset": {"type": "integer"},    # default=0 - offset of the result registers within the block
+        "channels": {"type": "integer"},      # default=1 - no. of result registers (e.g. ADC channels)
+        "sample_type": {"type": "string"},    # default="<u2" - NumPy dtype of a result register
+    },
+}
 
 # Mapping to sensor-type:
 # -----------------------
 json_dev_schemas = {
                     "i2c": sensor_i2c_schema,
                     "spi": sensor_spi_schema,
-                    "uart": sensor_uart_schema
+                    "uart": sensor_uart_schema,
+                    "internal": sensor_internal_schema
                     }
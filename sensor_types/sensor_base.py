@@ -14,8 +14,12 @@ class ExternalSensorBase:
         self.uuid = uuid.uuid4()     # TODO: assess - should UUID creation happen first when a new sensor is accepted?
         self.config = config
         self.read = read
+        self.close = None            # set - like 'config' & 'read' - when a driver handle is bound
+        self.handle = None           # the bound driver handle itself (runtime-only, never persisted)
         self.type_name = type_name
         self.bus_no = bus_no
+        self.sample_period = None    # set from (optional) JSON-property - scheduler default if None
+        self.read_bytes = None       # set from (optional) JSON-property - per-type default if None
         if dev_name:
             self.dev_name = dev_name
         else:
@@ -49,7 +53,12 @@ class InternalSensorBase:
     """
     def __init__(self, type_name=None, dev_no=None, dev_addr=None, dev_name=None, use_irq=False, alias=None, read=None):
         self.uuid = uuid.uuid4()
+        self.config = None
         self.read = read
+        self.close = None            # set - like 'config' & 'read' - when a driver handle is bound
+        self.handle = None           # the bound driver handle itself (runtime-only, never persisted)
+        self.sample_period = None    # set from (optional) JSON-property - scheduler default if None
+        self.read_bytes = None       # set from (optional) JSON-property - per-type default if None
         # TODO: throw error if =None or negative (and possibly above some limit)!
         self.type_name = type_name
         self.dev_no = dev_no
@@ -66,6 +75,11 @@ class InternalSensorBase:
         #
         self.use_irq = use_irq
 
+    @property
+    def bus_no(self):
+        """ Peripheral instance (e.g. ADC0, ADC1) - in the role of the bus no. of external sensors. """
+        return self.dev_no
+
     def get_info(self):
         if self.type_name is None:
             print("Unknown sensor type - cannot show info!")
@@ -73,7 +87,7 @@ class InternalSensorBase:
         # INFO:
         print("Internal sensor properties:")
         print("---------------------------")
-        print("%Device no: %d" % self.dev_no)
+        print("Device no: %d" % self.dev_no)
         print("Sensor alias: %s" % self.alias)
         print("Device-specific properties:")
         print("Device address: %x" % self.dev_addr)
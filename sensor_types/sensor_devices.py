@@ -1,11 +1,22 @@
 # Helper function(s) and class(es):
+import logging
+
+from sensor_drivers.driver_handle import open_driver
+from sensor_drivers.driver_registry import drivers
+from sensor_properties.sensor_props import ComplexValue    # re-exported - formerly came in with the driver star-import
+from sensor_types.sensor_base import ExternalSensorBase, InternalSensorBase
 
 MOCKED_DRIVER_TEST = False
 
-if MOCKED_DRIVER_TEST:
-    from sensor_drivers.mocked_sensor_driver import *
-else:
-    from sensor_drivers.generic_drivers import *
+# Built-in drivers - registered lazily, i.e. imported first when the first sensor of a type is created:
+DRIVER_MODULE = "sensor_drivers.mocked_drivers" if MOCKED_DRIVER_TEST else "sensor_drivers.generic_drivers"
+for _type_name in ("i2c", "spi", "uart"):
+    drivers.set_default(_type_name, "%s:%s_driver" % (DRIVER_MODULE, _type_name))
+# Internal sensors read their memory-mapped register block - no bus, so the same driver when mocked:
+drivers.set_default("internal", "sensor_drivers.mmap_driver:mmap_driver")
+
+
+logger = logging.getLogger(__name__)
 
 
 class SensorHelper(object):
@@ -17,30 +28,50 @@ class SensorHelper(object):
             if sensor_prop != 'base' and sensor_prop != 'type_name':
                 print("Sensor property %s = %s" % (sensor_prop, prop_value))
 
+    def bind_driver(self, registry=drivers, configure=True):
+        """
+        Open driver handle for this sensor - AFTER it is built, so with its full bus parameters - and
+        configure the device once (unless 'configure' is False - then the caller does, via 'base.config').
+        Reads and configs then go through the open handle.
+        """
+        driver = registry.get(self.type_name, self.base.dev_name)
+        if driver is None:
+            return False
+        handle = open_driver(driver, self)
+        self.base.handle = handle
+        self.base.read = handle.read
+        self.base.config = getattr(handle, "config", None)
+        self.base.close = getattr(handle, "close", None)
+        if configure and self.base.config is not None:
+            self.base.config()
+        return True
+
+    def release_driver(self):
+        """ Close driver handle (if any) - the sensor cannot be read afterwards. """
+        if getattr(self.base, "close", None) is not None:
+            self.base.close()
+        self.base.read = self.base.config = self.base.close = self.base.handle = None
+
 
 # Bus-specific sensor classes ...
 
 class I2cSensor(SensorHelper):
 
     def __init__(self, base_type=None):
-        print("Creating a I2C sensor ...")
+        logger.debug("Creating a I2C sensor ...")
         self.type_name = "i2c"
         self.i2c_addr = None
         self.clk_speed = 100000   # default unless specified
         if base_type is None:
-            print("ERROR: 'base_type' NOT defined!")
-        self.base = base_type(type_name="i2c", config=configure_i2c_sensor, read=get_i2c_val)
-        # Configure/Initialize sensor if needed:
-        if self.base.config is None:
-            print("No configuration/initialization of sensor specified initially - skipping.")
-        else:
-            self.base.config(self.base.bus_no, self.i2c_addr)
+            logger.error("'base_type' NOT defined!")
+        # Driver is bound first when the sensor is fully built - see 'bind_driver()':
+        self.base = base_type(type_name="i2c")
 
 
 class SpiSensor(SensorHelper):
 
     def __init__(self, base_type=None):
-        print("Creating a SPI sensor ...")
+        logger.debug("Creating a SPI sensor ...")
         self.type_name = "spi"
         self.cs_no = None
         self.spi_mode = 0
@@ -52,19 +83,15 @@ class SpiSensor(SensorHelper):
         self.cycles_after = 0    # default unless specified
 
         if base_type is None:
-            print("ERROR: 'base_type' NOT defined!")
-        self.base = base_type(type_name="spi", config=configure_spi_sensor, read=get_spi_val)
-        # Configure/Initialize sensor if needed:
-        if self.base.config is None:
-            print("No configuration/initialization of sensor specified - skipping.")
-        else:
-            self.base.config(self.base.bus_no, self.cs_no)
+            logger.error("'base_type' NOT defined!")
+        # Driver is bound first when the sensor is fully built - see 'bind_driver()':
+        self.base = base_type(type_name="spi")
 
 
 class UartSensor(SensorHelper):
 
     def __init__(self, base_type=None):
-        print("Creating a UART sensor ...")
+        logger.debug("Creating a UART sensor ...")
         self.type_name = "uart"
         self.bus_no = None
         self.baud_rate = None
@@ -73,14 +100,32 @@ class UartSensor(SensorHelper):
         self.stop_bits = 1   # default unless specified
         #
         if base_type is None:
-            print("ERROR: 'base_type' NOT defined!")
-        self.base = base_type(type_name="uart", read=get_uart_val)
-        # Configure/Initialize sensor if needed:
-        if self.base.config is None:
-            print("No configuration/initialization of sensor specified - skipping.")
-        else:
-            self.base.config(self.base.bus_no, self.cs_no)
+            logger.error("'base_type' NOT defined!")
+        # Driver is bound first when the sensor is fully built - see 'bind_driver()':
+        self.base = base_type(type_name="uart")
+
+
+# MCU/SoC-internal sensor classes ...
+
+class InternalSensor(SensorHelper):
+
+    def __init__(self, base_type=None):
+        logger.debug("Creating an internal sensor ...")
+        self.type_name = "internal"
+        self.mem_path = "/dev/mem"   # default unless specified - or a UIO device (/dev/uioN), or a plain file
+        self.uio_map = None          # memory map no. of UIO device - 0 unless specified
+        self.reg_offset = 0          # default unless specified
+        self.channels = 1            # default unless specified
+        self.sample_type = "<u2"     # default unless specified
+        #
+        if base_type is None:
+            logger.error("'base_type' NOT defined!")
+        # Driver is bound first when the sensor is fully built - see 'bind_driver()':
+        self.base = base_type(type_name="internal")
 
 
-sensor_type_map = {"i2c": I2cSensor, "spi": SpiSensor, "uart": UartSensor}
+sensor_type_map = {"i2c": I2cSensor, "spi": SpiSensor, "uart": UartSensor, "internal": InternalSensor}
+# Base class a sensor type is built with:
+sensor_base_map = {"i2c": ExternalSensorBase, "spi": ExternalSensorBase, "uart": ExternalSensorBase,
+                   "internal": InternalSensorBase}
 
@@ -0,0 +1,85 @@
+"""
+@file async_sensors.py
+@brief asyncio-native access to a 'Sensors' container.
+Drivers may supply native coroutine read-functions, which are awaited directly on the event loop.
+Plain (blocking) read-functions are wrapped automatically and run in an executor.
+Each bus has its own asyncio.Lock, so reads on the same bus are serialized,
+while reads on different buses proceed concurrently from a single event loop.
+"""
+
+import asyncio
+import inspect
+import logging
+
+from sensor_utils.sensor_poller import bus_key
+
+
+logger = logging.getLogger(__name__)
+
+
+def is_async_read(read_func):
+    """
+    True if the read-function is a native coroutine function - or a wrapper awaited like one
+    (an object with 'async def __call__', e.g. the timing wrapper of 'read_metrics').
+    """
+    return inspect.iscoroutinefunction(read_func) or inspect.iscoroutinefunction(getattr(read_func, "__call__", None))
+
+
+class AsyncSensors:
+    """
+    Async front-end for a 'Sensors' instance.
+    Results follow the conventions of 'SensorPoller': a driver exception is returned in place of the value.
+    """
+    def __init__(self, sensors=None, executor=None):
+        if sensors is None:
+            logger.error("no 'Sensors' instance given!")
+        self.sensors = sensors
+        self.executor = executor    # 'None' means the event loop's default executor
+        self._bus_locks = {}
+
+    def _bus_lock(self, sensor):
+        key = bus_key(sensor)
+        lock = self._bus_locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._bus_locks[key] = lock
+        return lock
+
+    async def _read(self, sensor):
+        read_func = sensor.base.read
+        async with self._bus_lock(sensor):
+            if is_async_read(read_func):
+                return await read_func()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, read_func)
+
+    async def read_sensor(self, alias=None):
+        """ Value of sensor given by alias - or the driver exception raised (None if no such sensor). """
+        sensor = self.sensors.get_sensor_by_alias(alias)
+        if sensor is None:
+            logger.error("no sensor by alias '%s' found!", alias)
+            return None
+        try:
+            return await self._read(sensor)
+        except Exception as exc:
+            return exc
+
+    async def read_all(self):
+        """ Async counterpart of 'Sensors.read_sensors()' - values in sensor order. """
+        return await asyncio.gather(*[self._read(sensor) for sensor in self.sensors.sensors],
+                                    return_exceptions=True)
+
+    async def get_sensor_data(self):
+        """ Async generator counterpart of 'Sensors.get_sensor_data()' - yields (alias, value) in sensor order. """
+        sensors = self.sensors.sensors
+        tasks = [asyncio.ensure_future(self._read(sensor)) for sensor in sensors]
+        try:
+            for sensor, task in zip(sensors, tasks):
+                try:
+                    sensor_val = await task
+                except Exception as exc:
+                    sensor_val = exc
+                yield (sensor.base.alias, sensor_val)
+        finally:
+            for task in tasks:
+                task.cancel()
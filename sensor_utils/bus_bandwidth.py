@@ -0,0 +1,115 @@
+"""
+@file bus_bandwidth.py
+@brief Bandwidth accounting per bus - and admission control for new sensors.
+Each sensor loads its bus with (sample rate) x (bus time per read), where the sample rate is 1/'sample_period'
+(or the scheduler default) and the bus time per read follows from the sensor's bus parameters:
+  I2C: start + address byte + data bytes (9 clocks per byte incl. ACK) + stop, at 'clk_speed'
+  SPI: 'cycles_before' + 'data_bits' per data byte + 'cycles_after', at 'clk_speed'
+  UART: start + 'data_bits' + parity + 'stop_bits' per data byte, at 'baud_rate'
+  internal: none - memory-mapped registers, so internal sensors never load a bus
+Bytes per read come from JSON-property 'read_bytes', or a per-type default.
+The utilization of a bus is the sum of the loads of its sensors (1.0 = bus saturated).
+A new sensor pushing its bus above 'warn_utilization' is logged as a warning - above 'max_utilization'
+it is rejected, so that oversubscribed buses show up at config time instead of as read latency later on.
+"""
+
+import logging
+
+from sensor_utils.sensor_poller import bus_key
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_READ_BYTES = {"i2c": 2, "spi": 2, "uart": 8, "internal": 2}
+
+
+def wire_time(type_name, params, read_bytes):
+    """ Time (seconds) one device read occupies the bus - given the sensor's bus parameters. """
+    if type_name == "internal":
+        # Memory-mapped registers - no bus to share:
+        return 0.0
+    if type_name == "i2c":
+        clocks = 1 + 9 * (1 + read_bytes) + 1
+        return clocks / float(params.get("clk_speed") or 100000)
+    if type_name == "spi":
+        clocks = (params.get("cycles_before") or 0) + (params.get("data_bits") or 8) * read_bytes + \
+                 (params.get("cycles_after") or 0)
+        return clocks / float(params.get("clk_speed") or 100000)
+    bits_per_byte = 1 + (params.get("data_bits") or 8) + (1 if params.get("parity") else 0) + \
+                    (params.get("stop_bits") or 1)
+    return bits_per_byte * read_bytes / float(params.get("baud_rate") or 9600)
+
+
+def read_time(sensor):
+    """ Bus time of one read of given sensor (seconds). """
+    type_name = sensor.base.type_name
+    read_bytes = getattr(sensor.base, "read_bytes", None) or DEFAULT_READ_BYTES[type_name]
+    # Device-specific properties ARE the bus parameters needed - no need to copy them:
+    return wire_time(type_name, sensor.__dict__, read_bytes)
+
+
+class BusBandwidth:
+    """ Per-bus utilization of registered sensors - see 'admit()' for admission control. """
+    def __init__(self, warn_utilization=0.7, max_utilization=1.0, default_period=1.0):
+        self.warn_utilization = warn_utilization
+        self.max_utilization = max_utilization    # None: never reject - only warn
+        self.default_period = default_period
+        self._utilization = {}
+        self._sensors = {}
+        self._loads = {}
+        self._admitted = None    # (uuid, key, load) of latest admitted sensor - so 'add()' need not recompute
+
+    def load(self, sensor):
+        """ Fraction of its bus' time the sensor occupies at its sample rate. """
+        period = getattr(sensor.base, "sample_period", None)
+        if period is None or period <= 0:
+            period = self.default_period
+        return read_time(sensor) / period
+
+    def utilization(self, key):
+        return self._utilization.get(key, 0.0)
+
+    def admit(self, sensor):
+        """ Returns reason (string) why sensor would oversubscribe its bus - or None if it can be admitted. """
+        key = bus_key(sensor)
+        load = self.load(sensor)
+        utilization = self.utilization(key) + load
+        if self.max_utilization is not None and utilization > self.max_utilization:
+            return "bus %s would be oversubscribed - utilization %.1f%% (max. %.1f%%)" % \
+                   (key, utilization * 100, self.max_utilization * 100)
+        if self.warn_utilization is not None and utilization > self.warn_utilization:
+            logger.warning("sensor '%s' takes bus %s to %.1f%% utilization!", sensor.base.alias, key, utilization * 100)
+        self._admitted = (sensor.base.uuid, key, load)
+        return None
+
+    def add(self, sensor):
+        if self._admitted is not None and self._admitted[0] == sensor.base.uuid:
+            _, key, load = self._admitted
+        else:
+            key, load = bus_key(sensor), self.load(sensor)
+        self._admitted = None
+        self._loads[sensor.base.uuid] = (key, load)
+        self._utilization[key] = self.utilization(key) + load
+        self._sensors[key] = self._sensors.get(key, 0) + 1
+
+    def remove(self, sensor):
+        entry = self._loads.pop(sensor.base.uuid, None)
+        if entry is None:
+            return
+        key, load = entry
+        self._sensors[key] -= 1
+        if self._sensors[key] == 0:
+            del self._sensors[key]
+            del self._utilization[key]
+        else:
+            self._utilization[key] -= load
+
+    def report(self):
+        """ Per-bus utilization - list of dicts, most loaded bus first. """
+        rows = []
+        for key, utilization in self._utilization.items():
+            rows.append({"bus": key, "sensors": self._sensors[key], "utilization": utilization,
+                         "headroom": max(1.0 - utilization, 0.0), "saturated": utilization >= 1.0,
+                         "warning": self.warn_utilization is not None and utilization > self.warn_utilization})
+        rows.sort(key=lambda row: row["utilization"], reverse=True)
+        return rows
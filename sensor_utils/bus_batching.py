@@ -0,0 +1,94 @@
+"""
+@file bus_batching.py
+@brief Batched sensor reads - one combined bus transaction per bus, instead of one transaction per sensor.
+Sensors are grouped by bus (type, bus_no) - and within a bus by driver batch group, since only handles of
+the same driver connection can share a transaction. Within a group, devices are read in address order
+(I2C address, SPI chip-select), so that combined messages are deterministic and CS lines are walked in order.
+A group is read via its driver's 'read_many(handles)' when the handle supports it (see 'simulated_bus'),
+else sensor by sensor. Results are split back per sensor, in the order of the given sensors - a value,
+or the exception instance raised for that sensor (as with 'sensor_poller').
+With 'metrics' (a 'ReadMetrics') given, combined transactions are accounted per sensor - reads done sensor
+by sensor already are, through the sensors' timed 'base.read'.
+"""
+
+from sensor_utils.sensor_poller import bus_key
+
+
+def device_address(sensor):
+    """
+    Address of sensor on its bus - I2C address, SPI chip-select, register block (internal sensors),
+    or 0 (UART, one device per port).
+    """
+    type_name = sensor.base.type_name
+    if type_name == "internal":
+        return sensor.base.dev_addr
+    if type_name == "i2c":
+        return sensor.i2c_addr
+    if type_name == "spi":
+        return sensor.cs_no
+    return 0
+
+
+class BatchStats:
+    """ Counters of the latest batched sweep. """
+    def __init__(self):
+        self.no_of_reads = 0
+        self.no_of_batches = 0          # combined transactions issued
+        self.no_of_single_reads = 0     # reads not batched (driver has no 'read_many()', or lone sensor)
+        self.no_of_errors = 0
+
+    def __repr__(self):
+        return "BatchStats(reads=%d, batches=%d, single_reads=%d, errors=%d)" % \
+               (self.no_of_reads, self.no_of_batches, self.no_of_single_reads, self.no_of_errors)
+
+
+def plan_bus_batches(sensors):
+    """
+    Group (index, sensor) pairs into batches readable in one transaction each - ordered by bus,
+    then by device address within a batch. Sensors whose driver cannot batch form batches of one.
+    """
+    groups = {}
+    singles = []
+    for idx, sensor in enumerate(sensors):
+        handle = getattr(sensor.base, "handle", None)
+        if getattr(handle, "read_many", None) is None:
+            singles.append([(idx, sensor)])
+            continue
+        groups.setdefault((bus_key(sensor), id(handle.batch_group)), []).append((idx, sensor))
+    batches = []
+    for key in sorted(groups, key=lambda group_key: group_key[0]):
+        batches.append(sorted(groups[key], key=lambda item: device_address(item[1])))
+    return batches + singles
+
+
+def read_batched(sensors, stats=None, metrics=None):
+    """ Read all sensors - in combined bus transactions where possible. Returns values in order of 'sensors'. """
+    if stats is None:
+        stats = BatchStats()
+    results = [None] * len(sensors)
+    for batch in plan_bus_batches(sensors):
+        stats.no_of_reads += len(batch)
+        if len(batch) > 1:
+            handles = [sensor.base.handle for _, sensor in batch]
+            start = None if metrics is None else metrics.clock()
+            try:
+                values = handles[0].read_many(handles)
+            except Exception:
+                values = None    # whole transaction failed - retry sensor by sensor, to isolate the failing one(s)
+            if values is not None:
+                if metrics is not None:
+                    metrics.record_batch([sensor for _, sensor in batch], values, metrics.clock() - start)
+                stats.no_of_batches += 1
+                for (idx, _), value in zip(batch, values):
+                    if isinstance(value, Exception):
+                        stats.no_of_errors += 1
+                    results[idx] = value
+                continue
+        for idx, sensor in batch:
+            stats.no_of_single_reads += 1
+            try:
+                results[idx] = sensor.base.read()
+            except Exception as exc:
+                results[idx] = exc
+                stats.no_of_errors += 1
+    return results
@@ -0,0 +1,156 @@
+"""
+@file config_loader.py
+@brief Streaming ingestion of (large) sensor configurations.
+Reads either NDJSON (= JSON-lines, one spec per line) or one big top-level JSON array of specs,
+incrementally in chunks from a file, a path or stdin ('-'). Memory use is flat regardless of file size:
+only the current chunk and the spec being decoded are held at any time. An array element that does not
+decode within 'max_element_size' characters is taken as malformed - 'ValueError' (with its line number) is
+raised, instead of buffering the rest of the input in search of its end.
+"""
+
+import itertools
+import json
+import sys
+
+from sensor_utils.json_utils import validate_sensor_spec
+
+
+CHUNK_SIZE = 1 << 16
+MAX_ELEMENT_SIZE = 1 << 20    # characters - far beyond any real sensor spec
+_WHITESPACE_OR_COMMA = " \t\r\n,"
+
+
+def _iter_lines(chunks):
+    """ NDJSON: yield (line_no, line) for every non-blank line. """
+    pending = ""
+    line_no = 0
+    for chunk in chunks:
+        pending += chunk
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+    if pending.strip():
+        yield line_no + 1, pending
+
+
+def _iter_array(chunks, chunk_size, max_element_size):
+    """ Top-level JSON array: yield (line_no, spec) for every element - line_no is where the element starts. """
+    decoder = json.JSONDecoder()
+    buf = next(chunks)
+    pos = buf.index("[") + 1
+    line_no = 1 + buf.count("\n", 0, pos)
+    eof = False
+    while True:
+        # Skip separators - reading more input as needed:
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE_OR_COMMA:
+                if buf[pos] == "\n":
+                    line_no += 1
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            buf, pos = next(chunks, ""), 0
+            eof = buf == ""
+        if pos >= len(buf):
+            # Input ended without closing bracket - let caller report the parse error:
+            yield line_no, "["
+            return
+        if buf[pos] == "]":
+            return
+        try:
+            spec, end = decoder.raw_decode(buf, pos)
+            if end == len(buf) and not eof:
+                # Element may continue in next chunk (e.g. a number) - decode again with more input:
+                raise ValueError("incomplete")
+        except ValueError as exc:
+            if eof:
+                # Broken element - handed on as text, so that the caller reports the parse error:
+                yield line_no, buf[pos:]
+                return
+            if len(buf) - pos > max_element_size:
+                raise ValueError("malformed JSON array element at line %d - not decodable within %d characters (%s)" %
+                                 (line_no, max_element_size, exc))
+            chunk = next(chunks, "")
+            eof = chunk == ""
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        yield line_no, spec
+        line_no += buf.count("\n", pos, end)
+        pos = end
+        if pos > chunk_size:
+            buf, pos = buf[pos:], 0
+
+
+def iter_json_specs(source=None, chunk_size=CHUNK_SIZE, max_element_size=MAX_ELEMENT_SIZE):
+    """
+    Yield (index, spec) pairs from 'source':
+    - a path (str) or '-' for stdin, or an open (text-)file object: NDJSON or top-level JSON array,
+      with index = line number (specs from NDJSON as JSON-strings, from arrays as dictionaries) -
+      raises ValueError on an array element not decodable within 'max_element_size' characters
+    - any other iterable of specs (JSON-strings or dictionaries): index = position
+    """
+    if isinstance(source, str):
+        if source == "-":
+            for item in iter_json_specs(sys.stdin, chunk_size, max_element_size):
+                yield item
+            return
+        with open(source) as spec_file:
+            for item in iter_json_specs(spec_file, chunk_size, max_element_size):
+                yield item
+        return
+    if not hasattr(source, "read"):
+        for index, spec in enumerate(source):
+            yield index, spec
+        return
+    #
+    chunks = iter(lambda: source.read(chunk_size), "")
+    # Find first non-whitespace character to tell NDJSON from array:
+    head = ""
+    for chunk in chunks:
+        head += chunk
+        if head.strip():
+            break
+    if not head.strip():
+        return
+    chunks = itertools.chain([head], chunks)
+    if head.lstrip().startswith("["):
+        for item in _iter_array(chunks, chunk_size, max_element_size):
+            yield item
+    else:
+        for item in _iter_lines(chunks):
+            yield item
+
+
+def load_sensor_config(sensors=None, source=None, register=True, max_errors=1000, workers=1):
+    """
+    Stream sensor specs from 'source' (see 'iter_json_specs()'), validating and - unless 'register=False' -
+    registering each one into 'sensors' as it arrives. When registering, validation may be sharded
+    across 'workers' processes (see 'parallel_import').
+    Returns summary: {'specs': ..., 'added': ..., 'failed': ..., 'errors': [(line_no, alias, error), ...]},
+    where the error list is capped at 'max_errors' entries to keep memory bounded.
+    """
+    summary = {"specs": 0, "added": 0, "failed": 0, "errors": []}
+    if register:
+        results = sensors.iter_add_sensors(source, workers=workers)
+    else:
+        results = _iter_validate(source)
+    for result in results:
+        summary["specs"] += 1
+        if result["error"] is None:
+            if result["added"]:
+                summary["added"] += 1
+            continue
+        summary["failed"] += 1
+        if len(summary["errors"]) < max_errors:
+            summary["errors"].append((result["index"], result["alias"], result["error"]))
+    return summary
+
+
+def _iter_validate(source):
+    for index, spec in iter_json_specs(source):
+        sensor_spec, error = validate_sensor_spec(spec)
+        alias = sensor_spec.get('alias') if isinstance(sensor_spec, dict) else None
+        yield {"index": index, "alias": alias, "added": False, "error": error}
@@ -5,66 +5,262 @@ DB functionality includes:
 - freezing individual sensor-objects into DB-table entry object
 - map JSON into DB-table entry object
 - store (sensors-)table in DB
-- load (sensors-)table from DB
+- load (sensors-)table from DB - in keyset-paginated pages if wanted
+- rebuild live sensor objects from DB rows in bulk
+- store sensor readings (time-series) in batches - optionally from a background writer thread
 @note Shim DB-abstraction layer using SQLite file storage as DB per default.
 """
 
-import dataset
+import json
+import logging
+import threading
+import time
 import uuid
 
+import dataset
+from sqlalchemy.pool import StaticPool
+
+from sensor_properties.sensor_props import ComplexValue
 from sensor_types.sensor_base import ExternalSensorBase, InternalSensorBase
+from sensor_types.sensor_devices import sensor_base_map, sensor_type_map
+from sensor_utils.tracing import span_of
+
 
+logger = logging.getLogger(__name__)
 
-def connect_to_db(conn_string=None):
-    print("using DataSet-module version: ", dataset.__version__)
+SENSORS_TABLE = "sensors"
+SENSORS_INDEXED_COLUMNS = ("alias", "type_name", "uuid", "bus_no")
+READINGS_TABLE = "readings"
+READINGS_COLUMNS = ("sensor_idx", "ts", "value", "channel", "triggered", "items")
+
+
+def connect_to_db(conn_string=None, wal_mode=True):
+    """
+    Connect to DB given by (SQLAlchemy-style) connection string, e.g. 'sqlite:///sensors.db' to persist,
+    or 'sqlite:///:memory:' for a transient DB. WAL-mode is used for SQLite files unless 'wal_mode=False'.
+    """
+    logger.debug("using DataSet-module version: %s", dataset.__version__)
     if conn_string is None:
-        print("ERROR: no connection string to DB specified!")
+        logger.error("no connection string to DB specified!")
         return None
+    engine_kwargs = None
+    if conn_string.startswith("sqlite") and (":memory:" in conn_string or conn_string.rstrip("/") == "sqlite:"):
+        # One shared connection - otherwise each thread (e.g. background writer) gets its own, empty, DB:
+        engine_kwargs = {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
     try:
-        db = dataset.connect('sqlite:///:memory:')  # use 'sqlite:///sensors.db' to persist ...
+        db = dataset.connect(conn_string, engine_kwargs=engine_kwargs, sqlite_wal_mode=wal_mode)
     except Exception as exc:
-        print("ERROR: DB-open failure! Reason: %s" % exc)
+        logger.error("DB-open failure! Reason: %s", exc)
         return None
     #
     return db
 
 
-def insert_class_as_dict(sensor_db=None, cls_instance=None, debug=False):
-    def debug_print(msg):
+def class_as_dict(cls_instance=None, debug=False):
+    """ Persistable properties of an object - skipping unset values and callables, converting UUIDs. """
+    # Checked once per object - not per key - so that nothing is formatted with debug-output disabled:
+    debug = debug and logger.isEnabledFor(logging.DEBUG)
+
+    def debug_print(msg, *args):
         if debug:
-            print(msg)
-    if sensor_db is None:
-        print("NO database connector given - bailing out!")
-    if cls_instance is None:
-        print("NO sensor object passed as argument - bailing out!")
-    # TODO: check instance-type comparison here!
-    if not isinstance(cls_instance, ExternalSensorBase):
-        print("Unkown object type - cannot use!")
-        return
-    # Set up table. TODO: assess - table name as argument?
-    sensor_table = sensor_db['sensors']
-    # Insert data if any ...
+            logger.debug(msg, *args)
     prop_dict = {}
     for key, val in cls_instance.__dict__.items():
         if val is None:
-            debug_print("Key '%s' has no value - skipping ..." % key)
+            debug_print("Key '%s' has no value - skipping ...", key)
         elif callable(val):
-            debug_print("Key '%s' is a callable (func or method reference) - skipping ..." % key)
+            debug_print("Key '%s' is a callable (func or method reference) - skipping ...", key)
         elif isinstance(val, uuid.UUID):
-            debug_print("Key '%s' is a UUID - need conversion to DB-acknowledged type ..." % key)
+            debug_print("Key '%s' is a UUID - need conversion to DB-acknowledged type ...", key)
             prop_dict[key] = val.bytes_le
+        elif isinstance(val, (ExternalSensorBase, InternalSensorBase)):
+            debug_print("Key '%s' is the sensor base object - skipping ...", key)
+        elif key == "handle":
+            debug_print("Key '%s' is the (runtime) driver handle - skipping ...", key)
         else:
-            debug_print("Key '%s' is a property with value = %s - adding to persisted data ..." % (key, val))
+            debug_print("Key '%s' is a property with value = %s - adding to persisted data ...", key, val)
             prop_dict[key] = val
+    return prop_dict
+
+
+def insert_class_as_dict(sensor_db=None, cls_instance=None, debug=False):
+    if sensor_db is None:
+        logger.error("NO database connector given - bailing out!")
+    if cls_instance is None:
+        logger.error("NO sensor object passed as argument - bailing out!")
+    # TODO: check instance-type comparison here!
+    if not isinstance(cls_instance, (ExternalSensorBase, InternalSensorBase)):
+        logger.error("Unkown object type - cannot use!")
+        return
+    # Set up table. TODO: assess - table name as argument?
+    sensor_table = sensor_db[SENSORS_TABLE]
+    # Insert data if any ...
+    prop_dict = class_as_dict(cls_instance, debug=debug)
     # Store to DB. TODO: add a try-except here!
     sensor_table.insert(prop_dict)
     sensor_db.commit()
 
 
-def find_sensor_by_type(db=None, sensor_type_name=None, single_hit=False):
-    table = db['sensors']
+def sensor_as_dict(sensor=None):
+    """ Base AND device-specific properties of a sensor, as one flat (DB-row) dictionary. """
+    prop_dict = class_as_dict(sensor.base)
+    prop_dict.update(class_as_dict(sensor))
+    return prop_dict
+
+
+def insert_sensors(sensor_db=None, sensors=None, chunk_size=1000, tracer=None):
+    """ Store (full) sensor objects - all rows in ONE transaction. Traced as a 'db' span if a tracer is given. """
+    if sensor_db is None or sensors is None:
+        logger.error("both DB connector and sensors must be given!")
+        return False
+    with span_of(tracer, "insert_sensors", "db") as span:
+        rows = [sensor_as_dict(sensor) for sensor in sensors]
+        with sensor_db as tx:
+            tx[SENSORS_TABLE].insert_many(rows, chunk_size=chunk_size)
+        create_sensor_indexes(sensor_db)
+        if span is not None:
+            span.args = {"rows": len(rows)}
+    return True
+
+
+def create_sensor_indexes(db=None):
+    """ Index the lookup columns of the sensors table (no-op for indexes already present). """
+    table = db[SENSORS_TABLE]
+    for column in SENSORS_INDEXED_COLUMNS:
+        if table.has_column(column) and not table.has_index([column]):
+            table.create_index([column])
+
+
+# ****************** Sensor readings (time-series) *******************
+
+def get_readings_table(db=None):
+    if db.has_table(READINGS_TABLE):
+        return db[READINGS_TABLE]
+    table = db.create_table(READINGS_TABLE)
+    table.create_column("sensor_idx", db.types.integer)
+    table.create_column("ts", db.types.float)
+    table.create_column("value", db.types.float)
+    table.create_column("channel", db.types.integer)
+    table.create_column("triggered", db.types.boolean)
+    table.create_column("items", db.types.text)
+    return table
+
+
+def reading_as_row(reading):
+    """
+    DB-row (tuple, in READINGS_COLUMNS order) of a reading (sensor_idx, timestamp, value):
+    scalar --> 'value', ComplexValue --> 'triggered'/'channel'/'value', list --> 'items' (as JSON).
+    """
+    sensor_idx, timestamp, value = reading
+    if isinstance(value, ComplexValue):
+        return sensor_idx, timestamp, value.ch_val, value.channel, value.triggered, None
+    if isinstance(value, (list, tuple)):
+        return sensor_idx, timestamp, None, None, None, json.dumps(value)
+    return sensor_idx, timestamp, value, None, None, None
+
+
+def insert_readings(db=None, readings=None, tracer=None):
+    """ Store readings - all rows in ONE transaction, using 'executemany'. Traced as a 'db' span if a tracer is given. """
+    table = get_readings_table(db)
+    rows = [reading_as_row(reading) for reading in readings]
+    if not rows:
+        return 0
+    with span_of(tracer, "insert_readings", "db", rows=len(rows)), db:
+        conn = db.executable
+        if conn.dialect.paramstyle == "qmark":
+            # Fast path - straight to the DBAPI-driver's executemany():
+            conn.exec_driver_sql("INSERT INTO %s (%s) VALUES (%s)" %
+                                 (READINGS_TABLE, ", ".join(READINGS_COLUMNS), ", ".join("?" * len(READINGS_COLUMNS))),
+                                 rows)
+        else:
+            conn.execute(table.table.insert(), [dict(zip(READINGS_COLUMNS, row)) for row in rows])
+    return len(rows)
+
+
+class ReadingWriter:
+    """
+    Background writer buffering readings, flushing to DB in one transaction per batch when
+    'max_batch' readings are pending or 'max_delay' seconds have passed - whichever comes first.
+    With a tracer given, each flush is traced (as a root span on the writer thread).
+    """
+    def __init__(self, db=None, max_batch=10000, max_delay=0.5, tracer=None):
+        self.db = db
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.tracer = tracer
+        self.no_of_flushes = 0
+        self.no_of_written = 0
+        self._pending = []
+        self._closed = False
+        self._cond = threading.Condition()
+        get_readings_table(db)
+        self._thread = threading.Thread(target=self._run, name="reading-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, reading):
+        """ Queue one reading (sensor_idx, timestamp, value). """
+        with self._cond:
+            self._pending.append(reading)
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify()
+
+    def write_many(self, readings):
+        with self._cond:
+            self._pending.extend(readings)
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.max_delay
+                while not self._closed and len(self._pending) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+                closed = self._closed
+            if batch:
+                try:
+                    self.no_of_written += insert_readings(self.db, batch, tracer=self.tracer)
+                    self.no_of_flushes += 1
+                except Exception as exc:
+                    logger.error("flushing %d readings to DB failed! Reason: %s", len(batch), exc)
+            if closed:
+                return
+
+    def close(self):
+        """ Flush remaining readings and stop writer thread. """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+
+def iter_sensor_rows(db=None, page_size=1000, **filters):
+    """
+    Stream rows of the sensors table, page by page, using keyset pagination on 'id'
+    (each page is an index range-scan - unlike OFFSET-based paging which rescans skipped rows).
+    Optional filters as for 'table.find()', e.g. 'type_name="i2c"'.
+    """
+    table = db[SENSORS_TABLE]
+    last_id = 0
+    while True:
+        page = list(table.find(id={">": last_id}, order_by="id", _limit=page_size, _step=None, **filters))
+        for row in page:
+            yield row
+        if len(page) < page_size:
+            return
+        last_id = page[-1]["id"]
+
+
+def find_sensor_by_type(db=None, sensor_type_name=None, single_hit=False, page_size=None):
+    table = db[SENSORS_TABLE]
     if single_hit:
         sensors = table.find_one(type_name=sensor_type_name)
+    elif page_size is not None:
+        sensors = iter_sensor_rows(db, page_size=page_size, type_name=sensor_type_name)
     else:
         sensors = table.find(type_name=sensor_type_name)
     #
@@ -72,7 +268,7 @@ def find_sensor_by_type(db=None, sensor_type_name=None, single_hit=False):
 
 
 def find_sensor_by_alias(db=None, sensor_alias=None, single_hit=True):
-    table = db['sensors']
+    table = db[SENSORS_TABLE]
     if single_hit:
         sensors = table.find_one(alias=sensor_alias)
     else:
@@ -81,10 +277,46 @@ def find_sensor_by_alias(db=None, sensor_alias=None, single_hit=True):
     return sensors
 
 
-def load_sensors_from_db(db=None):
-    table = db['sensors']
+def load_sensors_from_db(db=None, page_size=None):
+    """ All rows of sensors table - as a keyset-paginated stream if 'page_size' is given. """
+    if page_size is not None:
+        return iter_sensor_rows(db, page_size=page_size)
+    table = db[SENSORS_TABLE]
     return table.find()
 
 
+def sensor_from_row(row=None):
+    """ Construct a sensor object directly from a DB row - no JSON parsing, validation or builder. """
+    sensor = sensor_type_map[row["type_name"]](base_type=sensor_base_map[row["type_name"]])
+    base_props = sensor.base.__dict__
+    dev_props = sensor.__dict__
+    for key, val in row.items():
+        if key == "id" or val is None:
+            continue
+        if key == "uuid":
+            base_props[key] = uuid.UUID(bytes_le=val)
+        elif key in base_props:
+            base_props[key] = val
+        else:
+            dev_props[key] = val
+    return sensor
+
+
+def rebuild_sensors(rows=None, sensors=None):
+    """
+    Register sensors rebuilt from DB rows (e.g. 'load_sensors_from_db(db, page_size=...)') into the
+    given 'Sensors' container, in bulk. Returns number of sensors registered.
+    """
+    no_of_added = 0
+    for row in rows:
+        sensor = sensor_from_row(row)
+        error = sensors.register_sensor(sensor)
+        if error is not None:
+            logger.error("cannot register sensor '%s' from DB - %s!", sensor.base.alias, error)
+            continue
+        no_of_added += 1
+    return no_of_added
+
+
 
 
@@ -1,83 +1,182 @@
 import json
-from jsonschema import Draft4Validator, exceptions
+import logging
+
+from jsonschema import Draft4Validator
+
+from sensor_properties import sensor_props
+
+
+logger = logging.getLogger(__name__)
+
+
+# ******************* Validator cache ************************
+
+# Python-expressions checking JSON-type of 'val' - same semantics as Draft4 (e.g. bool is NOT an integer):
+FAST_TYPE_CHECKS = {
+    "integer": "(type(val) is int)",
+    "number": "(type(val) is int or type(val) is float)",
+    "string": "(type(val) is str)",
+    "boolean": "(type(val) is bool)",
+    "object": "(type(val) is dict)",
+    "array": "(type(val) is list)",
+    "null": "(val is None)",
+}
+
+_validator_cache = {}
+
+
+def compile_flat_schema(schema):
+    """
+    Code-generate a fast-path validator for a FLAT object schema (only 'type', 'required' and
+    'properties' with simple types) - returns None if schema is not flat.
+    The generated function returns a list of error messages, formatted as by 'jsonschema'.
+    """
+    if schema.get("type") != "object" or not set(schema) <= {"type", "required", "properties"}:
+        return None
+    lines = ["def fast_check(instance):",
+             "    if type(instance) is not dict:",
+             "        return ['%r is not of type %r' % (instance, 'object')]",
+             "    errors = []"]
+    for keyword in schema:
+        if keyword == "required":
+            for prop in schema["required"]:
+                lines.append("    if %r not in instance:" % prop)
+                lines.append("        errors.append(%r)" % ("%r is a required property" % prop))
+        elif keyword == "properties":
+            for prop, prop_schema in schema["properties"].items():
+                if set(prop_schema) != {"type"} or prop_schema["type"] not in FAST_TYPE_CHECKS:
+                    return None
+                lines.append("    val = instance.get(%r, MISSING)" % prop)
+                lines.append("    if val is not MISSING and not %s:" % FAST_TYPE_CHECKS[prop_schema["type"]])
+                lines.append("        errors.append('%%r is not of type %%r' %% (val, %r))" % prop_schema["type"])
+    lines.append("    return errors")
+    namespace = {"MISSING": object()}
+    exec("\n".join(lines), namespace)
+    return namespace["fast_check"]
+
+
+def get_validator(schema):
+    """
+    Compiled validators for schema - (Draft4Validator, fast-path function or None).
+    Compiled once per process, keyed by schema identity.
+    """
+    entry = _validator_cache.get(id(schema))
+    if entry is None or entry[0] is not schema:
+        entry = (schema, Draft4Validator(schema), compile_flat_schema(schema))
+        _validator_cache[id(schema)] = entry
+    return entry[1], entry[2]
 
 
 # ******************* JSON-validation ************************
 
 def property_not_in_schema(schemas=[], json_input=None, debug=False):
-    def debug_print(msg):
+    # Messages are only formatted (lazily, by 'logging') when 'debug' is set AND DEBUG-level is enabled:
+    debug = debug and logger.isEnabledFor(logging.DEBUG)
+
+    def debug_print(msg, *args):
         if debug:
-            print(msg)
+            logger.debug(msg, *args)
     #
-    debug_print("Checking over %d schemas ..." % len(schemas))
+    debug_print("Checking over %d schemas ...", len(schemas))
     debug_print("============================")
-    sensor_keys = json.loads(json_input)
-    debug_print("INPUT: %s" % sensor_keys)
+    # Accept already-parsed input as well, to avoid parsing the same spec twice:
+    if isinstance(json_input, dict):
+        sensor_keys = json_input
+    else:
+        sensor_keys = json.loads(json_input)
+    debug_print("INPUT: %s", sensor_keys)
     #
     for schema_no, schema in enumerate(schemas):
-        props = dict(schema["properties"])
+        props = schema["properties"]
         if schema_no == 0:
             debug_print("Checking BASE schema ...")
         else:
             debug_print("Checking DEV schema ...")
-        print("Properties: ", str(props))
+        debug_print("Properties: %s", props)
         #
         for prop in sensor_keys:
-            debug_print("Checking for property: %s" % prop)
+            debug_print("Checking for property: %s", prop)
             if prop in props:
-                debug_print("Found property %s in schema." % prop)
+                debug_print("Found property %s in schema.", prop)
                 return False
             else:
                 if schema_no == 0:
-                    debug_print("WARN: property %s NOT found in BASE schema :-/" % prop)
+                    debug_print("WARN: property %s NOT found in BASE schema :-/", prop)
                 else:
-                    debug_print("ERR: property %s NOT found in DEV schema either!!" % prop)
+                    debug_print("ERR: property %s NOT found in DEV schema either!!", prop)
         #
     return True
 
 
 class JsonValidator:
-    def __init__(self, schema=None, formal_check=True, debug=False):
+    def __init__(self, schema=None, formal_check=True, debug=False, fast_path=True):
         self.schema = schema
         self.formal_check = formal_check
         self.debug = debug
+        self.fast_check = None
         if schema is None:
-            print("ERROR: cannot construct class correctly without schema argument given!!")
+            logger.error("cannot construct class correctly without schema argument given!!")
         else:
-            self.validator = Draft4Validator(schema)
+            # Cached - constructing a validator per instance is (much) more costly than validating:
+            self.validator, fast_check = get_validator(schema)
+            if fast_path:
+                self.fast_check = fast_check
+
+    def errors(self, json_input=None):
+        """ All validation errors (first line of each error message) - in a single validation pass. """
+        if self.fast_check is not None:
+            return self.fast_check(json_input)
+        return [str(error).splitlines()[0] for error in self.validator.iter_errors(json_input)]
 
     def check(self, json_input=None, ):
         if json_input is None:
-            print("ERROR: no input to check!")
+            logger.error("no input to check!")
             return False
-        # Check for required properties:
-        try:
-            self.validator.validate(json_input)
-        except exceptions.ValidationError:
-            for error in self.validator.iter_errors(json_input):
-                first_err_line = str(error).splitlines()[0]
-                # print("JSON validation ERR: ", str(error))
+        # Check for required properties, and types - collecting all errors in one pass:
+        errors = self.errors(json_input)
+        if errors:
+            for first_err_line in errors:
                 prop_name = first_err_line.split()[0]
                 if first_err_line.endswith('required property'):
-                    print("JSON-validation ERROR: missing required property %s" % prop_name)
+                    logger.error("JSON-validation: missing required property %s", prop_name)
                 elif first_err_line.find('not of type') >= 0:
-                    print("JSON-validation ERROR: property %s has wrong type." % prop_name)
+                    logger.error("JSON-validation: property %s has wrong type.", prop_name)
                 else:
-                    print("JSON-validation ERROR: %s" % first_err_line)
+                    logger.error("JSON-validation: %s", first_err_line)
             return False
         #
-        # Check format (entry-level check):
-        if self.formal_check:
-            if self.validator.is_valid(json_input):
-                if self.debug:
-                    if self.debug:
-                        print("JSON has valid format.")
-            else:
-                print("ERROR: JSON input has invalid format!")
-                return False
+        # Format (entry-level check) is covered by the validation pass above:
+        if self.formal_check and self.debug:
+            logger.debug("JSON has valid format.")
         # Check for parameters NOT found in properties given by schema (only DEV-properties):
 
         if self.debug:
-            print("SUCCESS: JSON is valid! :-)")
+            logger.debug("SUCCESS: JSON is valid! :-)")
         return True
 
+
+def validate_sensor_spec(spec=None):
+    """
+    Parse (if given as JSON-string) and validate ONE sensor spec: base schema, device-specific schema
+    and check for unknown (= 'not-in-schema') properties.
+    Returns (sensor_spec, error) - 'error' is None for a valid spec, 'sensor_spec' is None if not parseable.
+    """
+    if isinstance(spec, dict):
+        sensor_spec = spec
+    else:
+        try:
+            sensor_spec = json.loads(spec)
+        except ValueError as exc:
+            return None, "invalid JSON: %s" % exc
+    if not JsonValidator(sensor_props.sensor_base_schema).check(sensor_spec):
+        return sensor_spec, "invalid sensor JSON input"
+    #
+    sensor_type = sensor_spec['sensor_type']
+    json_dev_spec_schema = sensor_props.json_dev_schemas.get(sensor_type)
+    if json_dev_spec_schema is None:
+        return sensor_spec, "unknown sensor type '%s'" % sensor_type
+    if not JsonValidator(json_dev_spec_schema).check(sensor_spec):
+        return sensor_spec, "invalid device-specific JSON input"
+    if property_not_in_schema([sensor_props.sensor_base_schema, json_dev_spec_schema], sensor_spec):
+        return sensor_spec, "unknown (= 'not-in-schema') property"
+    return sensor_spec, None
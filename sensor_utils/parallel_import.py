@@ -0,0 +1,61 @@
+"""
+@file parallel_import.py
+@brief Parallel validation for large sensor config imports.
+Specs are sharded across a ProcessPoolExecutor - each worker parses the specs and runs base- and
+device-schema validation plus the unknown-property check, returning compact validated records.
+The main process is left with the cheap steps only: bus-conflict resolution and object construction.
+"""
+
+import collections
+from concurrent.futures import ProcessPoolExecutor
+
+from sensor_utils.config_loader import iter_json_specs
+from sensor_utils.json_utils import validate_sensor_spec
+
+
+SHARD_SIZE = 1000
+
+
+def _validate_shard(shard):
+    """ Worker: validate a shard of (index, spec) pairs - returns list of (index, sensor_spec, error). """
+    records = []
+    for index, spec in shard:
+        sensor_spec, error = validate_sensor_spec(spec)
+        records.append((index, sensor_spec, error))
+    return records
+
+
+def _iter_shards(indexed_specs, shard_size):
+    shard = []
+    for item in indexed_specs:
+        shard.append(item)
+        if len(shard) >= shard_size:
+            yield shard
+            shard = []
+    if shard:
+        yield shard
+
+
+def iter_validated_specs(specs=None, workers=1, shard_size=SHARD_SIZE):
+    """
+    Yield (index, sensor_spec, error) for every spec, in input order - 'specs' as for 'iter_json_specs()'.
+    With 'workers' > 1, validation runs in that many worker processes; at most 2 shards per worker
+    are in flight, so that memory stays bounded for arbitrarily large inputs.
+    """
+    indexed_specs = iter_json_specs(specs)
+    if workers <= 1:
+        # One spec at a time - so that serial imports stream, without reading ahead:
+        for index, spec in indexed_specs:
+            sensor_spec, error = validate_sensor_spec(spec)
+            yield index, sensor_spec, error
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = collections.deque()
+        for shard in _iter_shards(indexed_specs, shard_size):
+            in_flight.append(pool.submit(_validate_shard, shard))
+            if len(in_flight) >= 2 * workers:
+                for record in in_flight.popleft().result():
+                    yield record
+        while in_flight:
+            for record in in_flight.popleft().result():
+                yield record
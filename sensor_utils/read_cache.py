@@ -0,0 +1,188 @@
+"""
+@file read_cache.py
+@brief Read-through value cache in front of 'sensor.base.read()'.
+Installing the cache on a sensor replaces its 'base.read' by a caching wrapper - so every consumer calling
+'sensor.base.read()' (API handlers, alarms, sweeps ...) shares the cached value instead of hitting the device:
+- a value younger than the TTL (configurable per sensor type) is returned without a bus read
+- stale-while-revalidate: an expired value is returned at once, while ONE background refresh re-reads
+  the device (optionally only up to 'max_stale' seconds past expiry - older values are read through)
+- request coalescing: concurrent readers missing the cache share one in-flight bus read
+Driver exceptions are not cached - they are raised to every reader sharing that read.
+Sensors with native coroutine reads (see 'async_sensors') are not cached - their reads stay as they are.
+Hit/miss statistics are kept per sensor, see 'ReadCache.stats()' - counted under the entry's lock, as readers
+(e.g. poller threads) and background refreshes update them concurrently.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from sensor_utils.async_sensors import is_async_read
+
+
+class CacheStats:
+    """ Read-cache counters - 'stale_hits' are hits served from an expired value (stale-while-revalidate). """
+    FIELDS = ("hits", "stale_hits", "misses", "coalesced", "refreshes", "errors")
+
+    def __init__(self):
+        for field in self.FIELDS:
+            setattr(self, field, 0)
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.stale_hits + self.misses + self.coalesced
+        if total == 0:
+            return 0.0
+        return (self.hits + self.stale_hits + self.coalesced) / float(total)
+
+    def merge(self, other):
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        return self
+
+    def __repr__(self):
+        return "CacheStats(%s, hit_ratio=%.3f)" % \
+               (", ".join("%s=%d" % (field, getattr(self, field)) for field in self.FIELDS), self.hit_ratio)
+
+
+class CachedRead:
+    """ Caching wrapper of one sensor's read-function - callable like the read-function itself. """
+    def __init__(self, cache, read_func, ttl):
+        self.cache = cache
+        self.read_func = read_func
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self.cached = None    # (value, timestamp) - replaced as a whole, so one load is a consistent snapshot
+        self._lock = threading.Lock()
+        self._in_flight = None
+
+    def invalidate(self):
+        with self._lock:
+            self.cached = None
+
+    def __call__(self):
+        cached = self.cached
+        if cached is not None:
+            value, timestamp = cached
+            age = self.cache.clock() - timestamp
+            if age < self.ttl:
+                with self._lock:
+                    self.stats.hits += 1
+                return value
+            max_stale = self.cache.max_stale
+            if self.cache.stale_while_revalidate and (max_stale is None or age < self.ttl + max_stale):
+                with self._lock:
+                    self.stats.stale_hits += 1
+                self._refresh_in_background()
+                return value
+        return self._read_through()
+
+    def _start_flight(self):
+        """ Returns (future, leader) - the leader does the bus read, everybody else waits on its future. """
+        with self._lock:
+            if self._in_flight is not None:
+                return self._in_flight, False
+            self._in_flight = Future()
+            return self._in_flight, True
+
+    def _fly(self, flight):
+        try:
+            value = self.read_func()
+        except Exception as exc:
+            with self._lock:
+                self.stats.errors += 1
+            flight.set_exception(exc)
+        else:
+            with self._lock:
+                self.cached = (value, self.cache.clock())
+            flight.set_result(value)
+        finally:
+            with self._lock:
+                self._in_flight = None
+
+    def _read_through(self):
+        flight, leader = self._start_flight()
+        if leader:
+            with self._lock:
+                self.stats.misses += 1
+            self._fly(flight)
+        else:
+            with self._lock:
+                self.stats.coalesced += 1
+        return flight.result()
+
+    def _refresh_in_background(self):
+        flight, leader = self._start_flight()
+        if leader:
+            with self._lock:
+                self.stats.refreshes += 1
+            self.cache.executor().submit(self._fly, flight)
+
+
+class ReadCache:
+    """
+    Per-sensor read-through cache - 'ttl' (seconds) for all sensor types, unless given in 'ttl_by_type'
+    (a TTL of None means: sensors of that type are not cached).
+    """
+    def __init__(self, ttl=1.0, ttl_by_type=None, stale_while_revalidate=False, max_stale=None,
+                 clock=time.monotonic, max_refresh_workers=4):
+        self.ttl = ttl
+        self.ttl_by_type = ttl_by_type or {}
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_stale = max_stale
+        self.clock = clock
+        self.max_refresh_workers = max_refresh_workers
+        self.entries = {}
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def ttl_of(self, sensor):
+        return self.ttl_by_type.get(sensor.base.type_name, self.ttl)
+
+    def executor(self):
+        """ Thread pool for background refreshes - created first when needed. """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_refresh_workers,
+                                                    thread_name_prefix="cache-refresh")
+            return self._executor
+
+    def install(self, sensor):
+        """ Put cache in front of 'sensor.base.read' - returns False if sensor (type) is not cached. """
+        ttl = self.ttl_of(sensor)
+        if ttl is None or sensor.base.uuid in self.entries or is_async_read(sensor.base.read):
+            return False
+        entry = CachedRead(self, sensor.base.read, ttl)
+        self.entries[sensor.base.uuid] = entry
+        sensor.base.read = entry
+        return True
+
+    def uninstall(self, sensor):
+        entry = self.entries.pop(sensor.base.uuid, None)
+        if entry is None:
+            return False
+        if sensor.base.read is entry:
+            sensor.base.read = entry.read_func
+        return True
+
+    def invalidate(self, sensor=None):
+        """ Drop cached value of given sensor - or of all sensors. """
+        entries = self.entries.values() if sensor is None else [self.entries.get(sensor.base.uuid)]
+        for entry in entries:
+            if entry is not None:
+                entry.invalidate()
+
+    def stats(self, sensor=None):
+        """ Counters of given sensor - or summed over all sensors. """
+        if sensor is not None:
+            return self.entries[sensor.base.uuid].stats
+        total = CacheStats()
+        for entry in self.entries.values():
+            total.merge(entry.stats)
+        return total
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
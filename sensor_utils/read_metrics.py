@@ -0,0 +1,438 @@
+"""
+@file read_metrics.py
+@brief Latency histograms and read/error/timeout counters per sensor - and per bus - for finding
+the devices that dominate sweep time.
+Installing the metrics on a sensor wraps its driver calls 'base.read' and 'base.config' with timing
+wrappers (below any read-cache, so that device reads are measured - not cache hits). Without metrics
+installed, nothing is wrapped: there is no overhead at all. Native coroutine reads get an async wrapper.
+Reads in combined bus transactions (see 'Sensors.read_sensors_batched()') bypass 'base.read' - they are
+accounted via 'record_batch()'. Driver exceptions are counted as errors and re-raised.
+Timeouts are counted as reported by the poller (see 'Sensors.poll_sensors()') - the late read itself
+is still timed once it completes.
+Latencies go into log-bucket histograms: 'sub_buckets' buckets per power of two, from 1 us up -
+i.e. relative bucket width (and quantile error) of at most 1/'sub_buckets'.
+Export: 'snapshot()' (plain dictionaries), 'prometheus_text()', and 'serve()' - a local HTTP endpoint.
+"""
+
+import logging
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sensor_utils.async_sensors import is_async_read
+from sensor_utils.sensor_poller import bus_key
+
+
+logger = logging.getLogger(__name__)
+
+
+MIN_LATENCY = 1e-6       # upper bound of first bucket (seconds)
+NO_OF_OCTAVES = 28       # ... last finite bucket bound ~268 s - slower reads go into an overflow bucket
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class Histogram:
+    """ Log-bucket latency histogram (seconds). """
+    def __init__(self, sub_buckets=4):
+        self.sub_buckets = sub_buckets
+        self.counts = [0] * (1 + NO_OF_OCTAVES * sub_buckets + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def bucket_of(self, latency):
+        scaled = latency / MIN_LATENCY
+        if scaled < 1.0:
+            return 0
+        mantissa, exponent = math.frexp(scaled)    # scaled = mantissa * 2**exponent, 0.5 <= mantissa < 1
+        idx = 1 + (exponent - 1) * self.sub_buckets + int((mantissa - 0.5) * 2 * self.sub_buckets)
+        return min(idx, len(self.counts) - 1)
+
+    def upper_bound(self, idx):
+        """ Upper bound (seconds) of bucket 'idx' - infinite for the overflow bucket. """
+        if idx == 0:
+            return MIN_LATENCY
+        if idx >= len(self.counts) - 1:
+            return float("inf")
+        octave, sub = divmod(idx - 1, self.sub_buckets)
+        return MIN_LATENCY * 2 ** octave * (1.0 + (sub + 1) / float(self.sub_buckets))
+
+    def record(self, latency):
+        self.counts[self.bucket_of(latency)] += 1
+        self.count += 1
+        self.sum += latency
+        if self.min is None or latency < self.min:
+            self.min = latency
+        if self.max is None or latency > self.max:
+            self.max = latency
+
+    def merge(self, other):
+        for idx, count in enumerate(other.counts):
+            self.counts[idx] += count
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        return self
+
+    def quantile(self, q):
+        """ Upper bucket bound below which a fraction 'q' of latencies fall - capped by the max. seen. """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(self.upper_bound(idx), self.max)
+        return self.max
+
+    def cumulative(self):
+        """ (upper bound, cumulative count) at each power-of-two bound, plus infinity - e.g. for Prometheus. """
+        buckets = []
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if idx == len(self.counts) - 1:
+                buckets.append((float("inf"), seen))
+            elif idx % self.sub_buckets == 0:
+                buckets.append((self.upper_bound(idx), seen))
+        return buckets
+
+    def summary(self):
+        summary = {"count": self.count, "sum": self.sum, "min": self.min, "max": self.max,
+                   "mean": self.sum / self.count if self.count else None}
+        for q in QUANTILES:
+            summary["p%g" % (q * 100)] = self.quantile(q)
+        return summary
+
+
+class SensorMetrics:
+    """ Counters and latency histograms of one sensor - or summed over a bus. """
+    COUNTERS = ("reads", "errors", "timeouts", "configs", "config_errors")
+
+    def __init__(self, sub_buckets=4):
+        for counter in self.COUNTERS:
+            setattr(self, counter, 0)
+        self.read_latency = Histogram(sub_buckets)
+        self.config_latency = Histogram(sub_buckets)
+        self.lock = threading.Lock()
+
+    def merge(self, other):
+        with other.lock:
+            for counter in self.COUNTERS:
+                setattr(self, counter, getattr(self, counter) + getattr(other, counter))
+            self.read_latency.merge(other.read_latency)
+            self.config_latency.merge(other.config_latency)
+        return self
+
+    def as_dict(self):
+        result = dict((counter, getattr(self, counter)) for counter in self.COUNTERS)
+        result["read_latency"] = self.read_latency.summary()
+        result["config_latency"] = self.config_latency.summary()
+        return result
+
+
+class TimedRead:
+    """ Timing wrapper of a sensor's read-function - callable like the read-function itself. """
+    def __init__(self, func, metrics, clock):
+        self.func = func
+        self.metrics = metrics
+        self.clock = clock
+
+    def __call__(self):
+        metrics = self.metrics
+        start = self.clock()
+        try:
+            value = self.func()
+        except Exception:
+            latency = self.clock() - start
+            with metrics.lock:
+                metrics.reads += 1
+                metrics.errors += 1
+                metrics.read_latency.record(latency)
+            raise
+        latency = self.clock() - start
+        with metrics.lock:
+            metrics.reads += 1
+            metrics.read_latency.record(latency)
+        return value
+
+
+class AsyncTimedRead(TimedRead):
+    """ Timing wrapper of a native coroutine read-function - awaited like the read-function itself. """
+    async def __call__(self):
+        metrics = self.metrics
+        start = self.clock()
+        try:
+            value = await self.func()
+        except Exception:
+            latency = self.clock() - start
+            with metrics.lock:
+                metrics.reads += 1
+                metrics.errors += 1
+                metrics.read_latency.record(latency)
+            raise
+        latency = self.clock() - start
+        with metrics.lock:
+            metrics.reads += 1
+            metrics.read_latency.record(latency)
+        return value
+
+
+class TimedConfig:
+    """ Timing wrapper of a sensor's config-function. """
+    def __init__(self, func, metrics, clock):
+        self.func = func
+        self.metrics = metrics
+        self.clock = clock
+
+    def __call__(self, *args, **kwargs):
+        metrics = self.metrics
+        start = self.clock()
+        try:
+            return self.func(*args, **kwargs)
+        except Exception:
+            with metrics.lock:
+                metrics.config_errors += 1
+            raise
+        finally:
+            latency = self.clock() - start
+            with metrics.lock:
+                metrics.configs += 1
+                metrics.config_latency.record(latency)
+
+
+def _read_slot(sensor):
+    """ (holder, attribute) of the innermost read-function - below wrappers exposing it as 'read_func'. """
+    holder, attr = sensor.base, "read"
+    while hasattr(getattr(holder, attr), "read_func"):
+        holder, attr = getattr(holder, attr), "read_func"
+    return holder, attr
+
+
+def bus_label(sensor):
+    return "%s/%s" % bus_key(sensor)
+
+
+class ReadMetrics:
+    """ Metrics of all sensors it is installed on - see 'Sensors.enable_metrics()'. """
+    def __init__(self, sub_buckets=4, clock=time.perf_counter):
+        self.sub_buckets = sub_buckets
+        self.clock = clock
+        self.entries = {}    # UUID -> (sensor, SensorMetrics)
+
+    def install(self, sensor):
+        if sensor.base.uuid in self.entries:
+            return False
+        metrics = SensorMetrics(self.sub_buckets)
+        self.entries[sensor.base.uuid] = (sensor, metrics)
+        if sensor.base.read is not None:
+            holder, attr = _read_slot(sensor)
+            read_func = getattr(holder, attr)
+            timed_read = AsyncTimedRead if is_async_read(read_func) else TimedRead
+            setattr(holder, attr, timed_read(read_func, metrics, self.clock))
+        if sensor.base.config is not None:
+            sensor.base.config = TimedConfig(sensor.base.config, metrics, self.clock)
+        return True
+
+    def uninstall(self, sensor):
+        entry = self.entries.pop(sensor.base.uuid, None)
+        if entry is None:
+            return False
+        holder, attr = sensor.base, "read"
+        while True:
+            func = getattr(holder, attr)
+            if isinstance(func, TimedRead) and func.metrics is entry[1]:
+                setattr(holder, attr, func.func)
+                break
+            if not hasattr(func, "read_func"):
+                break
+            holder, attr = func, "read_func"
+        if isinstance(sensor.base.config, TimedConfig):
+            sensor.base.config = sensor.base.config.func
+        return True
+
+    def record_batch(self, sensors, values, latency):
+        """
+        Account a combined transaction (see 'bus_batching') reading 'sensors' - one read each, exception
+        values as errors. No per-device time exists, so the transaction time is split evenly over the sensors.
+        """
+        share = latency / len(sensors)
+        for sensor, value in zip(sensors, values):
+            entry = self.entries.get(sensor.base.uuid)
+            if entry is None:
+                continue
+            metrics = entry[1]
+            with metrics.lock:
+                metrics.reads += 1
+                if isinstance(value, Exception):
+                    metrics.errors += 1
+                metrics.read_latency.record(share)
+
+    def record_timeout(self, sensor):
+        entry = self.entries.get(sensor.base.uuid)
+        if entry is not None:
+            with entry[1].lock:
+                entry[1].timeouts += 1
+
+    def reset(self):
+        for _, metrics in self.entries.values():
+            with metrics.lock:
+                for counter in SensorMetrics.COUNTERS:
+                    setattr(metrics, counter, 0)
+                metrics.read_latency = Histogram(self.sub_buckets)
+                metrics.config_latency = Histogram(self.sub_buckets)
+
+    def metrics_of(self, sensor):
+        """ Copy of one sensor's metrics. """
+        return SensorMetrics(self.sub_buckets).merge(self.entries[sensor.base.uuid][1])
+
+    def _per_bus(self):
+        buses = {}
+        for sensor, metrics in self.entries.values():
+            label = bus_label(sensor)
+            if label not in buses:
+                buses[label] = [0, SensorMetrics(self.sub_buckets)]
+            buses[label][0] += 1
+            buses[label][1].merge(metrics)
+        return buses
+
+    def snapshot(self):
+        """
+        Metrics as plain dictionaries: 'sensors' (ordered by total read time, slowest first) and 'buses' -
+        each with counters and 'read_latency'/'config_latency' summaries (count, sum, min, max, mean, quantiles).
+        """
+        sensors = []
+        for sensor, metrics in self.entries.values():
+            row = {"alias": sensor.base.alias, "uuid": str(sensor.base.uuid), "bus": bus_label(sensor)}
+            with metrics.lock:
+                row.update(metrics.as_dict())
+            sensors.append(row)
+        sensors.sort(key=lambda row: row["read_latency"]["sum"], reverse=True)
+        buses = []
+        for label, (no_of_sensors, metrics) in sorted(self._per_bus().items()):
+            row = {"bus": label, "sensors": no_of_sensors}
+            row.update(metrics.as_dict())
+            buses.append(row)
+        return {"sensors": sensors, "buses": buses}
+
+    def top(self, count=10):
+        """ The 'count' sensors with the most total read time - (alias, seconds, share of all read time). """
+        rows = self.snapshot()["sensors"][:count]
+        total = sum(metrics.read_latency.sum for _, metrics in self.entries.values()) or 1.0
+        return [(row["alias"], row["read_latency"]["sum"], row["read_latency"]["sum"] / total) for row in rows]
+
+    def prometheus_text(self):
+        """ Metrics in Prometheus text exposition format (version 0.0.4). """
+        lines = []
+        series = []
+        for sensor, metrics in self.entries.values():
+            copy = SensorMetrics(self.sub_buckets).merge(metrics)
+            series.append(({"sensor": sensor.base.alias, "bus": bus_label(sensor)}, copy))
+        _counter_lines(lines, "py_sensors", series)
+        _histogram_lines(lines, "py_sensors_read_latency_seconds", "Latency of sensor reads.",
+                         [(labels, metrics.read_latency) for labels, metrics in series])
+        # Config calls are rare - a summary (sum & count) is enough, and keeps the exposition small:
+        _summary_lines(lines, "py_sensors_config_latency_seconds", "Latency of sensor config calls.",
+                       [(labels, metrics.config_latency) for labels, metrics in series])
+        bus_series = [({"bus": label}, metrics) for label, (_, metrics) in sorted(self._per_bus().items())]
+        _counter_lines(lines, "py_sensors_bus", bus_series)
+        _histogram_lines(lines, "py_sensors_bus_read_latency_seconds", "Latency of sensor reads, per bus.",
+                         [(labels, metrics.read_latency) for labels, metrics in bus_series])
+        return "\n".join(lines) + "\n"
+
+    def serve(self, host="127.0.0.1", port=0):
+        """ Serve 'prometheus_text()' on http://host:port/metrics from a background thread - returns the server. """
+        return MetricsServer(self, host, port)
+
+
+# ****************** Prometheus text format *******************
+
+COUNTER_HELP = {
+    "reads": "Sensor reads.",
+    "errors": "Sensor reads raising a driver exception.",
+    "timeouts": "Sensor reads timed out by the poller.",
+    "configs": "Sensor config calls.",
+    "config_errors": "Sensor config calls raising a driver exception.",
+}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(labels, extra=None):
+    items = list(labels.items()) + ([extra] if extra else [])
+    return "{%s}" % ",".join("%s=\"%s\"" % (key, _escape(value)) for key, value in items)
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def _counter_lines(lines, prefix, series):
+    for counter in SensorMetrics.COUNTERS:
+        name = "%s_%s_total" % (prefix, counter)
+        lines.append("# HELP %s %s" % (name, COUNTER_HELP[counter]))
+        lines.append("# TYPE %s counter" % name)
+        for labels, metrics in series:
+            lines.append("%s%s %d" % (name, _labels(labels), getattr(metrics, counter)))
+
+
+def _histogram_lines(lines, name, help_text, series):
+    lines.append("# HELP %s %s" % (name, help_text))
+    lines.append("# TYPE %s histogram" % name)
+    for labels, histogram in series:
+        for bound, count in histogram.cumulative():
+            lines.append("%s_bucket%s %d" % (name, _labels(labels, ("le", _format_bound(bound))), count))
+        lines.append("%s_sum%s %r" % (name, _labels(labels), histogram.sum))
+        lines.append("%s_count%s %d" % (name, _labels(labels), histogram.count))
+
+
+def _summary_lines(lines, name, help_text, series):
+    lines.append("# HELP %s %s" % (name, help_text))
+    lines.append("# TYPE %s summary" % name)
+    for labels, histogram in series:
+        lines.append("%s_sum%s %r" % (name, _labels(labels), histogram.sum))
+        lines.append("%s_count%s %d" % (name, _labels(labels), histogram.count))
+
+
+class MetricsServer:
+    """ Local HTTP endpoint - GET /metrics returns the Prometheus text of a 'ReadMetrics'. """
+    def __init__(self, metrics, host="127.0.0.1", port=0):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, fmt, *args):
+                logger.debug("metrics endpoint: " + fmt, *args)
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="metrics-endpoint", daemon=True)
+        self._thread.start()
+
+    @property
+    def address(self):
+        return self.httpd.server_address
+
+    @property
+    def url(self):
+        return "http://%s:%d/metrics" % self.address[:2]
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self._thread.join()
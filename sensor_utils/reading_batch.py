@@ -0,0 +1,112 @@
+"""
+@file reading_batch.py
+@brief Batch container packing many sensor readings into ONE contiguous buffer.
+Each reading is a fixed-size record (struct-packed), optionally followed by list items:
+    sensor_idx (uint32) | kind (uint8) | triggered (uint8) | no. of list items (uint16) |
+    timestamp (float64) | channel (int32) | value (float64 or int64)
+Kinds: scalar float, scalar int, bool, ComplexValue, and lists of ints/floats (items as int64/float64 -
+at most 65535 items). Values that cannot be packed are rejected - the buffer is left as it was.
+The buffer is a bytearray - hand it off zero-copy via 'memoryview(batch.buffer)',
+and wrap a received buffer (again without copying) using 'ReadingBatch(buffer=...)'. A wrapped batch can be
+appended to - a buffer that is not a bytearray (e.g. 'bytes' or a 'memoryview') is copied first then.
+"""
+
+import logging
+import struct
+
+from sensor_properties.sensor_props import ComplexValue, SensorReading
+
+
+logger = logging.getLogger(__name__)
+
+
+KIND_FLOAT = 0
+KIND_INT = 1
+KIND_COMPLEX = 2
+KIND_INT_LIST = 3
+KIND_FLOAT_LIST = 4
+KIND_BOOL = 5
+
+MAX_LIST_ITEMS = 0xffff    # no. of list items is a uint16
+
+RECORD = struct.Struct("<IBBHdid")
+INT_RECORD = struct.Struct("<IBBHdiq")
+INT_ITEM = struct.Struct("<q")
+FLOAT_ITEM = struct.Struct("<d")
+
+
+class ReadingBatch:
+    """ Append-only batch of readings - iterate to get 'SensorReading' tuples back. """
+    def __init__(self, buffer=None):
+        self.buffer = bytearray() if buffer is None else buffer
+        self.count = None if buffer is not None else 0    # counted first when asked for, for wrapped buffers
+
+    def __len__(self):
+        if self.count is None:
+            self.count = sum(1 for _ in self)
+        return self.count
+
+    @property
+    def nbytes(self):
+        return len(self.buffer)
+
+    def append(self, sensor_idx, timestamp, value):
+        # Record packed completely first - so that a value failing to pack leaves no partial record behind:
+        try:
+            record = self._pack(sensor_idx, timestamp, value)
+        except struct.error as exc:
+            logger.error("cannot pack sensor value of type %s - %s!", type(value).__name__, exc)
+            return False
+        if record is None:
+            logger.error("cannot pack sensor value of type %s!", type(value).__name__)
+            return False
+        if not isinstance(self.buffer, bytearray):
+            self.buffer = bytearray(self.buffer)
+        self.buffer += record
+        if self.count is not None:
+            self.count += 1
+        return True
+
+    @staticmethod
+    def _pack(sensor_idx, timestamp, value):
+        """ Packed record of one reading - None if the value type is not supported. """
+        if isinstance(value, float):
+            return RECORD.pack(sensor_idx, KIND_FLOAT, 0, 0, timestamp, 0, value)
+        if isinstance(value, ComplexValue):
+            return RECORD.pack(sensor_idx, KIND_COMPLEX, bool(value.triggered), 0, timestamp,
+                               value.channel, value.ch_val)
+        # NOTE: bool before int - bools ARE ints, but must not come back as 0/1:
+        if isinstance(value, bool):
+            return RECORD.pack(sensor_idx, KIND_BOOL, value, 0, timestamp, 0, 0.0)
+        if isinstance(value, int):
+            return INT_RECORD.pack(sensor_idx, KIND_INT, 0, 0, timestamp, 0, value)
+        if isinstance(value, (list, tuple)):
+            if len(value) > MAX_LIST_ITEMS:
+                raise struct.error("%d list items - at most %d supported" % (len(value), MAX_LIST_ITEMS))
+            if all(isinstance(item, int) for item in value):
+                return (RECORD.pack(sensor_idx, KIND_INT_LIST, 0, len(value), timestamp, 0, 0.0) +
+                        struct.pack("<%dq" % len(value), *value))
+            return (RECORD.pack(sensor_idx, KIND_FLOAT_LIST, 0, len(value), timestamp, 0, 0.0) +
+                    struct.pack("<%dd" % len(value), *value))
+        return None
+
+    def __iter__(self):
+        view = memoryview(self.buffer)
+        offset = 0
+        end = len(view)
+        while offset < end:
+            sensor_idx, kind, triggered, no_of_items, timestamp, channel, fval = RECORD.unpack_from(view, offset)
+            if kind == KIND_FLOAT:
+                value = fval
+            elif kind == KIND_COMPLEX:
+                value = ComplexValue(bool(triggered), channel, fval)
+            elif kind == KIND_BOOL:
+                value = bool(triggered)
+            elif kind == KIND_INT:
+                value = INT_RECORD.unpack_from(view, offset)[6]
+            elif kind == KIND_INT_LIST:
+                value = list(struct.unpack_from("<%dq" % no_of_items, view, offset + RECORD.size))
+            else:
+                value = list(struct.unpack_from("<%dd" % no_of_items, view, offset + RECORD.size))
+            offset += RECORD.size + no_of_items * 8
+            yield SensorReading(sensor_idx, timestamp, value)
@@ -0,0 +1,147 @@
+"""
+@file reading_filter.py
+@brief Filtering stage for the read pipeline - passes on a reading only if it is worth sending downstream.
+Options (per sensor, by alias - or a default for all sensors):
+- 'deadband_abs': report only if the value moved more than this, against the last REPORTED value
+- 'deadband_rel': ... or more than this fraction of the last reported value
+- 'suppress_duplicates': report only if the value differs (exactly) from the last reported one
+- 'heartbeat': report anyway once this many seconds passed since the last report (None: never)
+With any of the first three set, the filter is report-on-change; with none set, everything passes.
+Value shapes: scalars, lists (UART - changed if ANY item changed, or the length) and 'ComplexValue'
+(SPI - changed if 'triggered'/'channel' changed, or 'ch_val' moved beyond the deadband).
+Failed reads (exception instances, 'READ_TIMEOUT') always pass and leave the filter state untouched.
+"""
+
+import time
+from collections import namedtuple
+
+from sensor_properties.sensor_props import ComplexValue
+from sensor_utils.sensor_poller import ReadTimeout
+
+
+FilterOptions = namedtuple("FilterOptions", ["deadband_abs", "deadband_rel", "suppress_duplicates", "heartbeat"],
+                           defaults=[None, None, False, None])
+
+_NOTHING_REPORTED = object()
+
+
+class FilterStats:
+    """ Counters of one sensor - or summed over all sensors. """
+    def __init__(self):
+        self.no_of_readings = 0
+        self.no_of_suppressed = 0
+        self.no_of_heartbeats = 0    # readings passed only because the heartbeat interval was due
+
+    @property
+    def suppression_ratio(self):
+        if self.no_of_readings == 0:
+            return 0.0
+        return self.no_of_suppressed / float(self.no_of_readings)
+
+    def merge(self, other):
+        self.no_of_readings += other.no_of_readings
+        self.no_of_suppressed += other.no_of_suppressed
+        self.no_of_heartbeats += other.no_of_heartbeats
+        return self
+
+    def __repr__(self):
+        return "FilterStats(readings=%d, suppressed=%d, heartbeats=%d, suppression_ratio=%.3f)" % \
+               (self.no_of_readings, self.no_of_suppressed, self.no_of_heartbeats, self.suppression_ratio)
+
+
+def _scalar_changed(value, last, options):
+    if options.deadband_abs is None and options.deadband_rel is None:
+        return value != last
+    delta = abs(value - last)
+    if options.deadband_abs is not None and delta > options.deadband_abs:
+        return True
+    if options.deadband_rel is not None and delta > options.deadband_rel * abs(last):
+        return True
+    return False
+
+
+def value_changed(value, last, options):
+    """ True if 'value' differs enough from 'last' (reported) value to be reported. """
+    if isinstance(value, ComplexValue):
+        if not isinstance(last, ComplexValue):
+            return True
+        if value.triggered != last.triggered or value.channel != last.channel:
+            return True
+        return _scalar_changed(value.ch_val, last.ch_val, options)
+    if isinstance(value, (list, tuple)):
+        if not isinstance(last, (list, tuple)) or len(value) != len(last):
+            return True
+        return any(_scalar_changed(item, last_item, options) for item, last_item in zip(value, last))
+    if isinstance(last, (ComplexValue, list, tuple)):
+        return True
+    return _scalar_changed(value, last, options)
+
+
+def _copy(value):
+    """ Reported value kept for comparison - lists copied, since drivers may reuse (and refill) them. """
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, ComplexValue):
+        return ComplexValue(value.triggered, value.channel, value.ch_val)
+    return value
+
+
+class ReadingFilter:
+    """ Per-sensor report-on-change state - 'accept()' decides for each reading. """
+    def __init__(self, default=None, clock=time.monotonic):
+        self.default = FilterOptions() if default is None else default
+        self.clock = clock
+        self.options = {}
+        self._last = {}        # alias -> (value, timestamp) of last reported reading
+        self._stats = {}
+
+    def set_options(self, alias, options):
+        self.options[alias] = options
+        self._last.pop(alias, None)
+
+    def reset(self, alias=None):
+        """ Forget last reported value(s) - the next reading passes. """
+        if alias is None:
+            self._last.clear()
+        else:
+            self._last.pop(alias, None)
+
+    def stats(self, alias=None):
+        if alias is not None:
+            return self._stats.get(alias, FilterStats())
+        total = FilterStats()
+        for stats in self._stats.values():
+            total.merge(stats)
+        return total
+
+    def accept(self, alias, value, timestamp=None):
+        """ True if reading is to be passed on downstream. """
+        stats = self._stats.get(alias)
+        if stats is None:
+            stats = self._stats[alias] = FilterStats()
+        stats.no_of_readings += 1
+        if isinstance(value, (Exception, ReadTimeout)):
+            return True
+        if timestamp is None:
+            timestamp = self.clock()
+        options = self.options.get(alias, self.default)
+        last_value, last_timestamp = self._last.get(alias, (_NOTHING_REPORTED, None))
+        if last_value is _NOTHING_REPORTED:
+            changed = True
+        elif options.deadband_abs is None and options.deadband_rel is None and not options.suppress_duplicates:
+            changed = True
+        else:
+            changed = value_changed(value, last_value, options)
+        if not changed:
+            if options.heartbeat is None or timestamp - last_timestamp < options.heartbeat:
+                stats.no_of_suppressed += 1
+                return False
+            stats.no_of_heartbeats += 1
+        self._last[alias] = (_copy(value), timestamp)
+        return True
+
+    def filter_sweep(self, sensor_data, timestamp=None):
+        """ Yield the (alias, value) pairs - e.g. from 'Sensors.get_sensor_data()' - that pass the filter. """
+        for alias, value in sensor_data:
+            if self.accept(alias, value, timestamp):
+                yield alias, value
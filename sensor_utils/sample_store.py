@@ -0,0 +1,152 @@
+"""
+@file sample_store.py
+@brief In-process sample history - a fixed-capacity ring buffer per sensor, backed by NumPy arrays.
+Timestamps and values are kept in preallocated (columnar) arrays, instead of one Python object per sample.
+Value shapes handled (as returned by the drivers):
+- scalar (I2C)         --> float64 column
+- list of values (UART) --> 2D float64 array, one column per list item (width fixed by first sample)
+- ComplexValue (SPI)    --> structured array with fields 'triggered', 'channel' and 'ch_val'
+Window queries (last-N, time-range, min/max/mean) are vectorized.
+A sample not matching the layout of its buffer (e.g. a list for a scalar sensor, or a failed read) is logged
+and skipped - it never raises out of the read path.
+"""
+
+import logging
+import time
+
+import numpy as np
+
+from sensor_properties.sensor_props import ComplexValue
+
+
+logger = logging.getLogger(__name__)
+
+COMPLEX_VALUE_DTYPE = np.dtype([("triggered", np.bool_), ("channel", np.int32), ("ch_val", np.float64)])
+SCALAR_TYPES = (float, int, np.floating, np.integer)    # concrete types - isinstance() on these is cheap
+
+
+class RingBuffer:
+    """
+    Fixed-capacity ring buffer of (timestamp, value) samples.
+    Timestamps are expected to be non-decreasing (e.g. from 'time.monotonic()').
+    """
+    def __init__(self, capacity=1024, dtype=np.float64, width=None):
+        self.capacity = capacity
+        self.width = width
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        if width is None:
+            self.values = np.zeros(capacity, dtype=dtype)
+        else:
+            self.values = np.zeros((capacity, width), dtype=dtype)
+        self.is_complex = self.values.dtype == COMPLEX_VALUE_DTYPE
+        self.head = 0           # next slot to write
+        self.total_count = 0    # samples appended since creation (incl. overwritten ones)
+
+    @classmethod
+    def for_value(cls, value, capacity=1024):
+        """ Create a buffer whose layout matches the given (first) sample value. """
+        if isinstance(value, ComplexValue):
+            return cls(capacity, dtype=COMPLEX_VALUE_DTYPE)
+        if isinstance(value, (list, tuple)):
+            return cls(capacity, dtype=np.float64, width=len(value))
+        return cls(capacity, dtype=np.float64)
+
+    def __len__(self):
+        return min(self.total_count, self.capacity)
+
+    def append(self, timestamp, value):
+        if self.is_complex:
+            if not isinstance(value, ComplexValue):
+                logger.error("value of type %s does not fit sample store of complex values!", type(value).__name__)
+                return False
+            value = (value.triggered, value.channel, value.ch_val)
+        elif self.width is not None:
+            if not isinstance(value, (list, tuple)) or len(value) != self.width:
+                logger.error("value of type %s does not fit sample store of width %d!", type(value).__name__,
+                             self.width)
+                return False
+        elif not isinstance(value, SCALAR_TYPES):
+            logger.error("value of type %s does not fit sample store of scalars!", type(value).__name__)
+            return False
+        try:
+            self.values[self.head] = value
+        except (TypeError, ValueError) as exc:
+            # E.g. non-numeric list items:
+            logger.error("cannot store sample - %s!", exc)
+            return False
+        self.timestamps[self.head] = timestamp
+        self.head = (self.head + 1) % self.capacity
+        self.total_count += 1
+        return True
+
+    def _ordered(self, array):
+        """ Valid part of 'array' in chronological order (a copy only if the buffer has wrapped). """
+        if self.total_count <= self.capacity:
+            return array[:self.head]
+        return np.concatenate((array[self.head:], array[:self.head]))
+
+    def last(self, n=1):
+        """ Last 'n' samples as (timestamps, values) arrays - oldest first. """
+        n = min(n, len(self))
+        if n == 0:
+            return self.timestamps[:0], self.values[:0]
+        idx = (self.head - n + np.arange(n)) % self.capacity
+        return self.timestamps[idx], self.values[idx]
+
+    def between(self, start=None, end=None):
+        """ Samples with start <= timestamp <= end, as (timestamps, values) arrays - oldest first. """
+        timestamps = self._ordered(self.timestamps)
+        values = self._ordered(self.values)
+        lo = 0 if start is None else np.searchsorted(timestamps, start, side="left")
+        hi = len(timestamps) if end is None else np.searchsorted(timestamps, end, side="right")
+        return timestamps[lo:hi], values[lo:hi]
+
+    def stats(self, start=None, end=None):
+        """ min/max/mean (and count) over a time window - per column for list values, of 'ch_val' for ComplexValue. """
+        _, values = self.between(start, end)
+        if values.dtype == COMPLEX_VALUE_DTYPE:
+            values = values["ch_val"]
+        if len(values) == 0:
+            return {"count": 0, "min": None, "max": None, "mean": None}
+        return {"count": len(values), "min": values.min(axis=0), "max": values.max(axis=0),
+                "mean": values.mean(axis=0)}
+
+
+class SampleStore:
+    """ One ring buffer per sensor (keyed by alias) - created lazily from the first sample. """
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.buffers = {}
+
+    def append(self, alias, value, timestamp=None):
+        if timestamp is None:
+            timestamp = time.monotonic()
+        buffer = self.buffers.get(alias)
+        if buffer is None:
+            buffer = RingBuffer.for_value(value, self.capacity)
+            # Layout is fixed by the first sample - so only by one that could be stored:
+            if not buffer.append(timestamp, value):
+                return False
+            self.buffers[alias] = buffer
+            return True
+        return buffer.append(timestamp, value)
+
+    def append_sweep(self, sensor_data, timestamp=None):
+        """ Store a sweep of (alias, value) pairs - e.g. from 'Sensors.get_sensor_data()' - with a common timestamp. """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        for alias, value in sensor_data:
+            self.append(alias, value, timestamp)
+
+    def last(self, alias, n=1):
+        return self.buffers[alias].last(n)
+
+    def between(self, alias, start=None, end=None):
+        return self.buffers[alias].between(start, end)
+
+    def stats(self, alias, start=None, end=None):
+        return self.buffers[alias].stats(start, end)
+
+    def nbytes(self):
+        """ Memory held by all sample arrays (bytes). """
+        return sum(buffer.timestamps.nbytes + buffer.values.nbytes for buffer in self.buffers.values())
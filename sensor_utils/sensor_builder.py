@@ -1,3 +1,8 @@
+import logging
+
+
+logger = logging.getLogger(__name__)
+
 
 # **************** SENSOR-BUILDER ********************
 class SensorBuilder(object):
@@ -15,7 +20,7 @@ class SensorBuilder(object):
             # Then device-specific props:
             self.sensor_obj.__dict__[field_name] = field_value
             if field_name not in existing_dev_props:
-                print("Warning: field named '%s' - not in (sub)class! Possibly extending class ..." % field_name)
+                logger.warning("field named '%s' - not in (sub)class! Possibly extending class ...", field_name)
         else:
             self.sensor_obj.base.__dict__[field_name] = field_value
         #
@@ -0,0 +1,159 @@
+"""
+@file sensor_poller.py
+@brief Concurrent polling engine for sensor sweeps.
+Reads on independent buses run concurrently, while reads on the SAME bus are serialized
+(the bus is a shared resource) - each bus gets its own single-thread executor.
+A read exceeding the per-read timeout is marked with READ_TIMEOUT, and so are the
+remaining reads queued on that (now blocked) bus - the sweep itself never blocks on a hung device:
+not even on one still running from an earlier sweep, since a read that does not START within the timeout
+is marked, too. A bus stays blocked until the read it is stuck on completes.
+Call 'shutdown()' to release the per-bus threads.
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+
+class ReadTimeout:
+    """ Marker-type for a sensor read that did not complete within the per-read timeout. """
+    def __repr__(self):
+        return "READ_TIMEOUT"
+
+
+READ_TIMEOUT = ReadTimeout()
+
+
+def bus_key(sensor):
+    """ Reads sharing this key are serialized. """
+    return sensor.base.type_name, sensor.base.bus_no
+
+
+class _ReadJob:
+    def __init__(self, sensor):
+        self.sensor = sensor
+        self.started = threading.Event()
+        self.start_time = None
+        self.end_time = None
+        self.future = None
+
+    def run(self):
+        self.start_time = time.monotonic()
+        self.started.set()
+        try:
+            return self.sensor.base.read()
+        finally:
+            self.end_time = time.monotonic()
+
+
+class SweepStats:
+    """ Timing metrics of the latest sweep (sequential time is sum of individual read times). """
+    def __init__(self):
+        self.sweep_time = 0.0
+        self.sequential_time = 0.0
+        self.no_of_reads = 0
+        self.no_of_timeouts = 0
+        self.no_of_errors = 0
+
+    @property
+    def speedup(self):
+        if self.sweep_time == 0.0:
+            return 1.0
+        return self.sequential_time / self.sweep_time
+
+    def __repr__(self):
+        return "SweepStats(sweep_time=%.6f, sequential_time=%.6f, speedup=%.2f, reads=%d, timeouts=%d, errors=%d)" % \
+               (self.sweep_time, self.sequential_time, self.speedup,
+                self.no_of_reads, self.no_of_timeouts, self.no_of_errors)
+
+
+class SensorPoller:
+    """
+    Polls a set of sensors concurrently across buses.
+    Results come back in the order of the given sensors - a value, READ_TIMEOUT,
+    or the exception instance raised by the driver.
+    """
+    def __init__(self, read_timeout=1.0):
+        self.read_timeout = read_timeout
+        self.stats = SweepStats()
+        self._executors = {}
+        self._hung = {}
+
+    def _executor(self, key):
+        executor = self._executors.get(key)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bus-%s-%s" % key)
+            self._executors[key] = executor
+        return executor
+
+    def _bus_blocked(self, key):
+        hung_future = self._hung.get(key)
+        if hung_future is None:
+            return False
+        if hung_future.done():
+            del self._hung[key]
+            return False
+        return True
+
+    def sweep(self, sensors):
+        stats = SweepStats()
+        sweep_start = time.monotonic()
+        results = [None] * len(sensors)
+        # Queue all reads, bus by bus:
+        bus_jobs = {}
+        for idx, sensor in enumerate(sensors):
+            bus_jobs.setdefault(bus_key(sensor), []).append((idx, _ReadJob(sensor)))
+        blocked_buses = set(key for key in bus_jobs if self._bus_blocked(key))
+        for key, jobs in bus_jobs.items():
+            if key in blocked_buses:
+                continue
+            executor = self._executor(key)
+            for idx, job in jobs:
+                job.future = executor.submit(job.run)
+        # Collect - buses keep progressing concurrently while waiting on one of them:
+        for key, jobs in bus_jobs.items():
+            bus_ok = key not in blocked_buses
+            for idx, job in jobs:
+                stats.no_of_reads += 1
+                if not bus_ok:
+                    if job.future is not None and not job.future.cancel() and not job.future.done():
+                        # Started already (predecessor completed meanwhile) - the bus is free once this one is:
+                        self._hung[key] = job.future
+                    results[idx] = READ_TIMEOUT
+                    stats.no_of_timeouts += 1
+                    continue
+                # Normally the predecessor on the bus has completed - so this job starts (almost) immediately.
+                # If not, the bus is stuck on a read nobody waits for any more (e.g. left over from an earlier
+                # sweep) - this job stays queued behind it, and the bus is blocked until it has run:
+                if not job.started.wait(self.read_timeout):
+                    results[idx] = READ_TIMEOUT
+                    stats.no_of_timeouts += 1
+                    self._hung[key] = job.future
+                    bus_ok = False
+                    stats.sequential_time += self.read_timeout
+                    continue
+                remaining = job.start_time + self.read_timeout - time.monotonic()
+                try:
+                    results[idx] = job.future.result(timeout=max(remaining, 0.0))
+                except TimeoutError:
+                    results[idx] = READ_TIMEOUT
+                    stats.no_of_timeouts += 1
+                    self._hung[key] = job.future
+                    bus_ok = False
+                    stats.sequential_time += self.read_timeout
+                    continue
+                except Exception as exc:
+                    results[idx] = exc
+                    stats.no_of_errors += 1
+                stats.sequential_time += job.end_time - job.start_time
+        #
+        stats.sweep_time = time.monotonic() - sweep_start
+        self.stats = stats
+        return results
+
+    def shutdown(self):
+        """ Release the per-bus threads - reads still running (hung) are not waited for. """
+        self._hung = {}
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors = {}
@@ -0,0 +1,103 @@
+"""
+@file sensor_registry.py
+@brief Indexed registry of sensor objects.
+Keeps hash-indexes by alias, UUID and type-name, plus a bus-occupancy index keyed on
+(type, bus_no, i2c_addr/cs_no), so that lookups and bus-conflict checks are O(1)
+instead of linear scans over the list of sensors.
+"""
+
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+def bus_slot(sensor):
+    """
+    Key of the bus-resource a sensor occupies:
+    (type, bus_no, i2c_addr) for I2C, (type, bus_no, cs_no) for SPI, (type, bus_no, None) for UART
+    and (type, dev_no, dev_addr) for internal sensors.
+    """
+    type_name = sensor.base.type_name
+    if type_name == "internal":
+        return type_name, sensor.base.dev_no, sensor.base.dev_addr
+    if type_name == "i2c":
+        return type_name, sensor.base.bus_no, sensor.i2c_addr
+    if type_name == "spi":
+        return type_name, sensor.base.bus_no, sensor.cs_no
+    return type_name, sensor.base.bus_no, None
+
+
+class SensorRegistry:
+    """
+    Container for sensors enforcing uniqueness of alias, UUID and bus-slot on insert.
+    Insertion order is preserved - which is also the order of the 'sensors' list-view.
+    """
+    def __init__(self, sensors=None):
+        self._by_uuid = {}
+        self._by_alias = {}
+        self._by_type = {}
+        self._by_slot = {}
+        if sensors:
+            for sensor in sensors:
+                self.add(sensor)
+
+    def __len__(self):
+        return len(self._by_uuid)
+
+    def __iter__(self):
+        return iter(list(self._by_uuid.values()))
+
+    def __contains__(self, sensor):
+        return self._by_uuid.get(sensor.base.uuid) is sensor
+
+    @property
+    def sensors(self):
+        """ List-view of all registered sensors, in insertion order. """
+        return list(self._by_uuid.values())
+
+    def conflict(self, sensor):
+        """ Return reason (string) why sensor cannot be registered - or None if it can. """
+        if sensor.base.uuid in self._by_uuid:
+            return "UUID=%s already registered" % sensor.base.uuid
+        if sensor.base.alias in self._by_alias:
+            return "alias '%s' already in use" % sensor.base.alias
+        slot = bus_slot(sensor)
+        if slot in self._by_slot:
+            return "bus-resource %s already in use by sensor '%s'" % (slot, self._by_slot[slot].base.alias)
+        return None
+
+    def add(self, sensor):
+        reason = self.conflict(sensor)
+        if reason is not None:
+            logger.error("cannot register sensor - %s!", reason)
+            return False
+        #
+        self._by_uuid[sensor.base.uuid] = sensor
+        self._by_alias[sensor.base.alias] = sensor
+        self._by_type.setdefault(sensor.base.type_name, {})[sensor.base.uuid] = sensor
+        self._by_slot[bus_slot(sensor)] = sensor
+        return True
+
+    def remove(self, sensor):
+        if sensor not in self:
+            logger.error("cannot remove sensor - not registered!")
+            return False
+        #
+        del self._by_uuid[sensor.base.uuid]
+        del self._by_alias[sensor.base.alias]
+        del self._by_type[sensor.base.type_name][sensor.base.uuid]
+        del self._by_slot[bus_slot(sensor)]
+        return True
+
+    def get_by_alias(self, alias):
+        return self._by_alias.get(alias)
+
+    def get_by_uuid(self, s_uuid):
+        return self._by_uuid.get(s_uuid)
+
+    def get_by_type(self, type_name):
+        return list(self._by_type.get(type_name, {}).values())
+
+    def get_by_slot(self, slot):
+        return self._by_slot.get(slot)
@@ -0,0 +1,165 @@
+"""
+@file sensor_scheduler.py
+@brief Periodic sampling scheduler with per-sensor sample periods.
+Each sensor is sampled at its own period (JSON-property 'sample_period', or the scheduler default).
+Due-times live in a heap, so tens of thousands of sensors are handled at O(log N) per sample.
+Timing is drift-free: the next due-time is computed from the previous DUE-time - not from
+when the read actually happened - against a monotonic clock.
+Reads falling due together (within 'coalesce_window') on the same bus are coalesced into one bus batch -
+read in combined transactions where the drivers support it (see 'bus_batching'), failed reads passed on
+as the exception instance (as with 'sensor_poller').
+Re-adding a scheduled sensor reschedules it: each heap entry carries the generation token of the 'add_sensor()'
+that created it, and entries of older generations (or removed sensors) are dropped when they come up.
+Missed deadlines (periods skipped because a sample came too late) and jitter are tracked per sensor.
+"""
+
+import heapq
+import itertools
+import time
+
+from sensor_utils.bus_batching import read_batched
+from sensor_utils.sensor_poller import bus_key
+
+
+class SampleStats:
+    """ Per-sensor scheduling statistics (jitter = actual read-start minus due-time, in seconds). """
+    def __init__(self):
+        self.no_of_samples = 0
+        self.missed_deadlines = 0
+        self.max_jitter = 0.0
+        self.total_jitter = 0.0
+
+    @property
+    def mean_jitter(self):
+        if self.no_of_samples == 0:
+            return 0.0
+        return self.total_jitter / self.no_of_samples
+
+    def __repr__(self):
+        return "SampleStats(samples=%d, missed=%d, mean_jitter=%.6f, max_jitter=%.6f)" % \
+               (self.no_of_samples, self.missed_deadlines, self.mean_jitter, self.max_jitter)
+
+
+class SensorScheduler:
+    """
+    Heap-based scheduler.
+    'on_sample(sensor, value, timestamp)' is called for every sample read - with 'timestamp' taken
+    from the scheduler clock when the read (of its bus batch) started.
+    With 'metrics' (a 'ReadMetrics') given, combined bus transactions are accounted in it.
+    """
+    def __init__(self, default_period=1.0, coalesce_window=0.001, on_sample=None,
+                 clock=time.monotonic, sleep=time.sleep, metrics=None):
+        self.default_period = default_period
+        self.coalesce_window = coalesce_window
+        self.on_sample = on_sample
+        self.clock = clock
+        self.sleep = sleep
+        self.metrics = metrics
+        self.stats = {}
+        self._heap = []           # (due-time, seq, generation, sensor)
+        self._periods = {}
+        self._generations = {}    # UUID -> generation of its live heap entry
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self._periods)
+
+    def period_of(self, sensor):
+        period = getattr(sensor.base, "sample_period", None)
+        if period is None or period <= 0:
+            return self.default_period
+        return period
+
+    def add_sensor(self, sensor, period=None, start=None):
+        """ Schedule sensor - first sample is due at 'start' (default: now). A scheduled sensor is rescheduled. """
+        if period is None:
+            period = self.period_of(sensor)
+        if start is None:
+            start = self.clock()
+        s_uuid = sensor.base.uuid
+        seq = next(self._seq)
+        self._periods[s_uuid] = period
+        self._generations[s_uuid] = seq
+        self.stats.setdefault(s_uuid, SampleStats())
+        heapq.heappush(self._heap, (start, seq, seq, sensor))
+
+    def add_sensors(self, sensors, start=None):
+        if start is None:
+            start = self.clock()
+        for sensor in sensors:
+            self.add_sensor(sensor, start=start)
+
+    def remove_sensor(self, sensor):
+        """ Unschedule sensor - its heap entry is dropped lazily when it falls due. """
+        self._periods.pop(sensor.base.uuid, None)
+        self._generations.pop(sensor.base.uuid, None)
+
+    def _is_live(self, entry):
+        return self._generations.get(entry[3].base.uuid) == entry[2]
+
+    def next_due(self):
+        """ Due-time of the earliest scheduled sample (None if nothing scheduled). """
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return self._heap[0][0]
+
+    def _pop_due(self, now):
+        """ Pop all samples due (within coalesce window) - grouped by bus. """
+        bus_batches = {}
+        horizon = now + self.coalesce_window
+        while self._heap and self._heap[0][0] <= horizon:
+            entry = heapq.heappop(self._heap)
+            if not self._is_live(entry):
+                continue
+            due, _, generation, sensor = entry
+            bus_batches.setdefault(bus_key(sensor), []).append((due, generation, sensor))
+        return bus_batches
+
+    def run_pending(self):
+        """ Read all sensors that are due - one bus batch per bus. Returns number of samples taken. """
+        bus_batches = self._pop_due(self.clock())
+        no_of_samples = 0
+        for batch in bus_batches.values():
+            started = self.clock()
+            values = read_batched([sensor for _, _, sensor in batch], metrics=self.metrics)
+            for (due, generation, sensor), value in zip(batch, values):
+                self._account(sensor, due, generation, started)
+                if self.on_sample is not None:
+                    self.on_sample(sensor, value, started)
+                no_of_samples += 1
+        return no_of_samples
+
+    def _account(self, sensor, due, generation, started):
+        s_uuid = sensor.base.uuid
+        if self._generations.get(s_uuid) != generation:
+            return    # removed - or re-added - while its bus batch was read
+        period = self._periods[s_uuid]
+        stats = self.stats[s_uuid]
+        jitter = max(started - due, 0.0)
+        stats.no_of_samples += 1
+        stats.total_jitter += jitter
+        stats.max_jitter = max(stats.max_jitter, jitter)
+        # Drift-free: next due-time relative to previous due-time, skipping periods already passed:
+        next_due = due + period
+        now = self.clock()
+        if next_due <= now:
+            missed = int((now - due) // period)
+            stats.missed_deadlines += missed
+            next_due = due + (missed + 1) * period
+        heapq.heappush(self._heap, (next_due, next(self._seq), generation, sensor))
+
+    def run(self, duration=None):
+        """ Run scheduling loop - for 'duration' seconds, or forever if None. """
+        end_time = None if duration is None else self.clock() + duration
+        while True:
+            next_due = self.next_due()
+            if next_due is None:
+                return
+            if end_time is not None and next_due > end_time:
+                return
+            delay = next_due - self.clock()
+            if delay > 0:
+                self.sleep(delay)
+            self.run_pending()
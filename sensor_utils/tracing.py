@@ -0,0 +1,162 @@
+"""
+@file tracing.py
+@brief Opt-in timeline tracer - spans of sweeps, per-sensor reads, validation, DB flushes (and optionally
+GC pauses), written as Chrome trace-event JSON (open in chrome://tracing or https://ui.perfetto.dev).
+- Events go into a bounded buffer: once 'max_events' are held, the oldest are dropped (and counted).
+- Sampling is decided per ROOT span (e.g. one sweep, one 'add_sensor()', one DB flush): with
+  'sample_rate' < 1, only that fraction of roots is recorded - together with all spans nested in them -
+  so that the tracer can stay on in production at low rates.
+Each event carries its thread id (plus thread names as metadata), and per-sensor reads their bus - e.g. "i2c/1".
+Usage: 'Sensors.enable_tracing(Tracer(sample_rate=0.01))' ... 'tracer.write("sweeps.trace.json")'.
+"""
+
+import collections
+import contextlib
+import gc
+import json
+import os
+import random
+import threading
+import time
+
+
+# Shared no-op context - for hooks where tracing is off:
+NO_SPAN = contextlib.nullcontext()
+
+
+def span_of(tracer, name, cat, **args):
+    """ 'tracer.span(...)' - or a no-op context if there is no tracer. """
+    if tracer is None:
+        return NO_SPAN
+    return tracer.span(name, cat, **args)
+
+
+class Span:
+    """ An open, sampled span - see 'Tracer.begin()'. """
+    __slots__ = ("name", "cat", "start", "args")
+
+    def __init__(self, name, cat, start, args):
+        self.name = name
+        self.cat = cat
+        self.start = start
+        self.args = args
+
+
+class Tracer:
+    def __init__(self, sample_rate=1.0, max_events=100000, trace_gc=False, clock=time.perf_counter, seed=None):
+        self.sample_rate = sample_rate
+        self.trace_gc = trace_gc
+        self.clock = clock
+        self.pid = os.getpid()
+        self.no_of_dropped = 0
+        self.no_of_roots = 0
+        self.no_of_sampled = 0
+        self._events = collections.deque(maxlen=max_events)
+        self._thread_names = {}
+        self._local = threading.local()
+        self._random = random.Random(seed).random
+        self._gc_start = None
+
+    # ****************** Recording *******************
+
+    def now(self):
+        """ Timestamp (microseconds) as used in events. """
+        return self.clock() * 1e6
+
+    def active(self):
+        """ True if the current thread is inside a sampled span - i.e. nested events are recorded. """
+        return getattr(self._local, "depth", 0) > 0 and self._local.sampled
+
+    def begin(self, name, cat, args=None):
+        """
+        Open a span - returns a 'Span', or None if not sampled. Every 'begin()' MUST be matched by an 'end()'
+        (also with None) - spans nest per thread, and the outermost one decides about sampling.
+        """
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth == 0:
+            self.no_of_roots += 1
+            local.sampled = self.sample_rate >= 1.0 or self._random() < self.sample_rate
+            if local.sampled:
+                self.no_of_sampled += 1
+                thread = threading.current_thread()
+                self._thread_names.setdefault(thread.ident, thread.name)
+        local.depth = depth + 1
+        if not local.sampled:
+            return None
+        return Span(name, cat, self.now(), args)
+
+    def end(self, span, **args):
+        self._local.depth -= 1
+        if span is None:
+            return
+        if args:
+            span.args = dict(span.args or (), **args)
+        self.complete(span.name, span.cat, span.start, args=span.args)
+
+    @contextlib.contextmanager
+    def span(self, name, cat, **args):
+        """ Context manager version of 'begin()'/'end()' - yields the 'Span', or None if not sampled. """
+        span = self.begin(name, cat, args or None)
+        try:
+            yield span
+        finally:
+            self.end(span)
+
+    def complete(self, name, cat, start, end=None, args=None):
+        """ Record a complete ('X') event from 'start' to 'end' (default: now) - both in microseconds. """
+        if end is None:
+            end = self.now()
+        event = {"name": name, "cat": cat, "ph": "X", "ts": start, "dur": end - start,
+                 "pid": self.pid, "tid": threading.get_ident()}
+        if args:
+            event["args"] = args
+        events = self._events
+        if len(events) == events.maxlen:
+            self.no_of_dropped += 1
+        events.append(event)
+
+    # ****************** GC pauses *******************
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_start = self.now() if self.active() else None
+        elif self._gc_start is not None:
+            self.complete("gc", "gc", self._gc_start,
+                          args={"generation": info["generation"], "collected": info["collected"]})
+            self._gc_start = None
+
+    def install(self):
+        """ Hook into GC (if 'trace_gc') - pauses inside sampled spans are recorded. """
+        if self.trace_gc and self._on_gc not in gc.callbacks:
+            gc.callbacks.append(self._on_gc)
+
+    def uninstall(self):
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+
+    # ****************** Output *******************
+
+    def events(self):
+        """ Recorded events (oldest first) - plus thread-name metadata events. """
+        metadata = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                    for tid, name in self._thread_names.items()]
+        return metadata + list(self._events)
+
+    def clear(self):
+        self._events.clear()
+        self.no_of_dropped = 0
+
+    def trace(self):
+        """ Trace as JSON-serializable dictionary (Chrome trace-event 'JSON object format'). """
+        return {"traceEvents": self.events(), "displayTimeUnit": "ms",
+                "otherData": {"sample_rate": self.sample_rate, "roots": self.no_of_roots,
+                              "sampled_roots": self.no_of_sampled, "dropped_events": self.no_of_dropped}}
+
+    def write(self, target):
+        """ Write trace to a path or (text-)file object. """
+        if hasattr(target, "write"):
+            json.dump(self.trace(), target)
+            return
+        with open(target, "w") as trace_file:
+            json.dump(self.trace(), trace_file)
@@ -0,0 +1,130 @@
+"""
+@file warm_start.py
+@brief Warm-start of a 'Sensors' registry from a snapshot of an already validated registry.
+Cold start replays every sensor spec through JSON parsing, schema validation and 'SensorBuilder' -
+and gives each sensor a fresh UUID. A snapshot file stores the registered sensors as built, including
+their UUIDs (see 'wire_format'):
+    magic b"PSWS" | version (uint16) | schema hash (SHA-256, 32 bytes) | 'wire_format' snapshot stream
+Loading constructs the sensors directly from the stored properties and registers them, which rebuilds the
+bus-occupancy index and bandwidth accounting and binds (opens & configures) their drivers - WITHOUT
+revalidating, and with cyclic garbage collection paused for the bulk load. If the sensor schemas changed since the snapshot was written (schema hash differs),
+the stored properties are instead validated like new specs - keeping the stored UUIDs.
+"""
+
+import gc
+import hashlib
+import json
+import logging
+import os
+import struct
+from collections import namedtuple
+
+from sensor_properties import sensor_props
+from sensor_types.sensor_devices import sensor_base_map, sensor_type_map
+from sensor_utils import wire_format
+from sensor_utils.parallel_import import iter_validated_specs
+
+
+logger = logging.getLogger(__name__)
+
+
+FILE_MAGIC = b"PSWS"
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct("<4sH32s")
+
+# Result of 'load_snapshot()' - 'warm' is False if sensors had to be revalidated, 'errors' lists (alias, reason):
+WarmStartResult = namedtuple("WarmStartResult", ["warm", "no_of_added", "errors"])
+
+
+def schema_hash():
+    """ SHA-256 over the base- and device-specific sensor schemas - changes whenever a schema does. """
+    schemas = {"base": sensor_props.sensor_base_schema, "dev": sensor_props.json_dev_schemas}
+    return hashlib.sha256(json.dumps(schemas, sort_keys=True).encode("utf-8")).digest()
+
+
+def save_snapshot(path, sensors):
+    """
+    Write snapshot of all sensors registered in 'sensors' to file 'path' - replaced atomically,
+    so that a crash while saving leaves the previous snapshot intact. Returns no. of sensors written.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as snapshot_file:
+        snapshot_file.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, schema_hash()))
+        no_of_sensors = wire_format.write_snapshot(snapshot_file, sensors)
+    os.replace(tmp_path, path)
+    return no_of_sensors
+
+
+def _read_header(snapshot_file):
+    data = snapshot_file.read(FILE_HEADER.size)
+    if len(data) != FILE_HEADER.size:
+        raise wire_format.WireFormatError("truncated snapshot file header")
+    magic, version, stored_hash = FILE_HEADER.unpack(data)
+    if magic != FILE_MAGIC:
+        raise wire_format.WireFormatError("not a sensor snapshot file (magic=%r)" % magic)
+    if version != FILE_VERSION:
+        raise wire_format.WireFormatError("unsupported snapshot file version %d (expected %d)" % (version, FILE_VERSION))
+    return stored_hash
+
+
+def _load_warm(snapshot_file, sensors):
+    no_of_added = 0
+    errors = []
+    for sensor in wire_format.iter_snapshot(snapshot_file):
+        error = sensors.register_sensor(sensor)
+        if error is None:
+            no_of_added += 1
+        else:
+            errors.append((sensor.base.alias, error))
+    return WarmStartResult(True, no_of_added, errors)
+
+
+def _load_validated(snapshot_file, sensors, workers):
+    uuids = []
+
+    def iter_specs():
+        for type_name, s_uuid, props in wire_format.iter_snapshot_records(snapshot_file):
+            uuids.append(s_uuid)
+            spec = {"sensor_type": type_name}
+            spec.update(props)
+            yield spec
+    no_of_added = 0
+    errors = []
+    for index, sensor_spec, error in iter_validated_specs(iter_specs(), workers=workers):
+        alias = sensor_spec.get("alias") if isinstance(sensor_spec, dict) else None
+        if error is None:
+            sensor = sensors.build_sensor(sensor_clsname=sensor_type_map[sensor_spec['sensor_type']],
+                                          base_clsname=sensor_base_map[sensor_spec['sensor_type']],
+                                          props=sensor_spec)
+            sensor.base.uuid = uuids[index]
+            error = sensors.register_sensor(sensor)
+        if error is None:
+            no_of_added += 1
+        else:
+            errors.append((alias, error))
+    return WarmStartResult(False, no_of_added, errors)
+
+
+def load_snapshot(path, sensors, workers=1):
+    """
+    Register the sensors of snapshot file 'path' into 'sensors' (a 'Sensors' container).
+    Raises 'wire_format.WireFormatError' if the file is not a (readable) snapshot - e.g. to fall back
+    to a cold start from the sensor specs. 'workers' applies to revalidation only (see 'add_sensors()').
+    """
+    # Loading only allocates (and keeps) objects - cyclic GC passes over the growing registry are pure overhead:
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(path, "rb") as snapshot_file:
+            stored_hash = _read_header(snapshot_file)
+            if stored_hash == schema_hash():
+                result = _load_warm(snapshot_file, sensors)
+            else:
+                logger.warning("sensor schemas changed since snapshot '%s' was written - revalidating sensors", path)
+                result = _load_validated(snapshot_file, sensors, workers)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    for alias, error in result.errors:
+        logger.error("cannot restore sensor '%s' from snapshot - %s!", alias, error)
+    return result
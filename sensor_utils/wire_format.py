@@ -0,0 +1,327 @@
+"""
+@file wire_format.py
+@brief Compact binary encoding of sensor readings and of 'Sensors' registry snapshots - streamed over file objects.
+READINGS stream:
+    header: magic b"PSRD" | version (uint16)
+    frames: no. of bytes (uint32) | no. of readings (uint32) | 'ReadingBatch' records
+Records are the typed, fixed-size records of 'reading_batch' (sensor index, monotonic timestamp, and a float,
+int, ComplexValue or int/float-list value) - so a filled batch is written as-is, without re-encoding.
+SNAPSHOT stream:
+    header: magic b"PSSN" | version (uint16)
+    records: no. of bytes (uint32) | record kind (uint8) | payload
+    shape record: shape-id (uint16) | no. of fields (uint8) | per field: tag (uint8) | name length (uint8) | name
+    sensor record: shape-id (uint16) | sensor type (uint8) | UUID (16 bytes, raw) | fixed-size fields | strings
+A shape - the property names and value types of a sensor - is written once, before the first sensor
+having it; sensors then refer to it by id. Fixed-size values (bool, int64, float64, and uint16 lengths of
+str/bytes values) are packed by ONE struct per shape, with the str/bytes data following - so decoding
+a sensor is one 'unpack_from()' plus slicing. Only plain properties are stored - driver functions,
+driver handles and unset (None) properties are not.
+"""
+
+import struct
+import uuid
+
+from sensor_types.sensor_devices import sensor_base_map, sensor_type_map
+from sensor_utils.reading_batch import ReadingBatch
+
+
+READINGS_MAGIC = b"PSRD"
+SNAPSHOT_MAGIC = b"PSSN"
+VERSION = 1
+
+HEADER = struct.Struct("<4sH")
+FRAME = struct.Struct("<II")
+RECORD_SIZE = struct.Struct("<I")
+RECORD_HEAD = struct.Struct("<IB")
+SHAPE_HEAD = struct.Struct("<HB")
+SHAPE_ID = struct.Struct("<H")
+KIND_SHAPE = 0
+KIND_SENSOR = 1
+
+SENSOR_TYPES = ("i2c", "spi", "uart", "internal")    # append only - index is the type code
+SENSOR_TYPE_CODES = dict((type_name, code) for code, type_name in enumerate(SENSOR_TYPES))
+
+TAG_BOOL, TAG_INT, TAG_FLOAT, TAG_STR, TAG_BYTES = range(5)
+
+# Runtime-only - or, like 'bus_prop1', set by the constructor - attributes; never part of a snapshot:
+NON_PERSISTED_KEYS = ("base", "uuid", "handle", "type_name", "bus_prop1")
+
+
+class WireFormatError(ValueError):
+    pass
+
+
+def _read_exactly(fileobj, size):
+    data = fileobj.read(size)
+    if len(data) != size:
+        raise WireFormatError("truncated stream - expected %d bytes, got %d" % (size, len(data)))
+    return data
+
+
+def _write_header(fileobj, magic):
+    fileobj.write(HEADER.pack(magic, VERSION))
+
+
+def _check_header(fileobj, magic):
+    data = fileobj.read(HEADER.size)
+    if len(data) == 0:
+        return False
+    if len(data) != HEADER.size:
+        raise WireFormatError("truncated stream header")
+    found_magic, version = HEADER.unpack(data)
+    if found_magic != magic:
+        raise WireFormatError("not a %r stream (magic=%r)" % (magic, found_magic))
+    if version != VERSION:
+        raise WireFormatError("unsupported stream version %d (expected %d)" % (version, VERSION))
+    return True
+
+
+# ****************** Readings *******************
+
+def write_readings(fileobj, readings, frame_size=4096):
+    """
+    Write readings - a 'ReadingBatch' (written as ONE frame, as-is), or any iterable of
+    (sensor_idx, timestamp, value) - in frames of up to 'frame_size' readings. Returns no. of readings written.
+    """
+    _write_header(fileobj, READINGS_MAGIC)
+    if isinstance(readings, ReadingBatch):
+        write_reading_frame(fileobj, readings)
+        return len(readings)
+    no_of_readings = 0
+    batch = ReadingBatch()
+    for sensor_idx, timestamp, value in readings:
+        batch.append(sensor_idx, timestamp, value)
+        if batch.count >= frame_size:
+            no_of_readings += write_reading_frame(fileobj, batch)
+            batch = ReadingBatch()
+    if batch.count:
+        no_of_readings += write_reading_frame(fileobj, batch)
+    return no_of_readings
+
+
+def write_reading_frame(fileobj, batch):
+    """ Append one frame (a filled 'ReadingBatch') to a readings stream - e.g. one per sweep. """
+    fileobj.write(FRAME.pack(batch.nbytes, len(batch)))
+    fileobj.write(batch.buffer)
+    return len(batch)
+
+
+def iter_reading_frames(fileobj):
+    """ Yield one 'ReadingBatch' per frame of a readings stream. """
+    if not _check_header(fileobj, READINGS_MAGIC):
+        return
+    while True:
+        data = fileobj.read(FRAME.size)
+        if len(data) == 0:
+            return
+        if len(data) != FRAME.size:
+            raise WireFormatError("truncated frame header")
+        nbytes, count = FRAME.unpack(data)
+        batch = ReadingBatch(buffer=_read_exactly(fileobj, nbytes))
+        batch.count = count
+        yield batch
+
+
+def iter_readings(fileobj):
+    """ Yield 'SensorReading' tuples from a readings stream. """
+    for batch in iter_reading_frames(fileobj):
+        for reading in batch:
+            yield reading
+
+
+# ****************** Registry snapshots *******************
+
+def props_of_sensor(sensor):
+    """ Plain (persistable) properties of a sensor - base and device-specific, as one flat dictionary. """
+    props = {}
+    for obj in (sensor.base, sensor):
+        for key, val in obj.__dict__.items():
+            if val is None or callable(val) or key in NON_PERSISTED_KEYS:
+                continue
+            props[key] = val
+    return props
+
+
+TAG_CODES = {TAG_BOOL: "?", TAG_INT: "q", TAG_FLOAT: "d", TAG_STR: "H", TAG_BYTES: "H"}
+
+
+VALUE_TAGS = {bool: TAG_BOOL, int: TAG_INT, float: TAG_FLOAT, str: TAG_STR, bytes: TAG_BYTES, bytearray: TAG_BYTES}
+
+
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def _value_tag(key, val):
+    tag = VALUE_TAGS.get(type(val))
+    if tag is None:
+        raise WireFormatError("cannot encode property value of type %s" % type(val).__name__)
+    if tag == TAG_INT and not INT64_MIN <= val <= INT64_MAX:
+        raise WireFormatError("cannot encode property '%s' - integer %d out of int64 range" % (key, val))
+    return tag
+
+
+def _uuid_bytes(sensor):
+    sensor_uuid = sensor.base.uuid
+    if not isinstance(sensor_uuid, uuid.UUID):
+        raise WireFormatError("cannot encode sensor UUID of type %s" % type(sensor_uuid).__name__)
+    return sensor_uuid.bytes
+
+
+class Shape:
+    """ Property names and value tags shared by sensors - with the struct packing their fixed-size part. """
+    def __init__(self, shape_id, fields):
+        self.shape_id = shape_id
+        self.fields = fields
+        self.names = tuple(name for name, _ in fields)
+        self.var_fields = tuple(idx for idx, (_, tag) in enumerate(fields) if tag in (TAG_STR, TAG_BYTES))
+        self.str_fields = frozenset(idx for idx, (_, tag) in enumerate(fields) if tag == TAG_STR)
+        self.record = struct.Struct("<HB16s" + "".join(TAG_CODES[tag] for _, tag in fields))
+
+    def definition(self):
+        parts = [SHAPE_HEAD.pack(self.shape_id, len(self.fields))]
+        for name, tag in self.fields:
+            data = name.encode("utf-8")
+            parts.append(bytes((tag, len(data))) + data)
+        return b"".join(parts)
+
+
+class SnapshotWriter:
+    """ Streaming encoder - 'write(sensor)' appends one sensor record (preceded by its shape, if new). """
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.shapes = {}
+        self.no_of_sensors = 0
+        _write_header(fileobj, SNAPSHOT_MAGIC)
+
+    def _write_record(self, kind, payload):
+        self.fileobj.write(RECORD_HEAD.pack(len(payload) + 1, kind))
+        self.fileobj.write(payload)
+
+    def write(self, sensor):
+        props = props_of_sensor(sensor)
+        fields = tuple((key, _value_tag(key, val)) for key, val in props.items())
+        shape = self.shapes.get(fields)
+        if shape is None:
+            if len(self.shapes) > 0xffff:
+                raise WireFormatError("too many distinct sensor shapes in snapshot")
+            shape = self.shapes[fields] = Shape(len(self.shapes), fields)
+            self._write_record(KIND_SHAPE, shape.definition())
+        values = list(props.values())
+        var_data = []
+        for idx in shape.var_fields:
+            data = values[idx].encode("utf-8") if idx in shape.str_fields else bytes(values[idx])
+            values[idx] = len(data)
+            var_data.append(data)
+        payload = shape.record.pack(shape.shape_id, SENSOR_TYPE_CODES[sensor.base.type_name],
+                                    _uuid_bytes(sensor), *values)
+        self._write_record(KIND_SENSOR, payload + b"".join(var_data))
+        self.no_of_sensors += 1
+
+
+def write_snapshot(fileobj, sensors):
+    """ Write snapshot of sensors - a 'Sensors' container, or any iterable of sensor objects. """
+    writer = SnapshotWriter(fileobj)
+    for sensor in getattr(sensors, "sensors", sensors):
+        writer.write(sensor)
+    return writer.no_of_sensors
+
+
+def _decode_shape(payload):
+    shape_id, no_of_fields = SHAPE_HEAD.unpack_from(payload, 0)
+    offset = SHAPE_HEAD.size
+    fields = []
+    for _ in range(no_of_fields):
+        tag, length = payload[offset], payload[offset + 1]
+        if tag not in TAG_CODES:
+            raise WireFormatError("unknown value tag %d" % tag)
+        fields.append((bytes(payload[offset + 2:offset + 2 + length]).decode("utf-8"), tag))
+        offset += 2 + length
+    return Shape(shape_id, tuple(fields))
+
+
+def _decode_sensor(payload, shapes):
+    shape = shapes.get(SHAPE_ID.unpack_from(payload, 0)[0])
+    if shape is None:
+        raise WireFormatError("sensor record refers to undefined shape")
+    values = shape.record.unpack_from(payload, 0)
+    type_code, uuid_bytes = values[1], values[2]
+    values = list(values[3:])
+    offset = shape.record.size
+    for idx in shape.var_fields:
+        length = values[idx]
+        data = bytes(payload[offset:offset + length])
+        values[idx] = data.decode("utf-8") if idx in shape.str_fields else data
+        offset += length
+    return SENSOR_TYPES[type_code], uuid.UUID(bytes=uuid_bytes), dict(zip(shape.names, values))
+
+
+_prototypes = {}
+
+
+def _prototype(type_name):
+    """ Classes and default attributes of a sensor type - taken once from a constructed instance. """
+    prototype = _prototypes.get(type_name)
+    if prototype is None:
+        sensor = sensor_type_map[type_name](base_type=sensor_base_map[type_name])
+        prototype = _prototypes[type_name] = (type(sensor), dict(sensor.__dict__),
+                                              type(sensor.base), dict(sensor.base.__dict__))
+    return prototype
+
+
+def sensor_from_props(type_name, s_uuid, props):
+    """
+    Construct a sensor object directly from its properties - no JSON parsing, validation or builder.
+    Attributes are copied from a per-type prototype, so constructors (and their 'uuid4()') are not run per sensor.
+    """
+    sensor_cls, dev_defaults, base_cls, base_defaults = _prototype(type_name)
+    base = base_cls.__new__(base_cls)
+    base_props = base.__dict__
+    base_props.update(base_defaults)
+    base_props["uuid"] = s_uuid
+    sensor = sensor_cls.__new__(sensor_cls)
+    dev_props = sensor.__dict__
+    dev_props.update(dev_defaults)
+    dev_props["base"] = base
+    for key, val in props.items():
+        if key in base_defaults:
+            base_props[key] = val
+        else:
+            dev_props[key] = val
+    return sensor
+
+
+def iter_snapshot_records(fileobj):
+    """ Yield (type_name, uuid, props) per sensor record of a snapshot stream. """
+    if not _check_header(fileobj, SNAPSHOT_MAGIC):
+        return
+    shapes = {}
+    while True:
+        data = fileobj.read(RECORD_SIZE.size)
+        if len(data) == 0:
+            return
+        if len(data) != RECORD_SIZE.size:
+            raise WireFormatError("truncated record header")
+        record = _read_exactly(fileobj, RECORD_SIZE.unpack(data)[0])
+        kind, payload = record[0], memoryview(record)[1:]
+        if kind == KIND_SENSOR:
+            yield _decode_sensor(payload, shapes)
+        elif kind == KIND_SHAPE:
+            shape = _decode_shape(payload)
+            shapes[shape.shape_id] = shape
+        else:
+            raise WireFormatError("unknown record kind %d" % kind)
+
+
+def iter_snapshot(fileobj):
+    """ Yield sensor objects (without driver bound - see 'Sensors.register_sensor()') from a snapshot stream. """
+    for type_name, s_uuid, props in iter_snapshot_records(fileobj):
+        yield sensor_from_props(type_name, s_uuid, props)
+
+
+def read_snapshot(fileobj, sensors):
+    """ Register all sensors of a snapshot stream into 'sensors' (a 'Sensors' container). Returns no. registered. """
+    no_of_added = 0
+    for sensor in iter_snapshot(fileobj):
+        if sensors.register_sensor(sensor) is None:
+            no_of_added += 1
+    return no_of_added
@@ -0,0 +1,88 @@
+# @file test_async_sensors.py
+
+
+import asyncio
+import time
+import unittest
+#
+from py_sensors import Sensors
+from sensor_drivers.mocked_drivers import get_uart_val, make_slow_async_read
+from sensor_utils.async_sensors import AsyncSensors    # This is the code being tested
+from sensor_utils.read_cache import ReadCache
+
+
+class AsyncSensorsTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.sensors = Sensors()
+        self.sensors.add_sensors([{"sensor_type": "uart", "bus_no": bus_no, "baud_rate": 9600,
+                                   "dev_name": "Hygro", "alias": "async-%d" % bus_no} for bus_no in range(200)])
+        self.sensors.add_sensors([{"sensor_type": "spi", "bus_no": 1, "cs_no": cs_no,
+                                   "dev_name": "SHT721", "alias": "async-spi%d" % cs_no} for cs_no in range(2)])
+        self.async_sensors = AsyncSensors(self.sensors)
+
+    def tearDown(self):
+        pass
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testReadSensorWrapsSyncDriver(self):
+        value = asyncio.run(self.async_sensors.read_sensor("async-spi0"))
+        self.assertEqual(7, value.channel)
+
+    def testReadAllWithNativeCoroutineDrivers(self):
+        for sensor in self.sensors.get_uart_sensors():
+            sensor.base.read = make_slow_async_read(get_uart_val, latency=0.05)
+        start = time.monotonic()
+        values = asyncio.run(self.async_sensors.read_all())
+        self.assertEqual(202, len(values))
+        self.assertEqual([3, 4, 5], values[0])
+        # All UART-sensors are on separate buses - so their reads overlap:
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def testSameBusReadsAreSerialized(self):
+        for sensor in self.sensors.get_spi_sensors():
+            sensor.base.read = make_slow_async_read(get_uart_val, latency=0.05)
+
+        async def read_spi():
+            start = time.monotonic()
+            await asyncio.gather(self.async_sensors.read_sensor("async-spi0"),
+                                 self.async_sensors.read_sensor("async-spi1"))
+            return time.monotonic() - start
+        self.assertGreaterEqual(asyncio.run(read_spi()), 0.1)
+
+    def testAsyncGenerator(self):
+        async def collect():
+            return [item async for item in self.async_sensors.get_sensor_data()]
+        data = asyncio.run(collect())
+        self.assertEqual([sensor.base.alias for sensor in self.sensors.sensors], [name for name, _ in data])
+
+    def testCoroutineReadWithCacheAndMetrics(self):
+        sensor = self.sensors.get_sensor_by_alias("async-0")
+        sensor.base.read = make_slow_async_read(get_uart_val, latency=0.001)
+        read_cache = self.sensors.enable_read_cache(ReadCache(ttl=60.0))
+        metrics = self.sensors.enable_metrics()
+        try:
+            self.assertEqual([3, 4, 5], asyncio.run(self.async_sensors.read_sensor("async-0")))
+            self.assertEqual(1, metrics.metrics_of(sensor).reads)
+            self.assertNotIn(sensor.base.uuid, read_cache.entries)    # coroutine reads are not cached
+        finally:
+            self.sensors.disable_metrics()
+            self.sensors.disable_read_cache()
+
+    # Step 2: negative tests (invalid sensor / invalid actions)
+    # ---------------------------------------------------------
+    def testDriverExceptionIsReturned(self):
+        async def failing_read():
+            raise OSError("device NACK")
+        self.sensors.get_sensor_by_alias("async-1").base.read = failing_read
+        self.assertIsInstance(asyncio.run(self.async_sensors.read_sensor("async-1")), OSError)
+        values = asyncio.run(self.async_sensors.read_all())
+        self.assertIsInstance(values[1], OSError)
+
+    def testReadUnknownSensor(self):
+        self.assertIsNone(asyncio.run(self.async_sensors.read_sensor("non-existent-sensor")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+# @file test_benchmark_suite.py
+
+
+import unittest
+#
+from benchmarks import suite    # This is the code being tested
+
+
+def make_document(us_per_op):
+    return {"params": {}, "results": dict((name, {"us_per_op": value}) for name, value in us_per_op.items())}
+
+
+class BenchmarkSuiteTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testRunSuite(self):
+        params = {"count": 12, "types": ["i2c", "spi"], "latency": 0.0, "sweeps": 1}
+        document = suite.run_suite(params, names=["add_sensors", "lookup_alias", "read_sensors"], repeat=1)
+        self.assertEqual(suite.SUITE_VERSION, document["suite_version"])
+        self.assertEqual(1, document["params"]["repeat"])
+        self.assertEqual(["add_sensors", "lookup_alias", "read_sensors"], list(document["results"]))
+        self.assertEqual(12, document["results"]["read_sensors"]["ops"])
+
+    def testCompareResults(self):
+        baseline = make_document({"a": 10.0, "b": 10.0, "c": 10.0, "gone": 1.0})
+        current = make_document({"a": 10.5, "b": 12.0, "c": 5.0, "new": 1.0})
+        rows = suite.compare_results(baseline, current, threshold=0.1)
+        self.assertEqual([("a", "ok"), ("b", "regression"), ("c", "improvement")],
+                         [(row[0], row[4]) for row in rows])
+
+
+if __name__ == '__main__':
+    unittest.main()
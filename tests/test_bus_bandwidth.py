@@ -0,0 +1,78 @@
+# @file test_bus_bandwidth.py
+
+
+import unittest
+#
+from py_sensors import Sensors
+from sensor_utils.bus_bandwidth import BusBandwidth, wire_time    # This is the code being tested
+
+
+MAX_FLOAT_DIFFERENCE = 0.00001
+
+
+class BusBandwidthTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.sensors = Sensors()
+
+    def tearDown(self):
+        pass
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testWireTime(self):
+        # I2C: start + (address + 2 data bytes) x 9 clocks + stop = 29 clocks:
+        self.assertAlmostEqual(29 / 100000.0, wire_time("i2c", {"clk_speed": 100000}, 2), delta=MAX_FLOAT_DIFFERENCE)
+        # SPI: 4 + 2 x 8 + 4 clocks:
+        self.assertAlmostEqual(24 / 1000000.0, wire_time("spi", {"clk_speed": 1000000, "cycles_before": 4,
+                                                                 "cycles_after": 4, "data_bits": 8}, 2),
+                               delta=MAX_FLOAT_DIFFERENCE)
+        # UART: 8 bytes of (start + 8 data + parity + 2 stop) bits:
+        self.assertAlmostEqual(8 * 12 / 9600.0, wire_time("uart", {"baud_rate": 9600, "data_bits": 8, "parity": True,
+                                                                   "stop_bits": 2}, 8), delta=MAX_FLOAT_DIFFERENCE)
+
+    def testUtilizationReport(self):
+        self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 1, "i2c_addr": 10, "dev_name": "BM280", "alias": "bw-1", "sample_period": 0.001}""")
+        self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 1, "i2c_addr": 11, "dev_name": "BM280", "alias": "bw-2", "sample_period": 0.001, "read_bytes": 6}""")
+        self.sensors.add_sensor("""{"sensor_type": "spi", "bus_no": 1, "cs_no": 0, "dev_name": "SHT721", "alias": "bw-3"}""")
+        report = self.sensors.bus_utilization()
+        self.assertEqual(("i2c", 1), report[0]["bus"])
+        self.assertEqual(2, report[0]["sensors"])
+        # (29 + 65 clocks at 100 kHz) per ms:
+        self.assertAlmostEqual(0.94, report[0]["utilization"], delta=MAX_FLOAT_DIFFERENCE)
+        self.assertEqual(True, report[0]["warning"])
+        self.assertEqual(False, report[0]["saturated"])
+        self.assertEqual(("spi", 1), report[1]["bus"])
+        #
+        self.sensors.remove_sensor(s_alias="bw-2")
+        self.assertAlmostEqual(0.29, self.sensors.bus_utilization()[0]["utilization"], delta=MAX_FLOAT_DIFFERENCE)
+
+    def testWarnNearSaturation(self):
+        with self.assertLogs("sensor_utils.bus_bandwidth", level="WARNING"):
+            status = self.sensors.add_sensor("""{"sensor_type": "uart", "bus_no": 3, "baud_rate": 9600, "dev_name": "GPS", "alias": "bw-uart", "sample_period": 0.01}""")
+        self.assertEqual(True, status)
+
+    # Step 2: negative tests (invalid sensor / invalid actions)
+    # ---------------------------------------------------------
+    def testRejectOversubscription(self):
+        self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 1, "i2c_addr": 10, "dev_name": "BM280", "alias": "bw-1", "sample_period": 0.0005}""")
+        status = self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 1, "i2c_addr": 11, "dev_name": "BM280", "alias": "bw-2", "sample_period": 0.0005}""")
+        self.assertEqual(False, status)
+        self.assertEqual(1, len(self.sensors.sensors))
+        report = self.sensors.add_sensors([{"sensor_type": "i2c", "bus_no": 1, "i2c_addr": 12, "dev_name": "BM280",
+                                            "alias": "bw-3", "clk_speed": 100000, "sample_period": 0.0005}])
+        self.assertIn("oversubscribed", report[0]["error"])
+        # Same sensor fits on a fast bus:
+        status = self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 11, "dev_name": "BM280", "alias": "bw-2", "sample_period": 0.0005, "clk_speed": 400000}""")
+        self.assertEqual(True, status)
+
+    def testWarnOnlyPolicy(self):
+        sensors = Sensors(bandwidth=BusBandwidth(max_utilization=None))
+        for addr in (10, 11):
+            status = sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 1, "i2c_addr": %d, "dev_name": "BM280", "alias": "bw-%d", "sample_period": 0.0005}""" % (addr, addr))
+            self.assertEqual(True, status)
+        self.assertEqual(True, sensors.bus_utilization()[0]["saturated"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+# @file test_bus_batching.py
+
+
+import unittest
+#
+from py_sensors import Sensors
+from sensor_drivers.driver_registry import drivers
+from sensor_drivers.simulated_bus import SimulatedBackend
+from sensor_utils.bus_batching import BatchStats, plan_bus_batches, read_batched    # This is the code being tested
+
+
+def failing_read():
+    raise OSError("device NACK")
+
+
+class BusBatchingTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.backend = SimulatedBackend(transaction_time=0.001, realtime=False)
+        for sensor_type in ("i2c", "spi"):
+            drivers.register(sensor_type, self.backend, dev_name="SIM-DEV")
+        self.sensors = Sensors()
+        # Added out of address order, on two I2C buses and one SPI bus:
+        for bus_no, addr in ((1, 0x30), (1, 0x10), (2, 0x10), (1, 0x20)):
+            self.backend.attach("i2c", bus_no, addr, read=lambda value=float(bus_no * 1000 + addr): value)
+            self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": %d, "i2c_addr": %d, "dev_name": "SIM-DEV",
+                                        "alias": "i2c-%d-%d"}""" % (bus_no, addr, bus_no, addr))
+        for cs_no in (2, 0):
+            self.backend.attach("spi", 0, cs_no, read=lambda value=float(cs_no): value)
+            self.sensors.add_sensor("""{"sensor_type": "spi", "bus_no": 0, "cs_no": %d, "dev_name": "SIM-DEV",
+                                        "alias": "spi-%d"}""" % (cs_no, cs_no))
+        # Function driver (no 'read_many()') on same I2C bus:
+        self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 1, "i2c_addr": 64, "dev_name": "BM280", "alias": "plain"}""")
+
+    def tearDown(self):
+        self.sensors.disable_metrics()
+        for sensor_type in ("i2c", "spi"):
+            drivers.unregister(sensor_type, dev_name="SIM-DEV")
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testPlanGroupsByBusInAddressOrder(self):
+        batches = plan_bus_batches(self.sensors.sensors)
+        aliases = [[sensor.base.alias for _, sensor in batch] for batch in batches]
+        self.assertEqual([["i2c-1-16", "i2c-1-32", "i2c-1-48"], ["i2c-2-16"], ["spi-0", "spi-2"], ["plain"]], aliases)
+
+    def testBatchedReadMatchesSequentialRead(self):
+        expected = self.sensors.read_sensors()
+        self.backend.buses[("i2c", 1)].no_of_transactions = 0
+        self.assertEqual(expected, self.sensors.read_sensors_batched())
+        # 3 sensors on I2C bus 1 read in ONE transaction:
+        self.assertEqual(1, self.backend.buses[("i2c", 1)].no_of_transactions)
+        stats = self.sensors.batch_stats
+        self.assertEqual(7, stats.no_of_reads)
+        self.assertEqual(2, stats.no_of_batches)          # I2C bus 1, SPI bus 0
+        self.assertEqual(2, stats.no_of_single_reads)     # lone sensor on I2C bus 2, function driver
+
+    def testBatchingSavesTransactionOverhead(self):
+        config_time = self.backend.busy_time
+        self.sensors.read_sensors()
+        sequential_time = self.backend.busy_time - config_time
+        self.sensors.read_sensors_batched()
+        batched_time = self.backend.busy_time - config_time - sequential_time
+        # Overhead paid per transaction: 6 simulated reads one by one, against 3 transactions batched:
+        self.assertAlmostEqual(0.003, sequential_time - batched_time, places=6)
+
+    def testBatchedReadsInMetrics(self):
+        self.backend.buses[("i2c", 1)].devices[0x20] = failing_read
+        metrics = self.sensors.enable_metrics()
+        self.sensors.read_sensors_batched()
+        for sensor in self.sensors.sensors:
+            sensor_metrics = metrics.metrics_of(sensor)
+            self.assertEqual(1, sensor_metrics.reads, sensor.base.alias)
+            self.assertEqual(1, sensor_metrics.read_latency.count, sensor.base.alias)
+            self.assertEqual(1 if sensor.base.alias == "i2c-1-32" else 0, sensor_metrics.errors, sensor.base.alias)
+
+    # Step 2: negative tests (invalid sensor / invalid actions)
+    # ---------------------------------------------------------
+    def testFailingDeviceSplitOut(self):
+        self.backend.buses[("i2c", 1)].devices[0x20] = failing_read
+        stats = BatchStats()
+        values = read_batched(self.sensors.sensors, stats)
+        self.assertIsInstance(values[3], OSError)
+        self.assertEqual(1048.0, values[0])
+        self.assertEqual(1, stats.no_of_errors)
+
+
+if __name__ == '__main__':
+    unittest.main()
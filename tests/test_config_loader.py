@@ -0,0 +1,89 @@
+# @file test_config_loader.py
+
+
+import io
+import itertools
+import json
+import unittest
+#
+from py_sensors import Sensors
+from sensor_utils.config_loader import iter_json_specs, load_sensor_config    # This is the code being tested
+
+
+SPECS = [{"sensor_type": "spi", "bus_no": 1, "cs_no": cs_no, "dev_name": "SHT721", "alias": "cfg-%d" % cs_no}
+         for cs_no in range(6)]
+
+
+class ConfigLoaderTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.sensors = Sensors()
+
+    def tearDown(self):
+        pass
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testNdjson(self):
+        text = "\n".join(json.dumps(spec) for spec in SPECS) + "\n"
+        items = list(iter_json_specs(io.StringIO(text), chunk_size=7))
+        self.assertEqual([1, 2, 3, 4, 5, 6], [line_no for line_no, _ in items])
+        self.assertEqual(SPECS[3], json.loads(items[3][1]))
+
+    def testJsonArraySmallChunks(self):
+        text = "  [\n" + ",\n".join(json.dumps(spec) for spec in SPECS) + "\n]\n"
+        items = list(iter_json_specs(io.StringIO(text), chunk_size=5))
+        self.assertEqual(SPECS, [spec for _, spec in items])
+        self.assertEqual([2, 3, 4, 5, 6, 7], [line_no for line_no, _ in items])
+
+    def testLoadAndRegister(self):
+        text = "[" + ", ".join(json.dumps(spec) for spec in SPECS) + "]"
+        summary = load_sensor_config(self.sensors, io.StringIO(text))
+        self.assertEqual({"specs": 6, "added": 6, "failed": 0, "errors": []}, summary)
+        self.assertEqual(6, len(self.sensors.sensors))
+
+    def testValidateOnly(self):
+        text = "\n".join(json.dumps(spec) for spec in SPECS)
+        summary = load_sensor_config(self.sensors, io.StringIO(text), register=False)
+        self.assertEqual(0, summary["failed"])
+        self.assertEqual(0, len(self.sensors.sensors))
+
+    # Step 2: negative tests (invalid sensor / invalid actions)
+    # ---------------------------------------------------------
+    def testErrorsReportedWithLineNumbers(self):
+        lines = [json.dumps(SPECS[0]),
+                 json.dumps({"sensor_type": "spi", "bus_no": 1, "dev_name": "SHT721", "alias": "no-cs"}),
+                 "{broken",
+                 json.dumps(SPECS[0])]
+        summary = load_sensor_config(self.sensors, io.StringIO("\n".join(lines)))
+        self.assertEqual(1, summary["added"])
+        self.assertEqual(3, summary["failed"])
+        self.assertEqual([2, 3, 4], [line_no for line_no, _, _ in summary["errors"]])
+        self.assertEqual("no-cs", summary["errors"][0][1])
+
+    def testMalformedElementNotBufferedToEof(self):
+        consumed = []
+
+        class TrackingReader(io.StringIO):
+            def read(self, size=-1):
+                chunk = super().read(size)
+                consumed.append(len(chunk))
+                return chunk
+        good = ",\n".join(json.dumps(spec) for spec in SPECS)
+        text = "[\n" + good + ",\n{broken: 1},\n" + ",\n".join([good] * 200) + "\n]"
+        items = iter_json_specs(TrackingReader(text), chunk_size=64, max_element_size=256)
+        self.assertEqual(SPECS, [spec for _, spec in itertools.islice(items, len(SPECS))])
+        with self.assertRaisesRegex(ValueError, "line 8"):
+            next(items)
+        # Only input up to (about) the element size cap past the malformed element was read:
+        self.assertLess(sum(consumed), len(text) // 10)
+
+    def testTruncatedArray(self):
+        text = "[" + json.dumps(SPECS[0]) + ", {\"sensor_type\": "
+        summary = load_sensor_config(self.sensors, io.StringIO(text), register=False)
+        self.assertEqual(2, summary["specs"])
+        self.assertEqual(1, summary["failed"])
+
+
+if __name__ == '__main__':
+    unittest.main()
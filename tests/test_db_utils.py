@@ -0,0 +1,106 @@
+# @file test_db_utils.py
+
+
+import os
+import tempfile
+import unittest
+#
+from py_sensors import Sensors
+from sensor_properties.sensor_props import ComplexValue
+from sensor_utils import db_utils    # This is the code being tested
+
+
+SPECS = [{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "dev_name": "BM280", "alias": "db-i2c"},
+         {"sensor_type": "spi", "bus_no": 1, "cs_no": 3, "dev_name": "SHT721", "alias": "db-spi"},
+         {"sensor_type": "uart", "bus_no": 4, "baud_rate": 9600, "dev_name": "Hygro", "alias": "db-uart"}]
+
+
+class DbUtilsTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "sensors.db")
+        self.db = db_utils.connect_to_db("sqlite:///%s" % self.db_path)
+        self.sensors = Sensors()
+        self.sensors.add_sensors(SPECS)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp_dir.cleanup()
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testConnectionStringIsHonored(self):
+        db_utils.insert_sensors(self.db, self.sensors.sensors)
+        self.assertEqual(True, os.path.exists(self.db_path))
+        other_db = db_utils.connect_to_db("sqlite:///%s" % self.db_path)
+        self.assertEqual(3, other_db[db_utils.SENSORS_TABLE].count())
+        other_db.close()
+
+    def testWalMode(self):
+        self.assertEqual("wal", next(iter(self.db.query("PRAGMA journal_mode")))["journal_mode"])
+
+    def testInsertSensorsStoresDeviceProperties(self):
+        db_utils.insert_sensors(self.db, self.sensors.sensors)
+        row = db_utils.find_sensor_by_alias(self.db, "db-spi")
+        self.assertEqual(3, row["cs_no"])
+        self.assertEqual(self.sensors.get_sensor_by_alias("db-spi").base.uuid.bytes_le, row["uuid"])
+
+    def testInsertReadings(self):
+        readings = [(0, 1.0, 1.5), (1, 2.0, ComplexValue(True, 7, 8.5)), (2, 3.0, [3, 4, 5])]
+        self.assertEqual(3, db_utils.insert_readings(self.db, readings))
+        rows = list(self.db[db_utils.READINGS_TABLE].find(order_by="ts"))
+        self.assertEqual(1.5, rows[0]["value"])
+        self.assertEqual((8.5, 7, True), (rows[1]["value"], rows[1]["channel"], rows[1]["triggered"]))
+        self.assertEqual("[3, 4, 5]", rows[2]["items"])
+
+    def testBackgroundWriterFlushesBySize(self):
+        writer = db_utils.ReadingWriter(self.db, max_batch=100, max_delay=10.0)
+        writer.write_many([(0, float(idx), 1.0) for idx in range(250)])
+        writer.close()
+        self.assertEqual(250, writer.no_of_written)
+        self.assertEqual(250, self.db[db_utils.READINGS_TABLE].count())
+
+    def testInMemoryDbSharedWithWriterThread(self):
+        db = db_utils.connect_to_db("sqlite:///:memory:")
+        writer = db_utils.ReadingWriter(db, max_delay=0.01)
+        writer.write((0, 1.0, 1.0))
+        writer.close()
+        self.assertEqual(1, db[db_utils.READINGS_TABLE].count())
+
+    def testSensorIndexesCreated(self):
+        db_utils.insert_sensors(self.db, self.sensors.sensors)
+        index_sql = [row["sql"] for row in self.db.query("SELECT sql FROM sqlite_master WHERE type='index'")]
+        for column in db_utils.SENSORS_INDEXED_COLUMNS:
+            self.assertEqual(True, any("(%s)" % column in sql for sql in index_sql))
+
+    def testKeysetPagination(self):
+        more_sensors = Sensors()
+        more_sensors.add_sensors([{"sensor_type": "spi", "bus_no": bus_no, "cs_no": cs_no, "dev_name": "SHT721",
+                                   "alias": "page-%d-%d" % (bus_no, cs_no)} for bus_no in range(5) for cs_no in range(5)])
+        db_utils.insert_sensors(self.db, self.sensors.sensors + more_sensors.sensors)
+        rows = list(db_utils.load_sensors_from_db(self.db, page_size=4))
+        self.assertEqual(28, len(rows))
+        self.assertEqual(list(range(1, 29)), [row["id"] for row in rows])
+        spi_rows = list(db_utils.find_sensor_by_type(self.db, "spi", page_size=7))
+        self.assertEqual(26, len(spi_rows))
+
+    def testRebuildSensorsFromRows(self):
+        db_utils.insert_sensors(self.db, self.sensors.sensors)
+        rebuilt = Sensors()
+        self.assertEqual(3, db_utils.rebuild_sensors(db_utils.load_sensors_from_db(self.db, page_size=2), rebuilt))
+        original = self.sensors.get_sensor_by_alias("db-spi")
+        sensor = rebuilt.get_sensor_by_uuid(original.base.uuid)
+        self.assertEqual("db-spi", sensor.base.alias)
+        self.assertEqual((1, 3), (sensor.base.bus_no, sensor.cs_no))
+        self.assertEqual(9600, rebuilt.get_sensor_by_alias("db-uart").baud_rate)
+        self.assertEqual(False, hasattr(rebuilt.get_sensor_by_alias("db-i2c"), "cs_no"))
+
+    # Step 2: negative tests (invalid sensor / invalid actions)
+    # ---------------------------------------------------------
+    def testNoConnectionString(self):
+        self.assertIsNone(db_utils.connect_to_db())
+
+
+if __name__ == '__main__':
+    unittest.main()
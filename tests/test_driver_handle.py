@@ -0,0 +1,80 @@
+# @file test_driver_handle.py
+
+
+import unittest
+#
+from py_sensors import Sensors
+from sensor_drivers.driver_registry import SensorDriver, drivers
+from sensor_drivers.simulated_bus import SimulatedBackend    # This is the code being tested
+
+
+class DriverHandleTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.backend = SimulatedBackend()
+        for sensor_type in ("i2c", "spi", "uart"):
+            drivers.register(sensor_type, self.backend, dev_name="SIM-DEV")
+        self.sensors = Sensors()
+
+    def tearDown(self):
+        for sensor_type in ("i2c", "spi", "uart"):
+            drivers.unregister(sensor_type, dev_name="SIM-DEV")
+        drivers.unregister("i2c", dev_name="FUNC-DEV")
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testReadsDispatchToBusAddress(self):
+        self.backend.attach("i2c", 2, 0x40, read=lambda: 1.5)
+        self.backend.attach("i2c", 2, 0x41, read=lambda: 2.5)
+        self.backend.attach("spi", 1, 3, read=lambda: 3.5)
+        self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 64, "dev_name": "SIM-DEV", "alias": "sim-1"}""")
+        self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 65, "dev_name": "SIM-DEV", "alias": "sim-2"}""")
+        self.sensors.add_sensor("""{"sensor_type": "spi", "bus_no": 1, "cs_no": 3, "dev_name": "SIM-DEV", "alias": "sim-3"}""")
+        self.assertEqual([1.5, 2.5, 3.5], self.sensors.read_sensors())
+
+    def testHandleOpenedAndConfiguredOnce(self):
+        self.backend.attach("i2c", 2, 0x40, read=lambda: 1.5)
+        self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 64, "clk_speed": 400000, "dev_name": "SIM-DEV", "alias": "sim-1"}""")
+        for _ in range(10):
+            self.sensors.read_sensors()
+        bus = self.backend.bus("i2c", 2)
+        self.assertEqual(1, bus.no_of_opens)
+        self.assertEqual(11, bus.no_of_transactions)   # 1 config + 10 reads
+        self.assertEqual(400000, bus.settings[0x40]["clk_speed"])
+        self.assertEqual(2, bus.settings[0x40]["bus_no"])
+
+    def testUartHandle(self):
+        self.backend.attach("uart", 4, read=lambda: [1, 2, 3])
+        self.sensors.add_sensor("""{"sensor_type": "uart", "bus_no": 4, "baud_rate": 9600, "dev_name": "SIM-DEV", "alias": "sim-uart"}""")
+        self.assertEqual([[1, 2, 3]], self.sensors.read_sensors())
+        self.assertEqual(9600, self.backend.bus("uart", 4).settings[None]["baud_rate"])
+
+    def testRemoveSensorClosesHandle(self):
+        self.backend.attach("i2c", 2, 0x40, read=lambda: 1.5)
+        self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 64, "dev_name": "SIM-DEV", "alias": "sim-1"}""")
+        sensor = self.sensors.get_sensor_by_alias("sim-1")
+        self.assertEqual(1, self.backend.bus("i2c", 2).no_of_open_handles)
+        self.assertEqual(True, self.sensors.remove_sensor(s_alias="sim-1"))
+        self.assertEqual(0, self.backend.bus("i2c", 2).no_of_open_handles)
+        self.assertIsNone(sensor.base.read)
+
+    def testFunctionDriverConfiguredWithBuiltParameters(self):
+        config_calls = []
+        driver = SensorDriver(read=lambda: 9.0, config=lambda bus_no, i2c_addr: config_calls.append((bus_no, i2c_addr)))
+        drivers.register("i2c", driver, dev_name="FUNC-DEV")
+        self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 3, "i2c_addr": 17, "dev_name": "FUNC-DEV", "alias": "func-1"}""")
+        self.assertEqual([(3, 17)], config_calls)
+        self.assertEqual([9.0], self.sensors.read_sensors())
+
+    # Step 2: negative tests (invalid sensor / invalid actions)
+    # ---------------------------------------------------------
+    def testNoDeviceAtAddress(self):
+        status = self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 66, "dev_name": "SIM-DEV", "alias": "sim-1"}""")
+        self.assertEqual(False, status)
+        self.assertEqual(0, len(self.sensors.sensors))
+        report = self.sensors.add_sensors([{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 66, "dev_name": "SIM-DEV", "alias": "sim-1"}])
+        self.assertIn("opening driver failed", report[0]["error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+# @file test_driver_registry.py
+
+
+import os
+import sys
+import tempfile
+import unittest
+from importlib import metadata
+from unittest import mock
+#
+from py_sensors import Sensors
+from sensor_drivers import generic_drivers
+from sensor_drivers.driver_registry import DriverRegistry, SensorDriver, drivers    # This is the code being tested
+
+
+def read_bm280():
+    return 42.0
+
+
+class DriverRegistryTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.registry = DriverRegistry()
+        self.registry.set_default("i2c", "sensor_drivers.generic_drivers:i2c_driver")
+
+    def tearDown(self):
+        drivers.unregister("i2c", dev_name="BM280-TEST")
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testDefaultDriver(self):
+        self.assertIs(generic_drivers.i2c_driver, self.registry.get("i2c"))
+        # Unknown device falls back to type-generic driver:
+        self.assertIs(generic_drivers.i2c_driver, self.registry.get("i2c", "SOME-DEVICE"))
+
+    def testDeviceSpecificDriver(self):
+        bm280_driver = SensorDriver(read=read_bm280)
+        self.registry.register("i2c", bm280_driver, dev_name="BM280")
+        self.assertIs(bm280_driver, self.registry.get("i2c", "BM280"))
+        self.assertIs(generic_drivers.i2c_driver, self.registry.get("i2c", "SHT721"))
+        self.assertEqual(True, self.registry.unregister("i2c", dev_name="BM280"))
+        self.assertIs(generic_drivers.i2c_driver, self.registry.get("i2c", "BM280"))
+
+    def testDriverModuleLoadedLazily(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, "lazy_test_driver.py"), "w") as driver_file:
+                driver_file.write("def read():\n    return 7.0\n")
+            sys.path.insert(0, tmp_dir)
+            try:
+                self.registry.register("i2c", "lazy_test_driver", dev_name="LAZY")
+                self.assertNotIn("lazy_test_driver", sys.modules)
+                self.assertEqual(False, self.registry.is_loaded("i2c", "LAZY"))
+                driver = self.registry.get("i2c", "LAZY")
+                self.assertIn("lazy_test_driver", sys.modules)
+                self.assertEqual(7.0, driver.read())
+                self.assertEqual(True, self.registry.is_loaded("i2c", "LAZY"))
+            finally:
+                sys.path.remove(tmp_dir)
+                sys.modules.pop("lazy_test_driver", None)
+
+    def testEntryPointDriver(self):
+        entry_point = metadata.EntryPoint(name="i2c.BM280", value="sensor_drivers.generic_drivers:spi_driver",
+                                          group="py_sensors.drivers")
+        with mock.patch.object(metadata, "entry_points", return_value=[entry_point]):
+            registry = DriverRegistry()
+            self.assertIs(generic_drivers.spi_driver, registry.get("i2c", "BM280"))
+        # Explicit registration wins over entry point:
+        self.registry.register("i2c", "sensor_drivers.generic_drivers:i2c_driver", dev_name="BM280")
+        self.assertIs(generic_drivers.i2c_driver, self.registry.get("i2c", "BM280"))
+
+    def testSensorUsesDeviceSpecificDriver(self):
+        drivers.register("i2c", SensorDriver(read=read_bm280), dev_name="BM280-TEST")
+        sensors = Sensors()
+        sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 10, "dev_name": "BM280-TEST", "alias": "drv-1"}""")
+        sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 11, "dev_name": "BM280", "alias": "drv-2"}""")
+        self.assertEqual([42.0, generic_drivers.get_i2c_val()], sensors.read_sensors())
+
+    # Step 2: negative tests (invalid sensor / invalid actions)
+    # ---------------------------------------------------------
+    def testNoDriverFound(self):
+        self.assertIsNone(self.registry.get("can"))
+        self.assertEqual(False, self.registry.unregister("can"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# @file test_json_utils.py
+
+
+import unittest
+#
+from sensor_properties import sensor_props
+from sensor_utils.json_utils import JsonValidator, compile_flat_schema, get_validator    # This is the code being tested
+
+
+SPECS = [
+    {"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "dev_name": "BM280", "alias": "RHT-sensor1"},
+    {"sensor_type": "i2c", "i2c_addr": 78, "dev_name": "BM280", "alias": "RHT-sensor1"},
+    {"sensor_type": "spi", "bus_no": True, "cs_no": 1.0, "dev_name": 7, "alias": "x", "msb_first": "yes"},
+    {"sensor_type": "uart", "bus_no": 4, "baud_rate": 9600, "parity": False, "stop_bits": 2, "sample_period": 1},
+    {"sensor_type": "spi", "bus_no": 1, "cs_no": 3, "pwr_control": True, "sample_period": 0.25},
+    {},
+]
+
+
+class JsonUtilsTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.schemas = [sensor_props.sensor_base_schema] + list(sensor_props.json_dev_schemas.values())
+
+    def tearDown(self):
+        pass
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testValidatorIsCompiledOnce(self):
+        first = JsonValidator(sensor_props.sensor_base_schema)
+        second = JsonValidator(sensor_props.sensor_base_schema)
+        self.assertIs(first.validator, second.validator)
+        self.assertIs(first.fast_check, second.fast_check)
+
+    def testFastPathAgreesWithJsonSchema(self):
+        for schema in self.schemas:
+            fast_validator = JsonValidator(schema)
+            slow_validator = JsonValidator(schema, fast_path=False)
+            self.assertIsNotNone(fast_validator.fast_check)
+            for spec in SPECS:
+                self.assertEqual(sorted(slow_validator.errors(spec)), sorted(fast_validator.errors(spec)))
+                self.assertEqual(slow_validator.check(spec), fast_validator.check(spec))
+
+    def testAllErrorsCollected(self):
+        validator = JsonValidator(sensor_props.sensor_base_schema)
+        self.assertEqual(3, len(validator.errors({"sensor_type": 1, "bus_no": "2", "alias": "a"})))
+
+    # Step 2: negative tests (invalid sensor / invalid actions)
+    # ---------------------------------------------------------
+    def testNonFlatSchemaHasNoFastPath(self):
+        nested_schema = {"type": "object", "properties": {"limits": {"type": "object", "properties": {}}}}
+        self.assertIsNone(compile_flat_schema(nested_schema))
+        self.assertIsNone(compile_flat_schema({"type": "object", "additionalProperties": False}))
+        self.assertIsNone(get_validator(nested_schema)[1])
+
+    def testNonObjectInput(self):
+        validator = JsonValidator(sensor_props.sensor_base_schema)
+        self.assertEqual(False, validator.check([1, 2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+# @file test_mmap_driver.py
+
+
+import io
+import json
+import mmap
+import os
+import tempfile
+import unittest
+#
+import numpy as np
+#
+from py_sensors import Sensors
+from sensor_drivers import mmap_driver    # This is the code being tested
+from sensor_utils import wire_format
+
+
+# Register block at the second page of the (test) file - result registers 16 bytes into it:
+DEV_ADDR = mmap.ALLOCATIONGRANULARITY
+REG_OFFSET = 16
+ADC_VALUES = [101, 202, 303, 404]
+
+
+class MmapDriverTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.mem_path = os.path.join(self.tmp_dir.name, "regs.bin")
+        with open(self.mem_path, "wb") as mem_file:
+            mem_file.write(bytes(2 * mmap.ALLOCATIONGRANULARITY))
+        self.write_registers(ADC_VALUES)
+        self.spec = {"sensor_type": "internal", "dev_no": 0, "dev_addr": DEV_ADDR, "reg_offset": REG_OFFSET,
+                     "channels": len(ADC_VALUES), "mem_path": self.mem_path, "dev_name": "ADC0", "alias": "adc0"}
+        self.sensors = Sensors(sensors=[])
+        self.handles = []
+
+    def tearDown(self):
+        for sensor in self.sensors.sensors:
+            sensor.release_driver()
+        for handle in self.handles:
+            handle.close()
+        self.tmp_dir.cleanup()
+
+    def write_registers(self, values):
+        with open(self.mem_path, "r+b") as mem_file:
+            mem_file.seek(DEV_ADDR + REG_OFFSET)
+            mem_file.write(np.array(values, dtype="<u2").tobytes())
+
+    def open_handle(self, **params):
+        params = dict({"dev_addr": DEV_ADDR, "reg_offset": REG_OFFSET, "channels": len(ADC_VALUES),
+                       "mem_path": self.mem_path}, **params)
+        handle = mmap_driver.mmap_driver.open("internal", params)
+        self.handles.append(handle)
+        return handle
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testAddInternalSensor(self):
+        self.assertTrue(self.sensors.add_sensor(json.dumps(self.spec)))
+        sensor = self.sensors.get_sensor_by_alias("adc0")
+        self.assertEqual("internal", sensor.type_name)
+        self.assertEqual(0, sensor.base.bus_no)
+        self.assertEqual(ADC_VALUES, sensor.base.read())
+        self.assertEqual([ADC_VALUES], self.sensors.read_sensors())
+
+    def testReadsAreLive(self):
+        handle = self.open_handle()
+        view, array = handle.view, handle.array
+        self.write_registers([1, 2, 3, 4])
+        self.assertEqual([1, 2, 3, 4], handle.read())
+        self.assertEqual([1, 2, 3, 4], view.tolist())
+        self.assertEqual([1, 2, 3, 4], array.tolist())
+
+    def testSingleChannel(self):
+        handle = self.open_handle(channels=1)
+        self.assertEqual(ADC_VALUES[0], handle.read())
+
+    def testSampleType(self):
+        handle = self.open_handle(channels=2, sample_type="<u4")
+        self.assertEqual([101 + (202 << 16), 303 + (404 << 16)], handle.read())
+
+    def testReadInto(self):
+        handle = self.open_handle()
+        out = np.zeros(len(ADC_VALUES), dtype=np.float64)
+        self.assertIs(out, handle.read_into(out))
+        self.assertEqual(ADC_VALUES, out.tolist())
+        block = np.zeros((3, len(ADC_VALUES)), dtype=np.uint16)
+        handle.read_block(block)
+        self.assertEqual([ADC_VALUES] * 3, block.tolist())
+
+    def testMapRegion(self):
+        # File or /dev/mem: mapping starts at the page holding the registers:
+        self.assertEqual((DEV_ADDR, REG_OFFSET + 8),
+                         mmap_driver.map_region({"dev_addr": DEV_ADDR + 8, "reg_offset": REG_OFFSET}))
+        # UIO: map no. N at offset N * page-size - registers at 'reg_offset' within it:
+        self.assertEqual((mmap.PAGESIZE, REG_OFFSET),
+                         mmap_driver.map_region({"mem_path": "/dev/uio0", "uio_map": 1, "reg_offset": REG_OFFSET,
+                                                 "dev_addr": 0xfe000000}))
+
+    def testSnapshotRoundTrip(self):
+        self.assertTrue(self.sensors.add_sensor(json.dumps(self.spec)))
+        stream = io.BytesIO()
+        wire_format.write_snapshot(stream, self.sensors.sensors)
+        stream.seek(0)
+        restored = Sensors(sensors=[])
+        self.assertEqual(1, wire_format.read_snapshot(stream, restored))
+        self.assertEqual(ADC_VALUES, restored.sensors[0].base.read())
+        restored.sensors[0].release_driver()
+
+    # Step 2: negative tests (invalid sensor / invalid action)
+    # --------------------------------------------------------
+    def testRegisterBlockInUse(self):
+        self.assertTrue(self.sensors.add_sensor(json.dumps(self.spec)))
+        self.assertFalse(self.sensors.add_sensor(json.dumps(dict(self.spec, alias="adc0-copy"))))
+
+    def testMissingDevAddr(self):
+        spec = dict(self.spec)
+        del spec["dev_addr"]
+        self.assertFalse(self.sensors.add_sensor(json.dumps(spec)))
+
+    def testBlockBeyondFile(self):
+        with self.assertRaises(OSError):
+            self.open_handle(dev_addr=2 * mmap.ALLOCATIONGRANULARITY)
+        self.assertFalse(self.sensors.add_sensor(json.dumps(dict(self.spec, dev_addr=4 * DEV_ADDR))))
+
+    def testReadAfterClose(self):
+        handle = self.open_handle()
+        handle.close()
+        with self.assertRaises(OSError):
+            handle.read()
+        handle.close()    # no-op
+
+
+if __name__ == '__main__':
+    unittest.main()
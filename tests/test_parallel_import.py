@@ -0,0 +1,55 @@
+# @file test_parallel_import.py
+
+
+import json
+import unittest
+#
+from py_sensors import Sensors
+from sensor_utils.parallel_import import iter_validated_specs    # This is the code being tested
+
+
+SPECS = [json.dumps({"sensor_type": "spi", "bus_no": idx // 8, "cs_no": idx % 8, "dev_name": "SHT721",
+                     "alias": "par-%d" % idx}) for idx in range(40)]
+
+
+class ParallelImportTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.sensors = Sensors()
+
+    def tearDown(self):
+        pass
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testRecordsInInputOrder(self):
+        records = list(iter_validated_specs(SPECS, workers=2, shard_size=3))
+        self.assertEqual(list(range(40)), [index for index, _, _ in records])
+        self.assertEqual("par-17", records[17][1]["alias"])
+        self.assertEqual([None] * 40, [error for _, _, error in records])
+
+    def testSerialValidationStreams(self):
+        consumed = []
+
+        def spec_stream():
+            for spec in SPECS:
+                consumed.append(spec)
+                yield spec
+        records = iter_validated_specs(spec_stream())
+        index, sensor_spec, error = next(records)
+        self.assertEqual((0, "par-0", None), (index, sensor_spec["alias"], error))
+        self.assertEqual(1, len(consumed))
+
+    def testParallelAddSensorsMatchesSerial(self):
+        specs = SPECS + ["""{"sensor_type": "spi", "bus_no": 0, "cs_no": 0, "dev_name": "SHT721", "alias": "dup"}""",
+                         """{"sensor_type": "spi", "bus_no": 9, "dev_name": "SHT721", "alias": "no-cs"}""",
+                         "not json"]
+        serial_report = Sensors().add_sensors(specs)
+        parallel_report = self.sensors.add_sensors(specs, workers=2)
+        self.assertEqual(serial_report, parallel_report)
+        self.assertEqual(40, len(self.sensors.sensors))
+        self.assertEqual([False, False, False], [result["added"] for result in parallel_report[40:]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 # @file test_py_sensors.py
 
 
+import contextlib
+import io
 import unittest
 #
 from py_sensors import Sensors    # This is the code being tested
@@ -71,6 +73,36 @@ class SensorsTests(unittest.TestCase):
                              isinstance(sdata, list) or
                              isinstance(sdata, ComplexValue))
 
+    def testReadSensorsLogsValuesInsteadOfPrinting(self):
+        params = """{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 76, "dev_name": "BM280", "alias": "RHT-sensor5"}"""
+        self.sensors.add_sensor(params)
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), self.assertLogs("py_sensors", level="INFO") as logs:
+            self.sensors.read_sensors()
+        self.assertEqual("", stdout.getvalue())
+        self.assertTrue(any("RHT-sensor5" in line for line in logs.output))
+
+    def testAddSensorsBulk(self):
+        orig_no_of_sensors = len(self.sensors.sensors)
+        specs = ["""{"sensor_type": "i2c", "bus_no": 3, "i2c_addr": 90, "dev_name": "BM280", "alias": "bulk-1"}""",
+                 {"sensor_type": "spi", "bus_no": 5, "cs_no": 1, "dev_name": "SHT721", "alias": "bulk-2"},
+                 {"sensor_type": "uart", "bus_no": 6, "baud_rate": 9600, "dev_name": "Hygro", "alias": "bulk-3"}]
+        report = self.sensors.add_sensors(specs)
+        self.assertEqual(3, len(report))
+        self.assertEqual([True, True, True], [result["added"] for result in report])
+        self.assertEqual(["bulk-1", "bulk-2", "bulk-3"], [result["alias"] for result in report])
+        self.assertEqual(3, len(self.sensors.sensors) - orig_no_of_sensors)
+
+    def testAddSensorsBulkFromJsonLinesFile(self):
+        orig_no_of_sensors = len(self.sensors.sensors)
+        spec_file = io.StringIO(
+            """{"sensor_type": "spi", "bus_no": 5, "cs_no": 2, "dev_name": "SHT721", "alias": "bulk-4"}\n"""
+            "\n"
+            """{"sensor_type": "spi", "bus_no": 5, "cs_no": 3, "dev_name": "SHT721", "alias": "bulk-5"}\n""")
+        report = self.sensors.add_sensors(spec_file)
+        self.assertEqual([1, 3], [result["index"] for result in report])
+        self.assertEqual(2, len(self.sensors.sensors) - orig_no_of_sensors)
+
     # Step 2: negative tests (invalid sensor / invalid actions)
     # ---------------------------------------------------------
     def testAddNonValidSensorConfig(self):
@@ -110,6 +142,21 @@ class SensorsTests(unittest.TestCase):
         new_no_of_sensors = len(self.sensors.sensors)
         self.assertEqual(0, new_no_of_sensors - orig_no_of_sensors)
 
+    def testAddSensorsBulkReportsInvalidSpecs(self):
+        orig_no_of_sensors = len(self.sensors.sensors)
+        specs = ["""{"sensor_type": "spi", "bus_no": 5, "cs_no": 6, "dev_name": "SHT721", "alias": "bulk-6"}""",
+                 # Same bus & CS as previous spec in batch:
+                 """{"sensor_type": "spi", "bus_no": 5, "cs_no": 6, "dev_name": "SHT721", "alias": "bulk-7"}""",
+                 # Not JSON at all:
+                 """{"sensor_type": "spi",""",
+                 # Missing device-specific property:
+                 {"sensor_type": "spi", "bus_no": 5, "dev_name": "SHT721", "alias": "bulk-8"}]
+        report = self.sensors.add_sensors(specs)
+        self.assertEqual([True, False, False, False], [result["added"] for result in report])
+        for result in report[1:]:
+            self.assertIsNotNone(result["error"])
+        self.assertEqual(1, len(self.sensors.sensors) - orig_no_of_sensors)
+
 
 if __name__ == '__main__':
     unittest.main()
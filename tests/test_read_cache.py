@@ -0,0 +1,146 @@
+# @file test_read_cache.py
+
+
+import threading
+import time
+import unittest
+#
+from py_sensors import Sensors
+from sensor_utils.read_cache import CachedRead, ReadCache    # This is the code being tested
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingRead:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.no_of_reads = 0
+        self.fail = False
+
+    def __call__(self):
+        if self.latency:
+            time.sleep(self.latency)
+        self.no_of_reads += 1
+        if self.fail:
+            raise OSError("device NACK")
+        return float(self.no_of_reads)
+
+
+class ReadCacheTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.sensors = Sensors()
+        self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "dev_name": "BM280", "alias": "cached-i2c"}""")
+        self.sensors.add_sensor("""{"sensor_type": "spi", "bus_no": 1, "cs_no": 3, "dev_name": "SHT721", "alias": "cached-spi"}""")
+        self.i2c_read = CountingRead()
+        self.sensors.get_sensor_by_alias("cached-i2c").base.read = self.i2c_read
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.sensors.disable_read_cache()
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testHitWithinTtl(self):
+        cache = self.sensors.enable_read_cache(ReadCache(ttl=0.5, clock=self.clock))
+        sensor = self.sensors.get_sensor_by_alias("cached-i2c")
+        self.assertEqual(1.0, sensor.base.read())
+        self.clock.now += 0.4
+        self.assertEqual(1.0, sensor.base.read())
+        self.assertEqual(1.0, self.sensors.read_sensors()[0])
+        self.clock.now += 0.2
+        self.assertEqual(2.0, sensor.base.read())
+        stats = cache.stats(sensor)
+        self.assertEqual((2, 2), (stats.hits, stats.misses))
+        self.assertEqual(0.5, stats.hit_ratio)
+
+    def testTtlPerType(self):
+        cache = self.sensors.enable_read_cache(ReadCache(ttl=0.5, ttl_by_type={"spi": None}, clock=self.clock))
+        self.assertEqual(1, len(cache.entries))
+        self.assertNotIsInstance(self.sensors.get_sensor_by_alias("cached-spi").base.read, CachedRead)
+        self.assertIsInstance(self.sensors.get_sensor_by_alias("cached-i2c").base.read, CachedRead)
+
+    def testStaleWhileRevalidate(self):
+        cache = self.sensors.enable_read_cache(ReadCache(ttl=0.5, stale_while_revalidate=True, clock=self.clock))
+        sensor = self.sensors.get_sensor_by_alias("cached-i2c")
+        self.assertEqual(1.0, sensor.base.read())
+        self.clock.now += 1.0
+        # Stale value returned at once - refresh runs in background:
+        self.assertEqual(1.0, sensor.base.read())
+        cache.shutdown()    # waits for refresh
+        self.assertEqual(2.0, sensor.base.read())
+        stats = cache.stats()
+        self.assertEqual((1, 1, 1), (stats.stale_hits, stats.refreshes, stats.hits))
+
+    def testMaxStale(self):
+        self.sensors.enable_read_cache(ReadCache(ttl=0.5, stale_while_revalidate=True, max_stale=1.0, clock=self.clock))
+        sensor = self.sensors.get_sensor_by_alias("cached-i2c")
+        sensor.base.read()
+        self.clock.now += 2.0
+        # Too old to be served - read through:
+        self.assertEqual(2.0, sensor.base.read())
+
+    def testConcurrentReadersCoalesced(self):
+        self.i2c_read.latency = 0.05
+        cache = self.sensors.enable_read_cache(ReadCache(ttl=10.0))
+        sensor = self.sensors.get_sensor_by_alias("cached-i2c")
+        barrier = threading.Barrier(5)
+        values = []
+
+        def reader():
+            barrier.wait()
+            values.append(sensor.base.read())
+        threads = [threading.Thread(target=reader) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([1.0] * 5, values)
+        self.assertEqual(1, self.i2c_read.no_of_reads)
+        stats = cache.stats(sensor)
+        self.assertEqual(5, stats.misses + stats.coalesced + stats.hits)
+        self.assertEqual(1, stats.misses)
+
+    def testConcurrentHitsCountedExactly(self):
+        cache = self.sensors.enable_read_cache(ReadCache(ttl=60.0))
+        sensor = self.sensors.get_sensor_by_alias("cached-i2c")
+        sensor.base.read()
+        barrier = threading.Barrier(8)
+
+        def reader():
+            barrier.wait()
+            for _ in range(5000):
+                sensor.base.read()
+        threads = [threading.Thread(target=reader) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(40000, cache.stats(sensor).hits)
+        self.assertEqual(1, cache.stats(sensor).misses)
+
+    def testUninstallOnDisable(self):
+        self.sensors.enable_read_cache(ReadCache(ttl=10.0))
+        self.sensors.disable_read_cache()
+        self.assertIs(self.i2c_read, self.sensors.get_sensor_by_alias("cached-i2c").base.read)
+
+    # Step 2: negative tests (invalid sensor / invalid actions)
+    # ---------------------------------------------------------
+    def testErrorsNotCached(self):
+        cache = self.sensors.enable_read_cache(ReadCache(ttl=10.0, clock=self.clock))
+        sensor = self.sensors.get_sensor_by_alias("cached-i2c")
+        self.i2c_read.fail = True
+        self.assertRaises(OSError, sensor.base.read)
+        self.i2c_read.fail = False
+        self.assertEqual(2.0, sensor.base.read())
+        self.assertEqual(1, cache.stats(sensor).errors)
+
+
+if __name__ == '__main__':
+    unittest.main()
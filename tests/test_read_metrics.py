@@ -0,0 +1,134 @@
+# @file test_read_metrics.py
+
+
+import time
+import unittest
+import urllib.request
+#
+from py_sensors import Sensors
+from sensor_utils.read_cache import ReadCache
+from sensor_utils.read_metrics import Histogram, ReadMetrics, TimedRead    # This is the code being tested
+from sensor_utils.sensor_poller import READ_TIMEOUT
+
+
+class FakeClock:
+    """ Advanced by the (fake) reads themselves - so recorded latencies are exact. """
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ReadMetricsTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.sensors = Sensors()
+        self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "dev_name": "BM280", "alias": "m-i2c-a"}""")
+        self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 79, "dev_name": "BM280", "alias": "m-i2c-b"}""")
+        self.sensors.add_sensor("""{"sensor_type": "spi", "bus_no": 1, "cs_no": 3, "dev_name": "SHT721", "alias": "m-spi"}""")
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.sensors.disable_metrics()
+        self.sensors.disable_read_cache()
+
+    def set_latency(self, alias, latency, fail=False):
+        clock = self.clock
+
+        def read():
+            clock.now += latency
+            if fail:
+                raise OSError("device NACK")
+            return 1.0
+        self.sensors.get_sensor_by_alias(alias).base.read = read
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testHistogramBuckets(self):
+        histogram = Histogram(sub_buckets=4)
+        for latency in (0.5e-6, 1e-3, 1e-3, 1e-3, 2e-3, 0.1):
+            histogram.record(latency)
+        self.assertEqual(6, histogram.count)
+        for latency in (1e-6, 3e-6, 1e-3, 0.75, 100.0):
+            bound = histogram.upper_bound(histogram.bucket_of(latency))
+            self.assertTrue(latency < bound <= latency * 1.25 + 1e-12, (latency, bound))
+        self.assertTrue(1e-3 <= histogram.quantile(0.5) <= 1.25e-3)
+        self.assertEqual(0.1, histogram.quantile(1.0))
+        cumulative = histogram.cumulative()
+        self.assertEqual(float("inf"), cumulative[-1][0])
+        self.assertEqual(6, cumulative[-1][1])
+        self.assertEqual(sorted(count for _, count in cumulative), [count for _, count in cumulative])
+
+    def testPerSensorAndPerBus(self):
+        self.set_latency("m-i2c-a", 0.010)
+        self.set_latency("m-i2c-b", 0.001)
+        self.set_latency("m-spi", 0.002, fail=True)
+        metrics = self.sensors.enable_metrics(ReadMetrics(clock=self.clock))
+        for _ in range(3):
+            self.sensors.get_sensor_by_alias("m-i2c-a").base.read()
+            self.sensors.get_sensor_by_alias("m-i2c-b").base.read()
+            with self.assertRaises(OSError):
+                self.sensors.get_sensor_by_alias("m-spi").base.read()
+        snapshot = metrics.snapshot()
+        self.assertEqual(["m-i2c-a", "m-spi", "m-i2c-b"], [row["alias"] for row in snapshot["sensors"]])
+        self.assertEqual((3, 3), (snapshot["sensors"][1]["reads"], snapshot["sensors"][1]["errors"]))
+        self.assertAlmostEqual(0.030, snapshot["sensors"][0]["read_latency"]["sum"])
+        buses = dict((row["bus"], row) for row in snapshot["buses"])
+        self.assertEqual(2, buses["i2c/2"]["sensors"])
+        self.assertEqual(6, buses["i2c/2"]["reads"])
+        self.assertAlmostEqual(0.033, buses["i2c/2"]["read_latency"]["sum"])
+        self.assertEqual("m-i2c-a", metrics.top(1)[0][0])
+
+    def testMeasuresDeviceReadsBelowCache(self):
+        self.set_latency("m-i2c-a", 0.005)
+        self.sensors.enable_read_cache(ReadCache(ttl=60.0))
+        metrics = self.sensors.enable_metrics(ReadMetrics(clock=self.clock))
+        sensor = self.sensors.get_sensor_by_alias("m-i2c-a")
+        for _ in range(5):
+            sensor.base.read()
+        self.assertEqual(1, metrics.metrics_of(sensor).reads)
+        self.sensors.disable_metrics()
+        self.assertNotIsInstance(sensor.base.read.read_func, TimedRead)
+
+    def testTimeoutsCounted(self):
+        self.sensors.get_sensor_by_alias("m-spi").base.read = lambda: time.sleep(0.2)
+        metrics = self.sensors.enable_metrics()
+        self.assertIs(READ_TIMEOUT, self.sensors.poll_sensors(read_timeout=0.05)[2])
+        self.assertEqual(1, metrics.metrics_of(self.sensors.get_sensor_by_alias("m-spi")).timeouts)
+
+    def testDisableRestoresDriverCalls(self):
+        sensor = self.sensors.get_sensor_by_alias("m-i2c-a")
+        read, config = sensor.base.read, sensor.base.config
+        metrics = self.sensors.enable_metrics()
+        sensor.base.config()
+        self.assertEqual(1, metrics.metrics_of(sensor).configs)
+        self.sensors.disable_metrics()
+        self.assertIs(read, sensor.base.read)
+        self.assertIs(config, sensor.base.config)
+
+    def testBindTimeConfigTimed(self):
+        metrics = self.sensors.enable_metrics()
+        self.assertTrue(self.sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 3, "i2c_addr": 80,
+                                                    "dev_name": "BM280", "alias": "m-i2c-late"}"""))
+        sensor_metrics = metrics.metrics_of(self.sensors.get_sensor_by_alias("m-i2c-late"))
+        self.assertEqual(1, sensor_metrics.configs)
+        self.assertEqual(1, sensor_metrics.config_latency.count)
+
+    def testPrometheusEndpoint(self):
+        metrics = self.sensors.enable_metrics()
+        self.sensors.read_sensors()
+        server = metrics.serve()
+        try:
+            with urllib.request.urlopen(server.url) as response:
+                text = response.read().decode("utf-8")
+        finally:
+            server.close()
+        self.assertIn("# TYPE py_sensors_read_latency_seconds histogram", text)
+        self.assertIn('py_sensors_reads_total{sensor="m-spi",bus="spi/1"} 1', text)
+        self.assertIn('py_sensors_read_latency_seconds_bucket{sensor="m-i2c-a",bus="i2c/2",le="+Inf"} 1', text)
+        self.assertIn('py_sensors_bus_reads_total{bus="i2c/2"} 2', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
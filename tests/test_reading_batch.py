@@ -0,0 +1,90 @@
+# @file test_reading_batch.py
+
+
+import unittest
+#
+from py_sensors import Sensors
+from sensor_properties.sensor_props import ComplexValue
+from sensor_utils.reading_batch import ReadingBatch    # This is the code being tested
+
+
+class ReadingBatchTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.batch = ReadingBatch()
+
+    def tearDown(self):
+        pass
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testRoundTrip(self):
+        self.batch.append(0, 1.5, 1.12345)
+        self.batch.append(1, 2.5, ComplexValue(True, 7, 8.765))
+        self.batch.append(2, 3.5, [3, 4, 5])
+        self.batch.append(3, 4.5, [0.5, 1.5])
+        self.batch.append(4, 5.5, 42)
+        readings = list(ReadingBatch(buffer=memoryview(self.batch.buffer)))
+        self.assertEqual(5, len(readings))
+        self.assertEqual((0, 1.5, 1.12345), readings[0])
+        self.assertEqual(1, readings[1].sensor_idx)
+        self.assertEqual((True, 7, 8.765), (readings[1].value.triggered, readings[1].value.channel, readings[1].value.ch_val))
+        self.assertEqual([3, 4, 5], readings[2].value)
+        self.assertEqual([0.5, 1.5], readings[3].value)
+        self.assertEqual(42, readings[4].value)
+        self.assertEqual(5, len(ReadingBatch(buffer=bytes(self.batch.buffer))))
+
+    def testAppendToWrappedBuffer(self):
+        self.batch.append(0, 1.5, 1.25)
+        self.batch.append(1, 2.5, [3, 4])
+        for buffer in (bytearray(self.batch.buffer), bytes(self.batch.buffer), memoryview(self.batch.buffer)):
+            wrapped = ReadingBatch(buffer=buffer)
+            self.assertTrue(wrapped.append(2, 3.5, 7))
+            self.assertEqual(3, len(wrapped))
+            self.assertTrue(wrapped.append(3, 4.5, 0.5))
+            self.assertEqual(4, len(wrapped))
+            self.assertEqual([0, 1, 2, 3], [reading.sensor_idx for reading in wrapped])
+        self.assertEqual(2, len(self.batch))
+
+    def testReadSensorsIntoBatch(self):
+        sensors = Sensors()
+        sensors.add_sensors([{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "dev_name": "BM280", "alias": "b-i2c"},
+                             {"sensor_type": "spi", "bus_no": 1, "cs_no": 3, "dev_name": "SHT721", "alias": "b-spi"},
+                             {"sensor_type": "uart", "bus_no": 4, "baud_rate": 9600, "dev_name": "Hyg", "alias": "b-uart"}])
+        data = sensors.read_sensors(batch=self.batch)
+        list(sensors.get_sensor_data(batch=self.batch))
+        self.assertEqual(6, len(self.batch))
+        readings = list(self.batch)
+        self.assertEqual([0, 1, 2, 0, 1, 2], [reading.sensor_idx for reading in readings])
+        self.assertEqual(data[2], readings[2].value)
+
+    def testBoolKeepsType(self):
+        self.batch.append(0, 1.5, True)
+        self.batch.append(1, 2.5, 1)
+        values = [reading.value for reading in self.batch]
+        self.assertEqual([True, 1], values)
+        self.assertIs(True, values[0])
+        self.assertIsNot(True, values[1])
+
+    def testComplexValueHasNoDict(self):
+        self.assertFalse(hasattr(ComplexValue(), "__dict__"))
+
+    # Step 2: negative tests (invalid sensor / invalid actions)
+    # ---------------------------------------------------------
+    def testBadListLeavesBatchIntact(self):
+        self.batch.append(0, 1.5, 1.25)
+        nbytes = self.batch.nbytes
+        self.assertFalse(self.batch.append(1, 2.0, [1, 'x']))
+        self.assertFalse(self.batch.append(2, 3.0, [0] * 0x10000))
+        self.assertEqual(nbytes, self.batch.nbytes)
+        self.assertTrue(self.batch.append(3, 4.0, [1, 2]))
+        self.assertEqual([(0, 1.5, 1.25), (3, 4.0, [1, 2])], list(self.batch))
+        self.assertEqual(2, len(self.batch))
+
+    def testUnsupportedValueRejected(self):
+        self.assertEqual(False, self.batch.append(0, 1.0, "text"))
+        self.assertEqual(0, len(self.batch))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# @file test_reading_filter.py
+
+
+import unittest
+#
+from py_sensors import Sensors
+from sensor_properties.sensor_props import ComplexValue
+from sensor_utils.reading_batch import ReadingBatch
+from sensor_utils.reading_filter import FilterOptions, ReadingFilter    # This is the code being tested
+from sensor_utils.sensor_poller import READ_TIMEOUT
+
+
+class ReadingFilterTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.filter = ReadingFilter()
+
+    def tearDown(self):
+        pass
+
+    def accepted(self, alias, values, start=0.0, step=1.0):
+        return [self.filter.accept(alias, value, start + idx * step) for idx, value in enumerate(values)]
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testNoOptionsPassesEverything(self):
+        self.assertEqual([True, True, True], self.accepted("s", [1.0, 1.0, 1.0]))
+        self.assertEqual(0.0, self.filter.stats("s").suppression_ratio)
+
+    def testAbsoluteDeadband(self):
+        self.filter.set_options("s", FilterOptions(deadband_abs=0.5))
+        # Compared against last REPORTED value - slow drift is reported once it adds up:
+        self.assertEqual([True, False, False, True, False], self.accepted("s", [10.0, 10.3, 10.45, 10.6, 10.2]))
+        self.assertEqual(0.6, self.filter.stats("s").suppression_ratio)
+
+    def testRelativeDeadband(self):
+        self.filter.set_options("s", FilterOptions(deadband_rel=0.1))
+        self.assertEqual([True, False, True], self.accepted("s", [100.0, 109.0, 111.0]))
+
+    def testDuplicateSuppressionAndHeartbeat(self):
+        self.filter.set_options("s", FilterOptions(suppress_duplicates=True, heartbeat=3.0))
+        self.assertEqual([True, False, False, True, False, True],
+                         self.accepted("s", [5, 5, 5, 5, 5, 6]))
+        self.assertEqual(1, self.filter.stats("s").no_of_heartbeats)
+
+    def testListValues(self):
+        self.filter.set_options("uart", FilterOptions(deadband_abs=1))
+        self.assertEqual([True, False, True, True], self.accepted("uart", [[3, 4, 5], [3, 5, 5], [3, 4, 7], [3, 4]]))
+
+    def testComplexValues(self):
+        self.filter.set_options("spi", FilterOptions(deadband_abs=0.1))
+        values = [ComplexValue(True, 7, 8.0), ComplexValue(True, 7, 8.05), ComplexValue(False, 7, 8.05),
+                  ComplexValue(False, 6, 8.05), ComplexValue(False, 6, 8.2)]
+        self.assertEqual([True, False, True, True, True], self.accepted("spi", values))
+
+    def testReportedListNotAliased(self):
+        self.filter.set_options("uart", FilterOptions(suppress_duplicates=True))
+        buffer = [1, 2, 3]
+        self.filter.accept("uart", buffer, 0.0)
+        buffer[0] = 9     # driver refilling its buffer in place
+        self.assertEqual(True, self.filter.accept("uart", buffer, 1.0))
+
+    def testFailedReadsAlwaysPass(self):
+        self.filter.set_options("s", FilterOptions(suppress_duplicates=True))
+        self.assertEqual([True, True, True, False], self.accepted("s", [1.0, READ_TIMEOUT, OSError("NACK"), 1.0]))
+
+    def testSensorsPipeline(self):
+        sensors = Sensors()
+        sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "dev_name": "BM280", "alias": "f-i2c"}""")
+        sensors.add_sensor("""{"sensor_type": "spi", "bus_no": 1, "cs_no": 3, "dev_name": "SHT721", "alias": "f-spi"}""")
+        reading_filter = ReadingFilter(default=FilterOptions(suppress_duplicates=True))
+        batch = ReadingBatch()
+        for _ in range(5):
+            sensors.read_sensors(batch=batch, reading_filter=reading_filter)
+        # Mocked drivers return constant values - only first sweep goes downstream:
+        self.assertEqual(2, len(batch))
+        self.assertEqual([], list(sensors.get_sensor_data(reading_filter=reading_filter)))
+        self.assertEqual(0.8333, round(reading_filter.stats().suppression_ratio, 4))
+
+    # Step 2: negative tests (invalid sensor / invalid actions)
+    # ---------------------------------------------------------
+    def testFilterWithoutBatchRejected(self):
+        sensors = Sensors()
+        sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "dev_name": "BM280", "alias": "f-i2c"}""")
+        reading_filter = ReadingFilter(default=FilterOptions(suppress_duplicates=True))
+        with self.assertRaises(ValueError):
+            sensors.read_sensors(reading_filter=reading_filter)
+        self.assertEqual(0, reading_filter.stats().no_of_readings)
+
+
+if __name__ == '__main__':
+    unittest.main()
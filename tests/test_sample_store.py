@@ -0,0 +1,103 @@
+# @file test_sample_store.py
+
+
+import unittest
+#
+from py_sensors import Sensors
+from sensor_properties.sensor_props import ComplexValue
+from sensor_utils.sample_store import RingBuffer, SampleStore    # This is the code being tested
+
+
+MAX_FLOAT_DIFFERENCE = 0.00001
+
+
+class SampleStoreTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.store = SampleStore(capacity=8)
+
+    def tearDown(self):
+        pass
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testScalarRingBufferWraps(self):
+        for idx in range(20):
+            self.store.append("i2c", float(idx), timestamp=float(idx))
+        timestamps, values = self.store.last("i2c", 3)
+        self.assertEqual([17.0, 18.0, 19.0], list(timestamps))
+        self.assertEqual([17.0, 18.0, 19.0], list(values))
+        self.assertEqual(8, len(self.store.buffers["i2c"]))
+        # Oldest retained sample is no.12:
+        timestamps, _ = self.store.between("i2c")
+        self.assertEqual(12.0, timestamps[0])
+
+    def testTimeRangeAndStats(self):
+        for idx in range(6):
+            self.store.append("i2c", float(idx * 2), timestamp=float(idx))
+        timestamps, values = self.store.between("i2c", 1.0, 3.0)
+        self.assertEqual([2.0, 4.0, 6.0], list(values))
+        stats = self.store.stats("i2c", 1.0, 3.0)
+        self.assertEqual(3, stats["count"])
+        self.assertEqual(2.0, stats["min"])
+        self.assertEqual(6.0, stats["max"])
+        self.assertAlmostEqual(4.0, stats["mean"], delta=MAX_FLOAT_DIFFERENCE)
+
+    def testListValuesAreColumnar(self):
+        self.store.append("uart", [3, 4, 5], timestamp=1.0)
+        self.store.append("uart", [5, 6, 7], timestamp=2.0)
+        _, values = self.store.last("uart", 2)
+        self.assertEqual((2, 3), values.shape)
+        self.assertEqual([4.0, 5.0, 6.0], list(self.store.stats("uart")["mean"]))
+
+    def testComplexValuesAreStructured(self):
+        self.store.append("spi", ComplexValue(True, 7, 8.5), timestamp=1.0)
+        self.store.append("spi", ComplexValue(False, 3, 1.5), timestamp=2.0)
+        _, values = self.store.last("spi", 2)
+        self.assertEqual([True, False], list(values["triggered"]))
+        self.assertEqual([7, 3], list(values["channel"]))
+        self.assertAlmostEqual(5.0, self.store.stats("spi")["mean"], delta=MAX_FLOAT_DIFFERENCE)
+
+    def testAppendSweep(self):
+        sensors = Sensors()
+        sensors.add_sensors([{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "dev_name": "BM280", "alias": "s-i2c"},
+                             {"sensor_type": "spi", "bus_no": 1, "cs_no": 3, "dev_name": "SHT721", "alias": "s-spi"},
+                             {"sensor_type": "uart", "bus_no": 4, "baud_rate": 9600, "dev_name": "Hyg", "alias": "s-uart"}])
+        self.store.append_sweep(sensors.get_sensor_data(), timestamp=1.0)
+        self.store.append_sweep(sensors.get_sensor_data(), timestamp=2.0)
+        self.assertEqual({"s-i2c", "s-spi", "s-uart"}, set(self.store.buffers))
+        self.assertEqual(2, len(self.store.buffers["s-spi"]))
+
+    # Step 2: negative tests (invalid sensor / invalid actions)
+    # ---------------------------------------------------------
+    def testEmptyWindow(self):
+        buffer = RingBuffer(capacity=4)
+        self.assertEqual(0, len(buffer.last(3)[0]))
+        self.assertEqual(0, buffer.stats()["count"])
+
+    def testListOfWrongWidthRejected(self):
+        self.store.append("uart", [3, 4, 5], timestamp=1.0)
+        self.assertEqual(False, self.store.append("uart", [1, 2], timestamp=2.0))
+
+    def testMismatchingShapesSkipped(self):
+        self.store.append("i2c", 21.5, timestamp=1.0)
+        self.store.append("spi", ComplexValue(True, 7, 8.5), timestamp=1.0)
+        self.store.append("uart", [3, 4, 5], timestamp=1.0)
+        self.assertFalse(self.store.append("i2c", [1.0, 2.0], timestamp=2.0))
+        self.assertFalse(self.store.append("i2c", OSError("device NACK"), timestamp=2.0))
+        self.assertFalse(self.store.append("spi", 8.5, timestamp=2.0))
+        self.assertFalse(self.store.append("uart", 3.0, timestamp=2.0))
+        self.assertFalse(self.store.append("uart", [3, "x", 5], timestamp=2.0))
+        self.assertEqual([1, 1, 1], [len(self.store.buffers[alias]) for alias in ("i2c", "spi", "uart")])
+        # A sweep with one bad value stores all others:
+        self.store.append_sweep([("i2c", [1.0]), ("uart", [6, 7, 8])], timestamp=3.0)
+        self.assertEqual([6.0, 7.0, 8.0], self.store.last("uart")[1][-1].tolist())
+
+    def testFailedFirstReadDoesNotFixLayout(self):
+        self.assertFalse(self.store.append("uart", OSError("device NACK"), timestamp=1.0))
+        self.assertNotIn("uart", self.store.buffers)
+        self.assertTrue(self.store.append("uart", [3, 4, 5], timestamp=2.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+# @file test_sensor_poller.py
+
+
+import threading
+import time
+import unittest
+#
+from py_sensors import Sensors
+from sensor_utils.sensor_poller import SensorPoller, READ_TIMEOUT    # This is the code being tested
+
+
+SPECS = [{"sensor_type": "spi", "bus_no": 1, "cs_no": 1, "dev_name": "SHT721", "alias": "poll-spi1"},
+         {"sensor_type": "spi", "bus_no": 1, "cs_no": 2, "dev_name": "SHT721", "alias": "poll-spi2"},
+         {"sensor_type": "uart", "bus_no": 4, "baud_rate": 9600, "dev_name": "Hygro", "alias": "poll-uart4"},
+         {"sensor_type": "uart", "bus_no": 5, "baud_rate": 9600, "dev_name": "Hygro", "alias": "poll-uart5"}]
+
+
+class SensorPollerTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.sensors = Sensors()
+        self.sensors.add_sensors(SPECS)
+        self.poller = SensorPoller(read_timeout=1.0)
+
+    def tearDown(self):
+        self.poller.shutdown()
+
+    def set_read(self, alias, read_func):
+        self.sensors.get_sensor_by_alias(alias).base.read = read_func
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testResultsInSensorOrder(self):
+        for idx, sensor in enumerate(self.sensors.sensors):
+            sensor.base.read = lambda value=idx: value
+        self.assertEqual([0, 1, 2, 3], self.poller.sweep(self.sensors.sensors))
+        self.assertEqual(4, self.poller.stats.no_of_reads)
+
+    def testSameBusReadsAreSerialized(self):
+        active = []
+        overlaps = []
+        lock = threading.Lock()
+
+        def bus_read():
+            with lock:
+                active.append(1)
+                overlaps.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+            return 1.0
+        self.set_read("poll-spi1", bus_read)
+        self.set_read("poll-spi2", bus_read)
+        self.poller.sweep(self.sensors.sensors)
+        self.assertEqual([1, 1], overlaps)
+
+    def testIndependentBusesRunConcurrently(self):
+        for sensor in self.sensors.get_uart_sensors():
+            sensor.base.read = lambda: time.sleep(0.1) or [1, 2]
+        self.poller.sweep(self.sensors.get_uart_sensors())
+        self.assertLess(self.poller.stats.sweep_time, 0.18)
+        self.assertGreater(self.poller.stats.speedup, 1.2)
+
+    def testSensorsShutdownReleasesPoller(self):
+        self.sensors.poll_sensors(read_timeout=0.5)
+        poller = self.sensors.poller
+        self.sensors.shutdown()
+        self.assertIsNone(self.sensors.poller)
+        self.assertEqual({}, poller._executors)
+
+    # Step 2: negative tests (invalid sensor / invalid actions)
+    # ---------------------------------------------------------
+    def testTimeoutGivesPartialResults(self):
+        self.poller.read_timeout = 0.05
+        self.set_read("poll-spi1", lambda: time.sleep(0.3))
+        results = self.poller.sweep(self.sensors.sensors)
+        # Hung read - and the read queued behind it on the same bus - are marked as timed out:
+        self.assertIs(READ_TIMEOUT, results[0])
+        self.assertIs(READ_TIMEOUT, results[1])
+        self.assertEqual([3, 4, 5], results[2])
+        self.assertEqual(2, self.poller.stats.no_of_timeouts)
+        # Bus is still blocked by the hung read on the next sweep:
+        results = self.poller.sweep(self.sensors.sensors)
+        self.assertIs(READ_TIMEOUT, results[0])
+
+    def testStuckBusDoesNotBlockSweep(self):
+        self.poller.read_timeout = 0.05
+        release = threading.Event()
+        # A read nobody waits for any more - e.g. left over from an earlier sweep - hangs on SPI bus 1:
+        leftover = self.poller._executor(("spi", 1)).submit(release.wait)
+        start = time.monotonic()
+        results = self.poller.sweep(self.sensors.sensors)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual([READ_TIMEOUT, READ_TIMEOUT], results[:2])
+        self.assertEqual([3, 4, 5], results[2])
+        # Bus blocked until the reads queued on it have run:
+        self.assertEqual([READ_TIMEOUT, READ_TIMEOUT], self.poller.sweep(self.sensors.sensors)[:2])
+        release.set()
+        leftover.result(timeout=1.0)
+        self.poller._hung[("spi", 1)].result(timeout=1.0)
+        self.assertNotIn(READ_TIMEOUT, self.poller.sweep(self.sensors.sensors))
+
+    def testDriverExceptionIsReturned(self):
+        def failing_read():
+            raise IOError("bus error")
+        self.set_read("poll-uart4", failing_read)
+        results = self.poller.sweep(self.sensors.sensors)
+        self.assertIsInstance(results[2], IOError)
+        self.assertEqual(1, self.poller.stats.no_of_errors)
+
+
+if __name__ == '__main__':
+    unittest.main()
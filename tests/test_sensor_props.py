@@ -5,9 +5,9 @@ from sensor_properties import sensor_props    # This is the code being tested
 
 MAX_FLOAT_DIFFERENCE = 0.00001
 
-VALID_I2C_PARAMS = {"uuid": 0xABCDABCDDEADBEEF, "sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "clk_speed": 400000, "dev_name": "BM280", "alias": "RHT-sensor1", "pwr_control": "false"}
-INVALID_I2C_PARAMS_BASE = {"uuid": 0xABCDABCDDEADBEEF, "sensor_type": "i2c", "i2c_addr": 78, "dev_name": "BM280", "clk_speed": 400000, "alias": "RHT-sensor1", "pwr_control": "false"}
-INVALID_I2C_PARAMS_DEV = {"uuid": 0xABCDABCDDEADBEEF, "sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "dev_name": "BM280", "alias": "RHT-sensor1", "pwr_control": "false"}
+VALID_I2C_PARAMS = {"uuid": 0xABCDABCDDEADBEEF, "sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "clk_speed": 400000, "dev_name": "BM280", "alias": "RHT-sensor1", "pwr_control": "false", "sample_period": 0.5, "read_bytes": 2}
+INVALID_I2C_PARAMS_BASE = {"uuid": 0xABCDABCDDEADBEEF, "sensor_type": "i2c", "i2c_addr": 78, "dev_name": "BM280", "clk_speed": 400000, "alias": "RHT-sensor1", "pwr_control": "false", "sample_period": 0.5, "read_bytes": 2}
+INVALID_I2C_PARAMS_DEV = {"uuid": 0xABCDABCDDEADBEEF, "sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "dev_name": "BM280", "alias": "RHT-sensor1", "pwr_control": "false", "sample_period": 0.5, "read_bytes": 2}
 
 
 class SensorsTests(unittest.TestCase):
@@ -0,0 +1,71 @@
+# @file test_sensor_registry.py
+
+
+import unittest
+#
+from py_sensors import Sensors
+from sensor_utils.sensor_registry import SensorRegistry, bus_slot    # This is the code being tested
+
+
+def make_sensor(params):
+    sensors = Sensors()
+    sensors.add_sensor(params)
+    return sensors.sensors[0]
+
+
+class SensorRegistryTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.registry = SensorRegistry()
+        self.i2c_sensor = make_sensor("""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "dev_name": "BM280", "alias": "reg-i2c"}""")
+        self.spi_sensor = make_sensor("""{"sensor_type": "spi", "bus_no": 1, "cs_no": 3, "dev_name": "SHT721", "alias": "reg-spi"}""")
+
+    def tearDown(self):
+        pass
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testAddAndLookup(self):
+        self.assertEqual(True, self.registry.add(self.i2c_sensor))
+        self.assertEqual(True, self.registry.add(self.spi_sensor))
+        self.assertEqual(2, len(self.registry))
+        self.assertIs(self.i2c_sensor, self.registry.get_by_alias("reg-i2c"))
+        self.assertIs(self.spi_sensor, self.registry.get_by_uuid(self.spi_sensor.base.uuid))
+        self.assertEqual([self.spi_sensor], self.registry.get_by_type("spi"))
+        self.assertIs(self.i2c_sensor, self.registry.get_by_slot(("i2c", 2, 78)))
+        self.assertEqual([self.i2c_sensor, self.spi_sensor], self.registry.sensors)
+
+    def testRemove(self):
+        self.registry.add(self.i2c_sensor)
+        self.assertEqual(True, self.registry.remove(self.i2c_sensor))
+        self.assertEqual(0, len(self.registry))
+        self.assertIsNone(self.registry.get_by_alias("reg-i2c"))
+        self.assertIsNone(self.registry.get_by_slot(bus_slot(self.i2c_sensor)))
+        self.assertEqual([], self.registry.get_by_type("i2c"))
+
+    def testSameI2cAddressOnOtherBus(self):
+        self.registry.add(self.i2c_sensor)
+        other = make_sensor("""{"sensor_type": "i2c", "bus_no": 3, "i2c_addr": 78, "dev_name": "BM280", "alias": "reg-i2c-bus3"}""")
+        self.assertEqual(True, self.registry.add(other))
+
+    # Step 2: negative tests (invalid sensor / invalid actions)
+    # ---------------------------------------------------------
+    def testDuplicateAliasRejected(self):
+        self.registry.add(self.i2c_sensor)
+        other = make_sensor("""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 79, "dev_name": "BM280", "alias": "reg-i2c"}""")
+        self.assertIsNotNone(self.registry.conflict(other))
+        self.assertEqual(False, self.registry.add(other))
+        self.assertEqual(1, len(self.registry))
+
+    def testDuplicateBusSlotRejected(self):
+        self.registry.add(self.spi_sensor)
+        other = make_sensor("""{"sensor_type": "spi", "bus_no": 1, "cs_no": 3, "dev_name": "SHT721", "alias": "reg-spi2"}""")
+        self.assertEqual(False, self.registry.add(other))
+        self.assertEqual(False, self.registry.add(self.spi_sensor))
+
+    def testRemoveUnregistered(self):
+        self.assertEqual(False, self.registry.remove(self.i2c_sensor))
+
+
+if __name__ == '__main__':
+    unittest.main()
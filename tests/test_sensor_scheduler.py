@@ -0,0 +1,112 @@
+# @file test_sensor_scheduler.py
+
+
+import unittest
+#
+from py_sensors import Sensors
+from sensor_drivers.driver_registry import drivers
+from sensor_drivers.simulated_bus import SimulatedBackend
+from sensor_utils.sensor_scheduler import SensorScheduler    # This is the code being tested
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.now += delay
+
+
+class SensorSchedulerTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.sensors = Sensors()
+        self.sensors.add_sensors([
+            {"sensor_type": "spi", "bus_no": 1, "cs_no": 3, "dev_name": "MPU6050", "alias": "imu", "sample_period": 0.01},
+            {"sensor_type": "uart", "bus_no": 4, "baud_rate": 9600, "dev_name": "Hygro", "alias": "hygro"}])
+        self.clock = FakeClock()
+        self.samples = []
+        self.scheduler = SensorScheduler(default_period=0.1, clock=self.clock, sleep=self.clock.sleep,
+                                         on_sample=lambda sensor, value, ts: self.samples.append(sensor.base.alias))
+        self.scheduler.add_sensors(self.sensors.sensors)
+
+    def tearDown(self):
+        pass
+
+    def stats_of(self, alias):
+        return self.scheduler.stats[self.sensors.get_sensor_by_alias(alias).base.uuid]
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testSamplePeriodFromSchemaProperty(self):
+        self.assertEqual(0.01, self.sensors.get_sensor_by_alias("imu").base.sample_period)
+        self.assertEqual(0.01, self.scheduler.period_of(self.sensors.get_sensor_by_alias("imu")))
+        self.assertEqual(0.1, self.scheduler.period_of(self.sensors.get_sensor_by_alias("hygro")))
+
+    def testPerSensorRates(self):
+        self.scheduler.run(duration=0.995)
+        self.assertEqual(100, self.samples.count("imu"))
+        self.assertEqual(10, self.samples.count("hygro"))
+        self.assertEqual(0, self.stats_of("imu").missed_deadlines)
+
+    def testNoDrift(self):
+        # Every read takes 3 ms - due-times must not drift because of it:
+        imu = self.sensors.get_sensor_by_alias("imu")
+        imu.base.read = lambda: self.clock.sleep(0.003)
+        self.scheduler.run(duration=0.995)
+        self.assertEqual(100, self.samples.count("imu"))
+        self.assertAlmostEqual(0.99, self.scheduler.next_due() - 0.01, places=6)
+
+    def testRemoveSensor(self):
+        self.scheduler.remove_sensor(self.sensors.get_sensor_by_alias("imu"))
+        self.scheduler.run(duration=0.5)
+        self.assertEqual(0, self.samples.count("imu"))
+
+    def testReAddSensorKeepsRate(self):
+        imu = self.sensors.get_sensor_by_alias("imu")
+        self.scheduler.add_sensor(imu)
+        self.scheduler.remove_sensor(imu)
+        self.scheduler.add_sensor(imu)
+        self.scheduler.run(duration=0.995)
+        self.assertEqual(100, self.samples.count("imu"))
+        self.assertEqual(2, len(self.scheduler))
+
+    def testDueReadsBatchedPerBus(self):
+        backend = SimulatedBackend(realtime=False)
+        drivers.register("i2c", backend, dev_name="SIM-DEV")
+        try:
+            sensors = Sensors()
+            for addr in (0x10, 0x20, 0x30):
+                backend.attach("i2c", 1, addr, read=lambda value=float(addr): value)
+                sensors.add_sensor("""{"sensor_type": "i2c", "bus_no": 1, "i2c_addr": %d, "dev_name": "SIM-DEV",
+                                       "alias": "sched-%d"}""" % (addr, addr))
+            values = []
+            scheduler = SensorScheduler(default_period=0.1, clock=self.clock, sleep=self.clock.sleep,
+                                        on_sample=lambda sensor, value, ts: values.append(value))
+            scheduler.add_sensors(sensors.sensors)
+            transactions = backend.no_of_transactions
+            self.assertEqual(3, scheduler.run_pending())
+            self.assertEqual([16.0, 32.0, 48.0], values)
+            self.assertEqual(1, backend.no_of_transactions - transactions)
+        finally:
+            drivers.unregister("i2c", dev_name="SIM-DEV")
+
+    # Step 2: negative tests (invalid sensor / invalid actions)
+    # ---------------------------------------------------------
+    def testMissedDeadlinesAndJitter(self):
+        # A late sweep - 35 ms behind schedule:
+        self.scheduler.run_pending()
+        self.clock.now = 0.045
+        self.scheduler.run_pending()
+        stats = self.stats_of("imu")
+        self.assertEqual(2, stats.no_of_samples)
+        self.assertEqual(3, stats.missed_deadlines)
+        self.assertAlmostEqual(0.035, stats.max_jitter, places=6)
+        self.assertAlmostEqual(0.05, self.scheduler.next_due(), places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# @file test_tracing.py
+
+
+import gc
+import io
+import json
+import unittest
+#
+from py_sensors import Sensors
+from sensor_utils import db_utils
+from sensor_utils.tracing import Tracer    # This is the code being tested
+
+
+SENSOR_SPECS = ["""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "dev_name": "BM280", "alias": "t-i2c"}""",
+                """{"sensor_type": "spi", "bus_no": 1, "cs_no": 3, "dev_name": "SHT721", "alias": "t-spi"}"""]
+
+
+class TracingTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.sensors = Sensors()
+        self.tracer = self.sensors.enable_tracing()
+
+    def tearDown(self):
+        self.sensors.disable_tracing()
+
+    def names(self, cat=None):
+        return [event["name"] for event in self.tracer.events() if event["ph"] == "X" and cat in (None, event["cat"])]
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testAddAndReadSpans(self):
+        for spec in SENSOR_SPECS:
+            self.assertTrue(self.sensors.add_sensor(spec))
+        self.sensors.read_sensors()
+        list(self.sensors.get_sensor_data())
+        # Complete events are recorded when they END - nested spans first:
+        self.assertEqual(["validate", "register", "add_sensor"] * 2, self.names("registry"))
+        self.assertEqual(["read", "read", "read_sensors", "read", "read", "get_sensor_data"],
+                         [name for name in self.names() if name in ("read", "read_sensors", "get_sensor_data")])
+        sweep = [event for event in self.tracer.events() if event["name"] == "read_sensors"][0]
+        reads = [event for event in self.tracer.events() if event["name"] == "read"][:2]
+        self.assertEqual(["i2c/2", "spi/1"], [event["args"]["bus"] for event in reads])
+        for event in reads:
+            self.assertTrue(sweep["ts"] <= event["ts"] and event["ts"] + event["dur"] <= sweep["ts"] + sweep["dur"])
+            self.assertEqual(sweep["tid"], event["tid"])
+
+    def testTraceFileFormat(self):
+        self.sensors.add_sensor(SENSOR_SPECS[0])
+        self.sensors.read_sensors()
+        output = io.StringIO()
+        self.tracer.write(output)
+        trace = json.loads(output.getvalue())
+        self.assertEqual("M", trace["traceEvents"][0]["ph"])
+        self.assertEqual("thread_name", trace["traceEvents"][0]["name"])
+        self.assertEqual(0, trace["otherData"]["dropped_events"])
+        for event in trace["traceEvents"][1:]:
+            self.assertEqual({"name", "cat", "ph", "ts", "dur", "pid", "tid"}, set(event) - {"args"})
+
+    def testSamplingPerRoot(self):
+        self.sensors.add_sensor(SENSOR_SPECS[0])
+        tracer = self.tracer = self.sensors.enable_tracing(Tracer(sample_rate=0.25, seed=1))
+        for _ in range(400):
+            self.sensors.read_sensors()
+        self.assertEqual(400, tracer.no_of_roots)
+        self.assertTrue(60 < tracer.no_of_sampled < 140)
+        # Nested reads follow their sweep's decision:
+        self.assertEqual(tracer.no_of_sampled, self.names().count("read"))
+        self.assertEqual(tracer.no_of_sampled, self.names().count("read_sensors"))
+
+    def testBoundedBuffer(self):
+        self.sensors.add_sensor(SENSOR_SPECS[0])
+        tracer = self.sensors.enable_tracing(Tracer(max_events=10))
+        for _ in range(20):
+            self.sensors.read_sensors()
+        self.assertEqual(10, len([event for event in tracer.events() if event["ph"] == "X"]))
+        self.assertEqual(30, tracer.no_of_dropped)
+
+    def testGcPausesInsideSpans(self):
+        tracer = self.sensors.enable_tracing(Tracer(trace_gc=True))
+        gc.collect()    # outside any span - not recorded
+        with tracer.span("sweep", "test"):
+            gc.collect()
+        self.assertEqual(["gc", "sweep"], [event["name"] for event in tracer.events() if event["ph"] == "X"])
+        self.sensors.disable_tracing()
+        self.assertNotIn(tracer._on_gc, gc.callbacks)
+
+    def testDbWrites(self):
+        db = db_utils.connect_to_db("sqlite:///:memory:")
+        self.sensors.add_sensor(SENSOR_SPECS[0])
+        db_utils.insert_sensors(db, self.sensors.sensors, tracer=self.tracer)
+        writer = db_utils.ReadingWriter(db, max_delay=0.01, tracer=self.tracer)
+        writer.write_many([(0, 1.0, 2.5), (0, 2.0, 2.75)])
+        writer.close()
+        db_events = [event for event in self.tracer.events() if event.get("cat") == "db"]
+        self.assertEqual(["insert_sensors", "insert_readings"], [event["name"] for event in db_events])
+        self.assertEqual([1, 2], [event["args"]["rows"] for event in db_events])
+        self.assertNotEqual(db_events[0]["tid"], db_events[1]["tid"])    # flushed on writer thread
+
+
+if __name__ == '__main__':
+    unittest.main()
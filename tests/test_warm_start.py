@@ -0,0 +1,88 @@
+# @file test_warm_start.py
+
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+#
+from py_sensors import Sensors
+from sensor_properties import sensor_props
+from sensor_utils import warm_start    # This is the code being tested
+from sensor_utils.wire_format import WireFormatError, props_of_sensor
+
+
+SENSOR_SPECS = ["""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "dev_name": "BM280", "alias": "ws-i2c"}""",
+                """{"sensor_type": "spi", "bus_no": 1, "cs_no": 3, "dev_name": "SHT721", "alias": "ws-spi",
+                    "sample_period": 0.5}""",
+                """{"sensor_type": "uart", "bus_no": 4, "baud_rate": 9600, "dev_name": "GPS", "alias": "ws-uart"}"""]
+
+
+class WarmStartTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "sensors.snapshot")
+        self.sensors = Sensors()
+        for spec in SENSOR_SPECS:
+            self.assertTrue(self.sensors.add_sensor(spec))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def assertRestored(self, restored):
+        self.assertEqual(len(self.sensors.sensors), len(restored.sensors))
+        for sensor in self.sensors.sensors:
+            copy = restored.get_sensor_by_uuid(sensor.base.uuid)
+            self.assertEqual(props_of_sensor(sensor), props_of_sensor(copy))
+            self.assertIsNotNone(copy.base.handle)    # driver bound
+        self.assertEqual([row["sensors"] for row in self.sensors.bus_utilization()],
+                         [row["sensors"] for row in restored.bus_utilization()])
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testWarmStart(self):
+        self.assertEqual(3, self.sensors.save_snapshot(self.path))
+        restored = Sensors()
+        result = restored.load_snapshot(self.path)
+        self.assertEqual(warm_start.WarmStartResult(True, 3, []), result)
+        self.assertRestored(restored)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def testSchemaChangeRevalidates(self):
+        self.sensors.save_snapshot(self.path)
+        extended_schema = dict(sensor_props.sensor_base_schema)
+        extended_schema["properties"] = dict(extended_schema["properties"], location={"type": "string"})
+        with mock.patch.object(sensor_props, "sensor_base_schema", extended_schema):
+            restored = Sensors()
+            result = restored.load_snapshot(self.path)
+        self.assertEqual(warm_start.WarmStartResult(False, 3, []), result)
+        self.assertRestored(restored)
+
+    # Step 2: negative tests (invalid snapshots)
+    # ------------------------------------------
+    def testRevalidationRejectsInvalidSensors(self):
+        self.sensors.save_snapshot(self.path)
+        narrowed_schema = dict(sensor_props.sensor_uart_schema)
+        narrowed_schema["properties"] = dict(narrowed_schema["properties"], baud_rate={"type": "string"})
+        with mock.patch.dict(sensor_props.json_dev_schemas, uart=narrowed_schema):
+            result = Sensors().load_snapshot(self.path)
+        self.assertEqual(False, result.warm)
+        self.assertEqual(2, result.no_of_added)
+        self.assertEqual([("ws-uart", "invalid device-specific JSON input")], result.errors)
+
+    def testConflictsReported(self):
+        self.sensors.save_snapshot(self.path)
+        result = self.sensors.load_snapshot(self.path)
+        self.assertEqual(0, result.no_of_added)
+        self.assertEqual(3, len(result.errors))
+
+    def testNotASnapshot(self):
+        with open(self.path, "wb") as snapshot_file:
+            snapshot_file.write(b"no snapshot at all - just text" * 4)
+        with self.assertRaises(WireFormatError):
+            Sensors().load_snapshot(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+# @file test_wire_format.py
+
+
+import io
+import unittest
+#
+from py_sensors import Sensors
+from sensor_properties.sensor_props import ComplexValue, SensorReading
+from sensor_utils import wire_format    # This is the code being tested
+from sensor_utils.reading_batch import ReadingBatch
+
+
+SENSOR_SPECS = ["""{"sensor_type": "i2c", "bus_no": 2, "i2c_addr": 78, "dev_name": "BM280", "alias": "w-i2c"}""",
+                """{"sensor_type": "spi", "bus_no": 1, "cs_no": 3, "dev_name": "SHT721", "alias": "w-spi"}""",
+                """{"sensor_type": "uart", "bus_no": 4, "baud_rate": 9600, "dev_name": "GPS", "alias": "w-uart"}"""]
+
+
+class WireFormatTests(unittest.TestCase):
+    # Setup & Teardown
+    def setUp(self):
+        self.sensors = Sensors()
+        for spec in SENSOR_SPECS:
+            self.assertTrue(self.sensors.add_sensor(spec))
+
+    def tearDown(self):
+        pass
+
+    # Step 1: positive tests (valid sensor / valid action)
+    # ----------------------------------------------------
+    def testReadingsRoundTrip(self):
+        readings = [(0, 1.5, 21.25), (1, 1.5, ComplexValue(True, 7, 8.5)), (2, 1.5, [3, 4, 5]),
+                    (0, 2.5, 22), (2, 2.5, [0.5, 1.5])]
+        stream = io.BytesIO()
+        self.assertEqual(5, wire_format.write_readings(stream, readings, frame_size=2))
+        stream.seek(0)
+        # 'ComplexValue' has no '__eq__' - compare representations:
+        self.assertEqual([repr(SensorReading(*reading)) for reading in readings],
+                         [repr(reading) for reading in wire_format.iter_readings(stream)])
+        stream.seek(0)
+        self.assertEqual([2, 2, 1], [len(batch) for batch in wire_format.iter_reading_frames(stream)])
+
+    def testBatchWrittenAsIs(self):
+        batch = ReadingBatch()
+        self.sensors.read_sensors(batch=batch)
+        stream = io.BytesIO()
+        wire_format.write_readings(stream, batch)
+        self.assertEqual(wire_format.HEADER.size + wire_format.FRAME.size + batch.nbytes, len(stream.getvalue()))
+        stream.seek(0)
+        self.assertEqual([repr(reading) for reading in batch],
+                         [repr(reading) for reading in wire_format.iter_readings(stream)])
+
+    def testSnapshotRoundTrip(self):
+        stream = io.BytesIO()
+        self.assertEqual(3, wire_format.write_snapshot(stream, self.sensors))
+        stream.seek(0)
+        restored = Sensors()
+        self.assertEqual(3, wire_format.read_snapshot(stream, restored))
+        for sensor in self.sensors.sensors:
+            copy = restored.get_sensor_by_alias(sensor.base.alias)
+            self.assertEqual(sensor.base.uuid, copy.base.uuid)
+            self.assertEqual(wire_format.props_of_sensor(sensor), wire_format.props_of_sensor(copy))
+            self.assertIsNotNone(copy.base.read)    # driver bound on registration
+
+    def testShapeWrittenOnce(self):
+        stream = io.BytesIO()
+        wire_format.write_snapshot(stream, [self.sensors.sensors[0]] * 10)
+        self.assertEqual(1, stream.getvalue().count(b"dev_name"))
+
+    def testEmptyStream(self):
+        self.assertEqual([], list(wire_format.iter_readings(io.BytesIO())))
+        self.assertEqual([], list(wire_format.iter_snapshot(io.BytesIO())))
+
+    # Step 2: negative tests (invalid streams)
+    # ----------------------------------------
+    def testWrongMagic(self):
+        stream = io.BytesIO()
+        wire_format.write_snapshot(stream, self.sensors)
+        stream.seek(0)
+        with self.assertRaises(wire_format.WireFormatError):
+            list(wire_format.iter_readings(stream))
+
+    def testTruncatedStream(self):
+        stream = io.BytesIO()
+        wire_format.write_snapshot(stream, self.sensors)
+        with self.assertRaises(wire_format.WireFormatError):
+            list(wire_format.iter_snapshot(io.BytesIO(stream.getvalue()[:-3])))
+
+    def testDuplicateSensorsNotRegistered(self):
+        stream = io.BytesIO()
+        wire_format.write_snapshot(stream, self.sensors)
+        stream.seek(0)
+        self.assertEqual(0, wire_format.read_snapshot(stream, self.sensors))
+
+    def testIntBeyondInt64Rejected(self):
+        sensor = self.sensors.get_sensor_by_alias("w-uart")
+        for val in (1 << 63, -(1 << 63) - 1):
+            sensor.baud_rate = val
+            with self.assertRaises(wire_format.WireFormatError):
+                wire_format.write_snapshot(io.BytesIO(), [sensor])
+        sensor.baud_rate = 9600
+        sensor.base.uuid = 1234
+        with self.assertRaises(wire_format.WireFormatError):
+            wire_format.write_snapshot(io.BytesIO(), [sensor])
+
+
+if __name__ == '__main__':
+    unittest.main()